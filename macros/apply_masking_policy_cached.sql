@@ -0,0 +1,35 @@
+{% macro apply_masking_policy_cached(resource_type) %}
+    {#
+        dbt_snow_mask.apply_masking_policy, minus the nodes whose policies are
+        already in place. `scripts/masking_plan.py plan --format vars` lists
+        them in the `masking_policy_skip` variable: incremental models,
+        snapshots, seeds and sources whose masking metadata hasn't changed
+        since the last recorded prod run. Tables and views are recreated,
+        which drops their policies, so they are never listed.
+    #}
+
+    {% set skip = var("masking_policy_skip", []) %}
+
+    {% if resource_type == "models" %}
+        {% if model.unique_id in skip %}
+            {{ return("") }}
+        {% endif %}
+    {% elif resource_type == "sources" and skip %}
+        {# One call covers every source: only make it if some masked source is not skipped #}
+        {% set pending = [] %}
+        {% for node in graph.sources.values() if node.unique_id not in skip %}
+            {% for column in node.columns.values() %}
+                {# Same lookup as masking_plan.column_policy: meta, then config.meta #}
+                {% set config_meta = (column.get("config") or {}).get("meta") or {} %}
+                {% if (column.get("meta") or {}).get("masking_policy") or config_meta.get("masking_policy") %}
+                    {% do pending.append(node.unique_id) %}
+                {% endif %}
+            {% endfor %}
+        {% endfor %}
+        {% if not pending %}
+            {{ return("") }}
+        {% endif %}
+    {% endif %}
+
+    {% do dbt_snow_mask.apply_masking_policy(resource_type) %}
+{% endmacro %}
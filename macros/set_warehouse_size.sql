@@ -9,6 +9,9 @@
         {{ return(target.warehouse) }}
     {% endif %}
 
+    {# Sizes fitted from run history by scripts/warehouse_sizing.py win over the hand-picked one #}
+    {% set size = var("warehouse_size_overrides", {}).get(model.name, size) %}
+
     {% if var("available_warehouse_sizes", None) == None %}
         {{ exceptions.raise_compiler_error("Please set the `available_warehouse_sizes` variable in the dbt_project.yml.") }}
     {% elif size not in var("available_warehouse_sizes") %}
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+benchmark_scripts.py — Performance benchmarks for the project scripts.
+
+Generates a synthetic corpus in memory (staging models that follow the 5-CTE
+pattern, and context domain YAMLs) and times the hot paths of
+validate_staging.py and split_context_tables.py against it. Each case records
+best-of-N wall time and peak traced memory; results are compared against a
+baseline file so rule changes that slow linting down are caught.
+
+Every case also runs at a base size and at SCALE_FACTOR x that size. If time
+grows by much more than SCALE_FACTOR, the case is reported as super-linear.
+
+The staging cases run every rule except CONTEXT_COLUMNS: that rule reads the
+compiled context catalog, whose refresh depends on the real context/ tree
+rather than the synthetic model, and would skew the validator timings.
+
+The baseline lives in scripts/benchmarks/baseline.json so it can be
+committed and shared with CI; re-record it on the machine that compares.
+
+Usage:
+    # Run all benchmarks and compare against the baseline
+    python scripts/benchmark_scripts.py
+
+    # Record a new baseline (scripts/benchmarks/baseline.json)
+    python scripts/benchmark_scripts.py --update-baseline
+
+    # Only cases whose name contains "staging"
+    python scripts/benchmark_scripts.py --filter staging
+
+    # Write a synthetic staging model to disk for inspection
+    python scripts/benchmark_scripts.py --emit-model 200 > /tmp/stg_synthetic.sql
+
+Exit codes:
+    0 — no regressions
+    1 — a case regressed past --threshold / --memory-threshold or scaled
+        super-linearly
+    2 — script error (bad arguments, unreadable baseline)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import split_context_tables
+import validate_staging
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmarks" / "baseline.json"
+
+# Runtime may grow by this much over the baseline before it's a regression.
+DEFAULT_THRESHOLD = 1.5
+# Peak traced memory is far less noisy than wall time, so the bar is lower.
+DEFAULT_MEMORY_THRESHOLD = 1.25
+# Each case is also run at SCALE_FACTOR x its base size.
+SCALE_FACTOR = 4
+# Tolerated ratio over perfectly linear scaling before flagging super-linear.
+SUPERLINEAR_TOLERANCE = 2.0
+REPEATS = 5
+
+# Validator rules the staging cases time (see module docstring).
+STAGING_RULES = [name for name in validate_staging.RULES if name != "CONTEXT_COLUMNS"]
+
+COLUMN_TYPES = ["s50", "s100", "txt2k", "dbl_m3", "dbl_kPa", "dbl_m_calc", "dt", "dt_calc", "bool", "int"]
+GROUPS = ["identifiers", "dates", "descriptive fields", "system / audit"]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+
+def generate_staging_model(
+    columns: int = 40,
+    jinja_density: float = 0.1,
+    nesting_depth: int = 1,
+    seed: int = 0,
+) -> str:
+    """Build a staging model following the 5-CTE pattern.
+
+    ``jinja_density`` is the fraction of renamed columns wrapped in a macro
+    call; ``nesting_depth`` controls how deeply each enhanced expression is
+    parenthesized.
+    """
+    rng = random.Random(seed)
+    names = [f"col_{i:05d}" for i in range(columns)]
+
+    renamed = []
+    for i, name in enumerate(names):
+        if i % max(1, columns // len(GROUPS)) == 0:
+            renamed.append(f"        -- {GROUPS[(i * len(GROUPS)) // max(1, columns)]}")
+        if rng.random() < jinja_density:
+            expr = f"{{{{ pv_cbm_to_bbl('Col{i}') }}}}"
+        else:
+            expr = f"trim(Col{i})::varchar"
+        renamed.append(f"        {expr} as {name},")
+
+    nested = "col_00000"
+    for _ in range(nesting_depth):
+        nested = f"coalesce(({nested}), 0)"
+
+    final_cols = []
+    for i, name in enumerate(names):
+        if i % max(1, columns // len(GROUPS)) == 0:
+            final_cols.append(f"        -- {GROUPS[(i * len(GROUPS)) // max(1, columns)]}")
+        final_cols.append(f"        {name},")
+
+    return "\n".join(
+        [
+            "{{",
+            "    config(",
+            "        materialized='view',",
+            "        tags=['prodview', 'staging', 'formentera']",
+            "    )",
+            "}}",
+            "",
+            "with",
+            "",
+            "source as (",
+            "    select * from {{ source('prodview', 'pvt_pvunitsynthetic') }}",
+            "    qualify 1 = row_number() over (partition by idrec order by _fivetran_synced desc)",
+            "),",
+            "",
+            "renamed as (",
+            "    select",
+            *renamed,
+            "        _fivetran_synced as _fivetran_synced",
+            "    from source",
+            "),",
+            "",
+            "filtered as (",
+            "    select *",
+            "    from renamed",
+            "    where coalesce(_fivetran_deleted, false) = false",
+            "),",
+            "",
+            "enhanced as (",
+            "    select",
+            "        {{ dbt_utils.generate_surrogate_key(['col_00000']) }} as synthetic_sk,",
+            "        *,",
+            f"        {nested} as nested_expr,",
+            "        current_timestamp() as _loaded_at",
+            "    from filtered",
+            "),",
+            "",
+            "final as (",
+            "    select",
+            "        synthetic_sk,",
+            *final_cols,
+            "        nested_expr,",
+            "        _loaded_at",
+            "    from enhanced",
+            ")",
+            "",
+            "select * from final",
+            "",
+        ]
+    )
+
+
+def generate_domain_yaml(tables: int = 100, columns: int = 30, seed: int = 0) -> str:
+    """Build a context domain YAML with ``tables`` tables of ``columns`` columns."""
+    rng = random.Random(seed)
+    lines = [
+        "# Peloton Synthetic: Benchmark",
+        "# Generated by scripts/benchmark_scripts.py",
+        "#",
+        "# Types: dt=datetime bool=boolean int=integer dbl=double",
+        "#",
+        "# Relationships:",
+        "#   pvSynth0 1:many -> pvSynth1",
+        "",
+    ]
+    for t in range(tables):
+        lines.append(f"pvSynth{t}: Synthetic table {t} +parent")
+        for c in range(columns):
+            typ = rng.choice(COLUMN_TYPES)
+            lines.append(f"  Col{c}({typ}) #Synthetic column {c} of table {t}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CaseResult:
+    """Timing for one benchmark case at its base and scaled size."""
+
+    name: str
+    size: int
+    seconds: float
+    peak_kb: float
+    scaled_seconds: float
+    scaling_ratio: float  # scaled_seconds / seconds; ~SCALE_FACTOR if linear
+
+
+def measure(fn: Callable[[], object], repeats: int = REPEATS) -> tuple[float, float]:
+    """Return (best wall seconds, peak traced KiB) for ``fn``."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024
+
+
+def _staging_case(dimension: str, **fixed) -> Callable[[int], Callable[[], object]]:
+    """Case scaling one generate_staging_model() argument, e.g. 'columns'."""
+
+    def build(size: int) -> Callable[[], object]:
+        sql = generate_staging_model(**fixed, **{dimension: size})
+        path = validate_staging.STAGING_DIR / "prodview" / "stg_prodview__synthetic.sql"
+        return lambda: validate_staging.validate_file(path, raw_sql=sql, rules=STAGING_RULES)
+
+    return build
+
+
+def _context_case(tmpdir: Path, columns: int) -> Callable[[int], Callable[[], object]]:
+    def build(size: int) -> Callable[[], object]:
+        path = tmpdir / f"synthetic_{size}.yaml"
+        path.write_text(generate_domain_yaml(tables=size, columns=columns), encoding="utf-8")
+
+        def run() -> object:
+            df = split_context_tables.parse_domain_file(path, "prodview")
+            for table in df.tables:
+                table.to_yaml()
+            return df.to_domain_yaml()
+
+        return run
+
+    return build
+
+
+def build_cases(tmpdir: Path) -> list[tuple[str, int, Callable[[int], Callable[[], object]]]]:
+    """(name, base size, builder) for every benchmark case."""
+    return [
+        ("staging_typical_columns", 60, _staging_case("columns", jinja_density=0.1)),
+        ("staging_jinja_heavy_columns", 60, _staging_case("columns", jinja_density=0.9)),
+        # ~5,000-line model at the scaled size (2 lines per column)
+        ("staging_long_model_columns", 600, _staging_case("columns", jinja_density=0.1)),
+        ("staging_nested_parens_depth", 250, _staging_case("nesting_depth", columns=20)),
+        ("context_domain_tables", 500, _context_case(tmpdir, columns=30)),
+    ]
+
+
+def run_benchmarks(name_filter: str | None = None) -> list[CaseResult]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, size, builder in build_cases(Path(tmp)):
+            if name_filter and name_filter not in name:
+                continue
+            seconds, peak_kb = measure(builder(size))
+            scaled_seconds, _ = measure(builder(size * SCALE_FACTOR))
+            results.append(
+                CaseResult(
+                    name=name,
+                    size=size,
+                    seconds=seconds,
+                    peak_kb=peak_kb,
+                    scaled_seconds=scaled_seconds,
+                    scaling_ratio=scaled_seconds / seconds if seconds else 0.0,
+                )
+            )
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def compare(
+    results: list[CaseResult],
+    baseline: dict[str, dict],
+    threshold: float,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> tuple[list[str], bool]:
+    """Render a results table and report whether anything regressed."""
+    superlinear_limit = SCALE_FACTOR * SUPERLINEAR_TOLERANCE
+    lines = [
+        f"{'case':<32} {'size':>6} {'ms':>9} {'peak KiB':>10} "
+        f"{'x' + str(SCALE_FACTOR) + ' ratio':>10} {'vs base':>8} {'mem vs':>7}  status"
+    ]
+    failed = False
+    for r in results:
+        status = []
+        base = baseline.get(r.name)
+        delta = mem_delta = ""
+        if base and base.get("size") == r.size:
+            if base["seconds"]:
+                change = r.seconds / base["seconds"]
+                delta = f"{change:.2f}x"
+                if change > threshold:
+                    status.append("REGRESSED")
+            if base.get("peak_kb"):
+                mem_change = r.peak_kb / base["peak_kb"]
+                mem_delta = f"{mem_change:.2f}x"
+                if mem_change > memory_threshold:
+                    status.append("MEMORY")
+        if r.scaling_ratio > superlinear_limit:
+            status.append("SUPER-LINEAR")
+        failed = failed or bool(status)
+        lines.append(
+            f"{r.name:<32} {r.size:>6} {r.seconds * 1000:>9.2f} {r.peak_kb:>10.0f} "
+            f"{r.scaling_ratio:>10.2f} {delta:>8} {mem_delta:>7}  {', '.join(status) or 'ok'}"
+        )
+    return lines, failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark validate_staging.py and split_context_tables.py on a synthetic corpus."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline file (default: {DEFAULT_BASELINE.relative_to(PROJECT_ROOT)})",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's results as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown vs baseline before failing (default: {DEFAULT_THRESHOLD}x)",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=DEFAULT_MEMORY_THRESHOLD,
+        help=f"Allowed peak-memory growth vs baseline before failing (default: {DEFAULT_MEMORY_THRESHOLD}x)",
+    )
+    parser.add_argument(
+        "--filter",
+        help="Only run cases whose name contains this substring",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--emit-model",
+        type=int,
+        metavar="COLUMNS",
+        help="Print a synthetic staging model with COLUMNS columns and exit",
+    )
+    args = parser.parse_args()
+
+    if args.emit_model is not None:
+        print(generate_staging_model(columns=args.emit_model))
+        return 0
+
+    baseline: dict[str, dict] = {}
+    if args.baseline.exists() and not args.update_baseline:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+        except (ValueError, KeyError) as exc:
+            print(f"Unreadable baseline {args.baseline}: {exc}", file=sys.stderr)
+            return 2
+
+    results = run_benchmarks(args.filter)
+    if not results:
+        print("No benchmark cases matched.", file=sys.stderr)
+        return 2
+
+    lines, failed = compare(results, baseline, args.threshold, args.memory_threshold)
+    if args.format == "json":
+        print(json.dumps({"failed": failed, "cases": [asdict(r) for r in results]}, indent=2))
+    else:
+        print("\n".join(lines))
+        if not baseline and not args.update_baseline:
+            print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "cases": {r.name: asdict(r) for r in results},
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,7 @@
 #   ./scripts/check.sh models/operations/staging/oda/stg_oda__gl.sql  # Specific file
 #   ./scripts/check.sh --changed                    # Only changed files vs main
 #   ./scripts/check.sh --build models/path/to.sql   # Full pipeline including build
+#   ./scripts/check.sh --changed --build            # Build changed models + downstream
 #   ./scripts/check.sh --show models/path/to.sql    # Include dbt show preview
 #
 # Exit codes:
@@ -145,15 +146,22 @@ echo ""
 # ---------------------------------------------------------------------------
 if [[ "$DO_BUILD" == true ]]; then
     echo "Step 4/5: dbt build"
+    SELECT=""
     if [[ ${#TARGETS[@]} -gt 0 ]]; then
         SELECT=$(dbt_select_from_paths)
+    elif [[ "$CHANGED_ONLY" == true ]]; then
+        # Changed models + everything downstream, from the static ref() index
+        SELECT=$(python3 scripts/model_graph.py --changed --format select)
+    fi
+
+    if [[ -n "$SELECT" ]]; then
         if dbt build --select $SELECT 2>&1 | tail -10; then
             step_pass "dbt build"
         else
             step_fail "dbt build"
         fi
     else
-        echo "  (skipped — specify target files to build)"
+        echo "  (skipped — specify target files or --changed to build)"
         step_pass "dbt build (skipped)"
     fi
 else
@@ -0,0 +1,736 @@
+#!/usr/bin/env python3
+"""
+column_lineage.py — Static column-level lineage from source to mart.
+
+Answers "what breaks if pvUnitTank.Typ1 is dropped" (and the reverse, "where
+does well_360.eid come from") from the SQL alone: no warehouse, no dbt
+compile. Every model is read with validate_staging.py's tokenizer and CTE
+parser. Each select list (the `renamed` aliases, the explicit `final`
+column list the validator requires, marts selecting from ref()s) is split
+into output columns and the columns they read, and traced back through
+the model's CTEs to the source() / ref() relations it selects from.
+
+The per-model result is kept in target/column_lineage_index.json and
+refreshed like model_graph.py's index: files whose (mtime, size) are
+unchanged are not re-read, and files whose sha256 is unchanged are not
+re-parsed. The graph is assembled from the index at query time.
+
+What is traced:
+  - aliases (`trim(typ1)::varchar as tank_type`), bare and qualified
+    columns (`t.tank_type`), column macros (`{{ pv_cbm_to_bbl('volcap') }}`)
+    and generate_surrogate_key(['a', 'b']) arguments
+  - `select *` / `t.*` / `* exclude (...)`: every upstream column passes
+    through under its own name
+  - unions, by position; joins, by qualifier (unqualified names go to the
+    CTE that defines them, otherwise to every relation in FROM); subqueries
+    in FROM, as anonymous CTEs
+  - columns a model reads without selecting them: ON / USING conditions,
+    WHERE, GROUP BY, HAVING, QUALIFY and ORDER BY, and CTE columns dropped
+    before the final select. These are model-level edges: downstream
+    queries list the model (it breaks if the column goes) but follow no
+    column out of it.
+
+Not traced: columns built in Jinja loops beyond their first expansion,
+lateral references to aliases of the same select, and scalar subqueries
+(in a WHERE, their columns are matched against the outer FROM). Lineage is
+therefore a close approximation, not a compiler's answer.
+
+Columns are named `<model>.<column>`, or by source table: `pvUnitTank.Typ1`
+(context name, warehouse prefix optional) or `source:prodview.pvt_pvunittank.typ1`.
+Matching is case-insensitive.
+
+Usage:
+    # Everything downstream of a source column
+    python scripts/column_lineage.py pvUnitTank.Typ1
+
+    # Where a mart column comes from
+    python scripts/column_lineage.py well_360.eid --upstream
+
+    # Affected models as a dbt --select string / full detail
+    python scripts/column_lineage.py pvUnitTank.Typ1 --format select
+    python scripts/column_lineage.py stg_prodview__tanks.tank_type --format json
+
+    # Rebuild the index from scratch
+    python scripts/column_lineage.py --rebuild --stats
+
+Exit codes:
+    0 — success
+    1 — no column matches the query
+    2 — script error (bad arguments)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from model_graph import REF_RE, SOURCE_RE, find_model_files
+from validate_staging import (
+    COMMENT_KINDS,
+    CONTEXT_SOURCE_MAP,
+    CONTEXT_TABLE_PREFIXES,
+    JINJA_EXPR,
+    JINJA_STMT,
+    PUNCT,
+    QUOTED_IDENT,
+    WORD,
+    Token,
+    column_refs,
+    parse_model,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+INDEX_PATH = PROJECT_ROOT / "target" / "column_lineage_index.json"
+
+# Bump when the index layout changes. Extraction changes (here or in the
+# shared lexer) are caught by extractor_fingerprint().
+INDEX_VERSION = 2
+
+LAYERS = ("staging", "intermediate", "marts", "applications", "platinum")
+
+# Words that end a FROM clause, or can't be a relation alias.
+_CLAUSE_END = frozenset("where group having qualify order limit window".split())
+_SET_OPS = frozenset("union intersect except minus".split())
+# Words that end an ON / USING condition in a FROM clause.
+_JOIN_WORDS = frozenset("join left right inner outer full cross natural lateral".split())
+_NOT_ALIAS = frozenset(
+    "on using left right inner outer full cross natural lateral join as sample tablesample".split()
+) | _CLAUSE_END | _SET_OPS
+_SURROGATE_KEY_RE = re.compile(r"generate_surrogate_key\(\s*\[([^\]]*)\]")
+_QUOTED_NAME_RE = re.compile(r"""['"]([A-Za-z_]\w*)['"]""")
+
+Relation = str  # "ref:<model>" | "source:<source>.<table>" | "table:<name>" | "cte:<name>"
+
+# Column of the model-level node a predicate-only read reaches: the model
+# itself rather than one of its output columns.
+READ = ""
+
+
+# ── Extraction ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class SelectOutput:
+    """Columns a select produces: name -> {(relation, column)}, plus star relations.
+
+    ``reads`` holds the (relation, column) pairs read by joins, filters,
+    grouping and ordering, which no output column depends on.
+    """
+
+    columns: dict[str, set[tuple[Relation, str]]] = field(default_factory=dict)
+    stars: set[Relation] = field(default_factory=set)
+    reads: set[tuple[Relation, str]] = field(default_factory=set)
+
+
+def _is(tok: Token, text: str) -> bool:
+    return tok.kind == PUNCT and tok.text == text
+
+
+def _split_top_level(tokens: list[Token], at) -> list[list[Token]]:
+    """Split ``tokens`` wherever ``at(token)`` holds outside parentheses."""
+    parts: list[list[Token]] = [[]]
+    depth = 0
+    for tok in tokens:
+        if _is(tok, "("):
+            depth += 1
+        elif _is(tok, ")"):
+            depth -= 1
+        elif depth == 0 and at(tok):
+            parts.append([])
+            continue
+        parts[-1].append(tok)
+    return parts
+
+
+def _relation_of(tok: Token, ctes: set[str]) -> Relation | None:
+    if tok.kind == JINJA_EXPR:
+        m = SOURCE_RE.search(tok.text)
+        if m:
+            return f"source:{m.group(1)}.{m.group(2)}".lower()
+        m = REF_RE.search(tok.text)
+        if m:
+            return f"ref:{m.group(2) or m.group(1)}"
+        return None
+    if tok.kind in (WORD, QUOTED_IDENT):
+        name = tok.text.strip('"').lower()
+        return f"cte:{name}" if name in ctes else f"table:{name}"
+    return None
+
+
+def parse_from(tokens: list[Token], scope: dict[str, SelectOutput]) -> dict[str, Relation]:
+    """Alias (and bare name) -> relation for a FROM clause, joins included.
+
+    Subqueries are resolved into ``scope`` as anonymous CTEs.
+    """
+    ctes = {key.split(":", 1)[1] for key in scope}
+    rels: dict[str, Relation] = {}
+    depth = 0
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        if _is(tok, "("):
+            depth += 1
+        elif _is(tok, ")"):
+            depth -= 1
+        elif depth == 0 and (tok.is_word("from") or tok.is_word("join") or _is(tok, ",")):
+            j = i + 1
+            if j < len(tokens) and _is(tokens[j], "("):
+                close, level = j, 0
+                for close in range(j, len(tokens)):
+                    level += _is(tokens[close], "(") - _is(tokens[close], ")")
+                    if level == 0:
+                        break
+                inner = tokens[j + 1:close]
+                if not any(t.is_word("select") for t in inner):
+                    i += 1
+                    continue
+                rel = f"cte:({len(scope)})"
+                scope[rel] = resolve_select(inner, scope)
+                rels[rel] = rel
+                j = close
+            else:
+                # db.schema.table: keep the last part
+                while (
+                    j + 2 < len(tokens)
+                    and _is(tokens[j + 1], ".")
+                    and tokens[j + 2].kind in (WORD, QUOTED_IDENT)
+                ):
+                    j += 2
+                rel = _relation_of(tokens[j], ctes) if j < len(tokens) else None
+                if rel is None:
+                    i += 1
+                    continue
+                rels.setdefault(rel.split(":", 1)[1].rsplit(".", 1)[-1], rel)
+            k = j + 1
+            if k < len(tokens) and tokens[k].is_word("as"):
+                k += 1
+            if (
+                k < len(tokens)
+                and tokens[k].kind in (WORD, QUOTED_IDENT)
+                and tokens[k].text.lower() not in _NOT_ALIAS
+            ):
+                rels[tokens[k].text.strip('"').lower()] = rel
+            i = k
+            continue
+        i += 1
+    return rels
+
+
+@dataclass
+class SelectItem:
+    name: str | None  # output column; None for stars and unnamed expressions
+    refs: list[tuple[str | None, str]]  # (qualifier, column)
+    star: str | None = None  # "" for *, qualifier for t.*
+    exclude: set[str] = field(default_factory=set)
+
+
+def parse_item(item: list[Token]) -> SelectItem:
+    if not item:
+        return SelectItem(None, [])
+    if _is(item[0], "*") or (len(item) >= 3 and _is(item[1], ".") and _is(item[2], "*")):
+        star = "" if _is(item[0], "*") else item[0].text.strip('"').lower()
+        rest = item[1:] if star == "" else item[3:]
+        exclude = set()
+        if rest and rest[0].is_word("exclude"):
+            exclude = {t.text.strip('"').lower() for t in rest[1:] if t.kind in (WORD, QUOTED_IDENT)}
+        return SelectItem(None, [], star, exclude)
+
+    body, name = item, None
+    last = item[-1]
+    if last.kind in (WORD, QUOTED_IDENT):
+        if len(item) >= 2 and item[-2].is_word("as"):
+            body, name = item[:-2], last.text
+        elif len(item) == 1 or (len(item) == 3 and _is(item[1], ".")):
+            name = last.text
+        elif (
+            item[-2].kind in (WORD, QUOTED_IDENT, JINJA_EXPR) or _is(item[-2], ")")
+        ) and last.text.lower() not in ("end", "null", "true", "false"):
+            body, name = item[:-1], last.text  # implicit alias
+    refs = [(q, c) for q, c, _ in column_refs(body)]
+    for tok in body:
+        if tok.kind == JINJA_EXPR:
+            for m in _SURROGATE_KEY_RE.finditer(tok.text):
+                refs.extend((None, c) for c in _QUOTED_NAME_RE.findall(m.group(1)))
+    return SelectItem(name.strip('"').lower() if name else None, refs)
+
+
+def _branch_parts(tokens: list[Token]) -> tuple[list[Token], list[Token], list[Token]] | None:
+    """(select list, from clause, trailing clauses) of one select branch."""
+    start = next((i for i, t in enumerate(tokens) if t.is_word("select")), None)
+    if start is None:
+        return None
+    i = start + 1
+    while i < len(tokens) and (tokens[i].is_word("distinct") or tokens[i].is_word("all")):
+        i += 1
+    depth, from_at, end = 0, len(tokens), len(tokens)
+    for j in range(i, len(tokens)):
+        tok = tokens[j]
+        if _is(tok, "("):
+            depth += 1
+        elif _is(tok, ")"):
+            depth -= 1
+        elif depth == 0:
+            if from_at == len(tokens) and tok.is_word("from"):
+                from_at = j
+            elif from_at < len(tokens) and tok.kind == WORD and tok.text.lower() in _CLAUSE_END:
+                end = j
+                break
+    return tokens[i:from_at], tokens[from_at:end], tokens[end:]
+
+
+def _predicate_refs(from_clause: list[Token], clauses: list[Token]) -> list[tuple[str | None, str]]:
+    """Columns read by ON / USING conditions and by WHERE, GROUP BY, HAVING,
+    QUALIFY and ORDER BY."""
+    segments: list[list[Token]] = []
+    depth, inside = 0, False
+    for tok in from_clause:
+        if depth == 0 and (tok.is_word("on") or tok.is_word("using")):
+            segments.append([])
+            inside = True
+            continue
+        if depth == 0 and (_is(tok, ",") or (tok.kind == WORD and tok.text.lower() in _JOIN_WORDS)):
+            inside = False
+        if _is(tok, "("):
+            depth += 1
+        elif _is(tok, ")"):
+            depth -= 1
+        if inside:
+            segments[-1].append(tok)
+    segments.append(clauses)
+    return [
+        (q, c)
+        for segment in segments
+        for q, c, _ in column_refs(segment)
+        if c.lower() not in _CLAUSE_END and c.lower() != "all"  # group by all
+    ]
+
+
+def resolve_select(tokens: list[Token], ctes: dict[str, SelectOutput]) -> SelectOutput:
+    """Trace a select (with unions) back to relations outside this model."""
+    out = SelectOutput()
+    names: list[str | None] = []
+    branches = _split_top_level(
+        tokens, lambda t: t.kind == WORD and t.text.lower() in _SET_OPS
+    )
+    for b, branch in enumerate(branches):
+        parts = _branch_parts(branch)
+        if parts is None:
+            continue
+        select_list, from_clause, clauses = parts
+        scope = dict(ctes)
+        rels = parse_from(from_clause, scope)
+        every = list(dict.fromkeys(rels.values()))
+
+        def trace(qualifier: str | None, column: str) -> set[tuple[Relation, str]]:
+            column = column.lower()
+            if qualifier is not None:
+                rel = rels.get(qualifier.lower())
+                candidates = [rel] if rel else []
+            else:
+                candidates = every
+                if len(every) > 1:
+                    defining = [r for r in every if r in scope and column in scope[r].columns]
+                    candidates = defining or [r for r in every if r not in scope or scope[r].stars]
+            found: set[tuple[Relation, str]] = set()
+            for rel in candidates:
+                if rel in scope:
+                    cte = scope[rel]
+                    if column in cte.columns:
+                        found |= cte.columns[column]
+                    else:
+                        found |= {(s, column) for s in cte.stars}
+                elif not rel.startswith("cte:"):
+                    found.add((rel, column))
+            return found
+
+        for q, c in _predicate_refs(from_clause, clauses):
+            out.reads |= trace(q, c)
+        # Subqueries in FROM: whatever they read is read by this select
+        for rel in scope.keys() - ctes.keys():
+            out.reads |= scope[rel].reads.union(*scope[rel].columns.values())
+
+        position = 0
+        for raw in _split_top_level(select_list, lambda t: _is(t, ",")):
+            item = parse_item(raw)
+            if item.star is not None:
+                sources = [rels[item.star]] if item.star in rels else ([] if item.star else every)
+                for rel in sources:
+                    if rel in scope:
+                        for col, deps in scope[rel].columns.items():
+                            if col not in item.exclude:
+                                out.columns.setdefault(col, set()).update(deps)
+                        out.stars |= scope[rel].stars
+                    elif not rel.startswith("cte:"):
+                        out.stars.add(rel)
+                continue
+            deps = set().union(*(trace(q, c) for q, c in item.refs)) if item.refs else set()
+            if b == 0:
+                names.append(item.name)
+                if item.name:
+                    out.columns.setdefault(item.name, set()).update(deps)
+            elif position < len(names) and names[position]:
+                out.columns[names[position]].update(deps)
+            position += 1
+    return out
+
+
+def extract_lineage(sql: str) -> SelectOutput:
+    """Output columns of a model, traced to its ref() / source() relations."""
+    model = parse_model(sql)
+    code = [t for t in model.tokens if t.kind not in COMMENT_KINDS and t.kind != JINJA_STMT]
+    resolved: dict[str, SelectOutput] = {}
+    for span in model.ctes:
+        resolved[f"cte:{span.name}"] = resolve_select(
+            [t for t in model.cte_tokens(span.name) if t.kind != JINJA_STMT], resolved
+        )
+    if model.ctes:
+        main = [t for t in model.tokens[model.ctes[-1].end + 1:] if t.kind not in COMMENT_KINDS and t.kind != JINJA_STMT]
+    else:
+        main = code
+    out = resolve_select(main, resolved)
+    # Every CTE is compiled, so what it reads (selected or not) is read by
+    # the model; keep what no output column already depends on.
+    for cte in resolved.values():
+        out.reads |= cte.reads.union(*cte.columns.values())
+    out.reads -= set().union(*out.columns.values())
+    return out
+
+
+# ── Index ───────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ModelLineage:
+    """Column lineage extracted from one model file."""
+
+    name: str
+    path: str
+    sha256: str
+    mtime_ns: int
+    size: int
+    columns: dict[str, list[list[str]]] = field(default_factory=dict)  # col -> [[relation, col]]
+    stars: list[str] = field(default_factory=list)
+    reads: list[list[str]] = field(default_factory=list)  # [[relation, col]] no output column uses
+
+    @property
+    def layer(self) -> str:
+        parts = Path(self.path).parts
+        return next((p for p in parts if p in LAYERS), "other")
+
+
+def extractor_fingerprint() -> str:
+    """Hash of the code that turns SQL into lineage; a change forces a rescan."""
+    h = hashlib.sha256(str(INDEX_VERSION).encode())
+    h.update(Path(__file__).read_bytes())
+    h.update((Path(__file__).parent / "validate_staging.py").read_bytes())
+    h.update((Path(__file__).parent / "model_graph.py").read_bytes())
+    return h.hexdigest()
+
+
+class LineageIndex:
+    """Persisted per-model column lineage with downstream/upstream queries."""
+
+    def __init__(self, index_path: Path = INDEX_PATH):
+        self.index_path = index_path
+        self.fingerprint = extractor_fingerprint()
+        self.entries: dict[str, ModelLineage] = {}  # keyed by relative path
+        self.reparsed = 0
+        self.undecodable: list[str] = []  # files skipped as not UTF-8
+        self._graph: tuple[dict, dict, dict, dict] | None = None
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        self.entries = {path: ModelLineage(**e) for path, e in data.get("models", {}).items()}
+
+    def save(self) -> None:
+        payload = {
+            "fingerprint": self.fingerprint,
+            "models": {path: asdict(e) for path, e in sorted(self.entries.items())},
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the tree. Returns True if changed."""
+        changed = False
+        seen = set()
+        for filepath in find_model_files():
+            rel = str(filepath.relative_to(PROJECT_ROOT))
+            seen.add(rel)
+            st = filepath.stat()
+            entry = self.entries.get(rel)
+            if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                continue
+
+            content = filepath.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry and entry.sha256 == digest:
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                changed = True
+                continue
+
+            try:
+                text = content.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                self.undecodable.append(f"{rel} ({exc.reason} at byte {exc.start})")
+                if self.entries.pop(rel, None) is not None:
+                    changed = True
+                continue
+            out = extract_lineage(text)
+            self.entries[rel] = ModelLineage(
+                name=filepath.stem,
+                path=rel,
+                sha256=digest,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                columns={c: sorted([r, col] for r, col in deps) for c, deps in sorted(out.columns.items())},
+                stars=sorted(out.stars),
+                reads=sorted([r, col] for r, col in out.reads),
+            )
+            self.reparsed += 1
+            changed = True
+
+        for rel in set(self.entries) - seen:
+            del self.entries[rel]
+            changed = True
+        if changed:
+            self._graph = None
+        return changed
+
+    # ── Queries ──────────────────────────────────────────────────────────
+
+    @property
+    def by_name(self) -> dict[str, ModelLineage]:
+        return {e.name.lower(): e for e in self.entries.values()}
+
+    @property
+    def graph(self) -> tuple[dict, dict, dict, dict]:
+        """(children, parents, star_children, readers) over (relation, column) nodes.
+
+        ``readers`` maps a node to the models that read it without selecting it.
+        """
+        if self._graph is None:
+            children: dict[tuple[str, str], set[tuple[str, str]]] = {}
+            parents: dict[tuple[str, str], set[tuple[str, str]]] = {}
+            star_children: dict[str, set[str]] = {}
+            readers: dict[tuple[str, str], set[str]] = {}
+            for e in self.entries.values():
+                node_rel = f"ref:{e.name.lower()}"
+                for col, deps in e.columns.items():
+                    for rel, src in deps:
+                        parent = (_model_relation(rel), src)
+                        children.setdefault(parent, set()).add((node_rel, col))
+                        parents.setdefault((node_rel, col), set()).add(parent)
+                for rel in e.stars:
+                    star_children.setdefault(_model_relation(rel), set()).add(node_rel)
+                for rel, src in e.reads:
+                    readers.setdefault((_model_relation(rel), src), set()).add(node_rel)
+            self._graph = (children, parents, star_children, readers)
+        return self._graph
+
+    def relations(self) -> set[str]:
+        children, parents, star_children, readers = self.graph
+        rels = {r for r, _ in children} | {r for r, _ in parents} | set(star_children) | {r for r, _ in readers}
+        return rels
+
+    def resolve(self, query: str) -> list[tuple[str, str]]:
+        """Nodes matching ``table.column`` (model, source table or context name)."""
+        table, _, column = query.strip().rpartition(".")
+        if not table or not column:
+            return []
+        table, column = table.lower(), column.lower()
+        if table.startswith("source:"):
+            return [(table, column)]
+        found = []
+        for rel in sorted(self.relations()):
+            kind, _, name = rel.partition(":")
+            if kind == "ref" and name == table:
+                found.append((rel, column))
+            elif kind == "source":
+                source, _, tbl = name.partition(".")
+                if table in (tbl, context_table(tbl), f"{source}.{tbl}", f"{CONTEXT_SOURCE_MAP.get(source, source)}.{context_table(tbl)}"):
+                    found.append((rel, column))
+        return found
+
+    def downstream(self, starts: list[tuple[str, str]]) -> dict[tuple[str, str], tuple[int, tuple[str, str]]]:
+        """Reachable node -> (hops, the node it was reached from).
+
+        A model that only reads a reached column (in a join, filter, ...) is
+        reached as ``(model, READ)`` and not followed further.
+        """
+        children, _, star_children, readers = self.graph
+        explicit = {f"ref:{e.name.lower()}": e.columns for e in self.entries.values()}
+        seen: dict[tuple[str, str], tuple[int, tuple[str, str]]] = {}
+        queue = deque((s, 0) for s in starts)
+        while queue:
+            node, hops = queue.popleft()
+            if node[1] == READ:
+                continue
+            nxt = set(children.get(node, ()))
+            for model in star_children.get(node[0], ()):
+                if node[1] not in explicit.get(model, {}):
+                    nxt.add((model, node[1]))
+            nxt |= {(model, READ) for model in readers.get(node, ())}
+            for child in sorted(nxt):
+                if child not in seen and child not in starts:
+                    seen[child] = (hops + 1, node)
+                    queue.append((child, hops + 1))
+        return seen
+
+    def upstream(self, starts: list[tuple[str, str]]) -> dict[tuple[str, str], tuple[int, tuple[str, str]]]:
+        _, parents, _, _ = self.graph
+        stars = {f"ref:{e.name.lower()}": e.stars for e in self.entries.values()}
+        explicit = {f"ref:{e.name.lower()}": e.columns for e in self.entries.values()}
+        seen: dict[tuple[str, str], tuple[int, tuple[str, str]]] = {}
+        queue = deque((s, 0) for s in starts)
+        while queue:
+            node, hops = queue.popleft()
+            prev = set(parents.get(node, ()))
+            if node[1] not in explicit.get(node[0], {}):
+                prev |= {(_model_relation(r), node[1]) for r in stars.get(node[0], ())}
+            for parent in sorted(prev):
+                if parent not in seen and parent not in starts:
+                    seen[parent] = (hops + 1, node)
+                    queue.append((parent, hops + 1))
+        return seen
+
+
+def _model_relation(rel: str) -> str:
+    return rel.lower() if rel.startswith(("ref:", "source:")) else rel
+
+
+def context_table(table: str) -> str:
+    """Warehouse table -> context name, e.g. pvt_pvunittank -> pvunittank."""
+    for prefix in CONTEXT_TABLE_PREFIXES:
+        if table.startswith(prefix):
+            return table[len(prefix):]
+    return table
+
+
+def load_index(rebuild: bool = False) -> LineageIndex:
+    """Load the persisted index, refresh it, and save if anything changed."""
+    index = LineageIndex()
+    if not rebuild:
+        index.load()
+    changed = index.refresh()
+    for skipped in index.undecodable:
+        print(f"Warning: skipped {skipped}: file is not valid UTF-8", file=sys.stderr)
+    if changed:
+        try:
+            index.save()
+        except OSError as exc:
+            print(f"Warning: could not write {index.index_path}: {exc}", file=sys.stderr)
+    return index
+
+
+def display(node: tuple[str, str]) -> str:
+    rel, col = node
+    kind, _, name = rel.partition(":")
+    if col == READ:
+        return f"{name} (read, not selected)"
+    return f"{name}.{col}" if kind == "ref" else f"{rel}.{col}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Query a persisted, statically extracted column lineage graph."
+    )
+    parser.add_argument("columns", nargs="*", help="table.column, e.g. pvUnitTank.Typ1 or well_360.eid")
+    parser.add_argument("--upstream", action="store_true", help="Trace where the column comes from instead")
+    parser.add_argument(
+        "--format",
+        choices=["text", "select", "json"],
+        default="text",
+        help="text: grouped by model; select: affected models for dbt --select; json: full detail",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the persisted index and rescan every file")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics to stderr")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = load_index(rebuild=args.rebuild)
+    if args.stats:
+        columns = sum(len(e.columns) for e in index.entries.values())
+        edges = sum(len(d) for e in index.entries.values() for d in e.columns.values())
+        print(
+            f"Index: {len(index.entries)} models, {columns} columns, {edges} edges, "
+            f"{index.reparsed} re-parsed ({index.index_path.relative_to(PROJECT_ROOT)})",
+            file=sys.stderr,
+        )
+    if not args.columns:
+        if args.stats:
+            return 0
+        parser.error("no columns given (pass table.column)")
+
+    starts = [node for q in args.columns for node in index.resolve(q)]
+    if not starts:
+        print(f"No model or source table matches: {', '.join(args.columns)}", file=sys.stderr)
+        return 1
+    reached = index.upstream(starts) if args.upstream else index.downstream(starts)
+    by_name = index.by_name
+
+    if args.format == "json":
+        print(
+            json.dumps(
+                {
+                    "query": [display(s) for s in starts],
+                    "direction": "upstream" if args.upstream else "downstream",
+                    "columns": [
+                        {
+                            "column": display(node),
+                            "read_only": node[1] == READ,
+                            "hops": hops,
+                            "via": display(via),
+                            "layer": by_name[node[0][4:]].layer if node[0].startswith("ref:") and node[0][4:] in by_name else "source",
+                        }
+                        for node, (hops, via) in sorted(reached.items(), key=lambda kv: (kv[1][0], kv[0]))
+                    ],
+                },
+                indent=2,
+            )
+        )
+    elif args.format == "select":
+        models = sorted({by_name[r[4:]].name for r, _ in reached if r.startswith("ref:") and r[4:] in by_name})
+        print(" ".join(models))
+    else:
+        grouped: dict[str, list[tuple[int, str, str]]] = {}
+        for (rel, col), (hops, via) in reached.items():
+            grouped.setdefault(rel, []).append((hops, col, display(via)))
+        for rel in sorted(grouped, key=lambda r: (min(h for h, _, _ in grouped[r]), r)):
+            name = rel[4:] if rel.startswith("ref:") else rel
+            entry = by_name.get(name)
+            label = f"{entry.name} ({entry.layer})" if entry else name
+            print(label)
+            for hops, col, via in sorted(grouped[rel]):
+                col = col or "(read, not selected)"
+                print(f"  {col:<40} <- {via}" if not args.upstream else f"  {col:<40} -> {via}")
+
+    models = {r for r, _ in reached if r.startswith("ref:")}
+    columns = sum(1 for _, col in reached if col != READ)
+    print(
+        f"\n{', '.join(display(s) for s in starts)}: {columns} columns in {len(models)} models "
+        f"{'upstream' if args.upstream else 'downstream'} ({(time.perf_counter() - started) * 1000:.0f} ms)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
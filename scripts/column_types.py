@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+column_types.py — Parser and columnar store for the context column type DSL.
+
+Context table files encode each column's type in a small language documented
+in the domain headers:
+
+    s{N}        string(N)               s100, s32_calc
+    txt{N}      stringlong(N)           txt255, txt2k (k = x1000)
+    dbl[_unit]  double, optional unit   dbl, dbl_m, dbl_kPa, dbl_m3pd
+    int / dt / bool                     integer / datetime / boolean
+    ..._calc    calculated field        dbl_m_calc, dt_calc
+
+Some ProdView tables spell the same thing out (`double, meter`,
+`string 20, calculated`, `stringlong 100`), and the ODA / ComboCurve / HubSpot
+files use warehouse type names (`txt`, `ts`, `float`, `TIMESTAMP_NTZ`). All
+three forms parse to one ColumnType record with a canonical base type,
+length, unit code (the DSL spelling: "m", "kPa", "m3pd"...) and calc flag.
+
+TypedCatalog loads every column from the compiled context catalog
+(scripts/context_catalog.py) into parallel arrays — small ints for base type,
+unit and flags, interned strings for names — so filters such as "all
+meter-unit calc columns in WellView" are one pass over a few MB.
+
+Usage:
+    # Parse type tokens
+    python scripts/column_types.py parse dbl_m_calc txt2k "double, joule, calculated"
+
+    # Filter columns
+    python scripts/column_types.py columns --source wellview --unit m --calc
+    python scripts/column_types.py columns --base string --min-length 255 --format json
+
+    # Type / unit distribution
+    python scripts/column_types.py stats --source prodview
+
+Exit codes:
+    0 — success
+    1 — nothing matched (or a token failed to parse)
+    2 — script error (bad arguments, unreadable catalog)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+from context_catalog import open_catalog
+
+# Canonical base types; a ColumnType stores the index into this tuple.
+BASE_TYPES = (
+    "unknown",
+    "string",
+    "text",
+    "double",
+    "float",
+    "number",
+    "integer",
+    "boolean",
+    "datetime",
+    "timestamp",
+    "date",
+    "variant",
+)
+_BASE_INDEX = {name: i for i, name in enumerate(BASE_TYPES)}
+
+# Every spelling of a base type seen in the context files
+_BASE_ALIASES = {
+    "s": "string",
+    "string": "string",
+    "txt": "text",
+    "text": "text",
+    "stringlong": "text",
+    "dbl": "double",
+    "double": "double",
+    "float": "float",
+    "num": "number",
+    "number": "number",
+    "int": "integer",
+    "integer": "integer",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "dt": "datetime",
+    "datetime": "datetime",
+    "ts": "timestamp",
+    "timestamp": "timestamp",
+    "timestamp_ntz": "timestamp",
+    "date": "date",
+    "variant": "variant",
+}
+
+# Verbose ProdView unit names -> the DSL unit code used everywhere else
+_UNIT_ALIASES = {
+    "meter": "m",
+    "joule": "J",
+    "joule per cubic meter": "Jpm3",
+    "cubic meters per cubic meter": "m3pm3",
+    "cubic meter per meter": "m3pm",
+    "days": "days",
+    "kilograms per cubic meter": "kgpm3",
+    "kilograms per kilogram": "kgpkg",
+    "kilopascals": "kPa",
+    "degrees celcius": "degC",
+    "degrees celsius": "degC",
+    "watt": "W",
+    "amp": "A",
+    "ohm": "ohm",
+    "hertz": "Hz",
+    "mol/mol": "molpmol",
+    "rotations per minute": "rpm",
+    "strokes per minute": "spm",
+    "square meters per day": "m2pd",
+    "pascal seconds": "Pas",
+    "newton meters": "Nm",
+    "cost": "cost",
+}
+
+# s100, txt2k, dbl_m3pd_calc, dt_calc, int
+_COMPACT_RE = re.compile(
+    r"^(?P<base>s|txt|dbl|int|dt|bool)(?P<len>\d+k?)?(?:_(?P<unit>(?!calc$)[A-Za-z0-9]+))?"
+    r"(?P<calc>_calc)?$"
+)
+# "string 20, calculated" / "double, joule per cubic meter" / "datetime 8"
+_VERBOSE_RE = re.compile(r"^(?P<base>[a-z]+)(?:\s+(?P<len>\d+))?(?P<rest>(?:\s*,\s*[^,]+)*)$")
+
+
+@dataclass(slots=True, frozen=True)
+class ColumnType:
+    """A parsed type token. ``length`` is 0 and ``unit`` "" when absent."""
+
+    token: str
+    base: str
+    length: int = 0
+    unit: str = ""
+    calc: bool = False
+
+    @property
+    def known(self) -> bool:
+        return self.base != "unknown"
+
+
+def _parse_length(text: str | None) -> int:
+    if not text:
+        return 0
+    if text.endswith("k"):
+        return int(text[:-1]) * 1000
+    return int(text)
+
+
+@lru_cache(maxsize=None)
+def parse_type(token: str) -> ColumnType:
+    """Parse one type token. Unrecognised tokens get base "unknown", never raise.
+
+    Cached: the whole catalog uses only a couple of hundred distinct tokens.
+    """
+    text = token.strip()
+    m = _COMPACT_RE.match(text)
+    if m:
+        return ColumnType(
+            token=token,
+            base=_BASE_ALIASES[m.group("base")],
+            length=_parse_length(m.group("len")),
+            unit=m.group("unit") or "",
+            calc=bool(m.group("calc")),
+        )
+
+    lowered = text.lower()
+    if lowered in _BASE_ALIASES:
+        return ColumnType(token=token, base=_BASE_ALIASES[lowered])
+
+    m = _VERBOSE_RE.match(lowered)
+    if m and m.group("base") in _BASE_ALIASES:
+        unit, calc = "", False
+        for part in (p.strip() for p in m.group("rest").split(",") if p.strip()):
+            if part == "calculated":
+                calc = True
+            else:
+                unit = _UNIT_ALIASES.get(part, part)
+        return ColumnType(
+            token=token,
+            base=_BASE_ALIASES[m.group("base")],
+            length=_parse_length(m.group("len")),
+            unit=unit,
+            calc=calc,
+        )
+
+    return ColumnType(token=token, base="unknown")
+
+
+# ── Columnar store ──────────────────────────────────────────────────────────
+
+
+@dataclass
+class TypedColumn:
+    """One row materialised out of a TypedCatalog."""
+
+    source: str
+    domain: str
+    table: str
+    name: str
+    base: str
+    length: int
+    unit: str
+    calc: bool
+    token: str
+    description: str
+
+
+class _Interner:
+    """Maps repeated strings to small ints; ``values[i]`` turns them back."""
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+    def get(self, value: str) -> int | None:
+        return self._index.get(value)
+
+
+class TypedCatalog:
+    """Every context column as parallel arrays, one entry per column.
+
+    Low-cardinality fields (source, domain, table, base, unit, token) are
+    stored as interned ids in ``array`` buffers; names and descriptions are
+    plain lists. Filters run over the arrays and only materialise matches.
+    """
+
+    def __init__(self) -> None:
+        self.sources = _Interner()
+        self.domains = _Interner()
+        self.tables = _Interner()
+        self.units = _Interner()
+        self.tokens = _Interner()
+        self.units("")  # id 0 = no unit
+        self.source_ids = array("H")
+        self.domain_ids = array("H")
+        self.table_ids = array("I")
+        self.base_ids = array("B")
+        self.lengths = array("I")
+        self.unit_ids = array("H")
+        self.calc = array("B")
+        self.token_ids = array("H")
+        self.names: list[str] = []
+        self.descriptions: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(
+        self,
+        source: str,
+        domain: str,
+        table: str,
+        name: str,
+        token: str,
+        description: str,
+    ) -> None:
+        parsed = parse_type(token)
+        self.source_ids.append(self.sources(source))
+        self.domain_ids.append(self.domains(domain))
+        self.table_ids.append(self.tables(table))
+        self.base_ids.append(_BASE_INDEX[parsed.base])
+        self.lengths.append(parsed.length)
+        self.unit_ids.append(self.units(parsed.unit))
+        self.calc.append(parsed.calc)
+        self.token_ids.append(self.tokens(token))
+        self.names.append(name)
+        self.descriptions.append(description)
+
+    @classmethod
+    def load(cls, refresh: bool = False) -> TypedCatalog:
+        """Load every column from the compiled context catalog."""
+        typed = cls()
+        with open_catalog(refresh=refresh) as catalog:
+            rows = catalog.conn.execute(
+                "SELECT t.source, t.domain, t.name AS tbl, c.name, c.type_token, c.description "
+                "FROM columns c JOIN tables t ON t.id = c.table_id "
+                "ORDER BY t.source, t.name, c.position"
+            )
+            for row in rows:
+                typed.append(*row)
+        return typed
+
+    def select(
+        self,
+        source: str | None = None,
+        domain: str | None = None,
+        table: str | None = None,
+        base: str | None = None,
+        unit: str | None = None,
+        calc: bool | None = None,
+        min_length: int = 0,
+    ) -> list[int]:
+        """Row indices matching every given filter, in catalog order."""
+        wanted: list[tuple[array, int]] = []
+        for value, interner, ids in (
+            (source, self.sources, self.source_ids),
+            (domain, self.domains, self.domain_ids),
+            (table, self.tables, self.table_ids),
+            (unit, self.units, self.unit_ids),
+        ):
+            if value is not None:
+                idx = interner.get(value)
+                if idx is None:
+                    return []
+                wanted.append((ids, idx))
+        if base is not None:
+            if base not in _BASE_INDEX:
+                return []
+            wanted.append((self.base_ids, _BASE_INDEX[base]))
+        if calc is not None:
+            wanted.append((self.calc, int(calc)))
+
+        lengths = self.lengths
+        return [
+            i
+            for i in range(len(self))
+            if all(ids[i] == idx for ids, idx in wanted) and lengths[i] >= min_length
+        ]
+
+    def row(self, i: int) -> TypedColumn:
+        return TypedColumn(
+            source=self.sources.values[self.source_ids[i]],
+            domain=self.domains.values[self.domain_ids[i]],
+            table=self.tables.values[self.table_ids[i]],
+            name=self.names[i],
+            base=BASE_TYPES[self.base_ids[i]],
+            length=self.lengths[i],
+            unit=self.units.values[self.unit_ids[i]],
+            calc=bool(self.calc[i]),
+            token=self.tokens.values[self.token_ids[i]],
+            description=self.descriptions[i],
+        )
+
+    def unknown_tokens(self) -> list[str]:
+        """Distinct tokens the parser could not classify."""
+        unknown = _BASE_INDEX["unknown"]
+        return sorted(
+            {self.tokens.values[t] for t, b in zip(self.token_ids, self.base_ids) if b == unknown}
+        )
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Parse context column types and query them as columnar data."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    parse_p = sub.add_parser("parse", help="Parse type tokens")
+    parse_p.add_argument("tokens", nargs="+", help="Type tokens, e.g. dbl_m_calc")
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--source", help="Restrict to one source")
+    filters.add_argument("--domain", help="Restrict to one domain")
+    filters.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Bring the context catalog up to date first",
+    )
+
+    columns_p = sub.add_parser("columns", parents=[filters], help="Filter columns by type")
+    columns_p.add_argument("--table", help="Restrict to one table (exact name)")
+    columns_p.add_argument("--base", choices=BASE_TYPES, help="Base type")
+    columns_p.add_argument("--unit", help="Unit code, e.g. m, kPa, m3pd")
+    calc = columns_p.add_mutually_exclusive_group()
+    calc.add_argument("--calc", dest="calc", action="store_true", default=None)
+    calc.add_argument("--no-calc", dest="calc", action="store_false")
+    columns_p.add_argument("--min-length", type=int, default=0, help="Minimum length")
+    columns_p.add_argument("--format", choices=["text", "json"], default="text")
+
+    sub.add_parser("stats", parents=[filters], help="Base type / unit distribution")
+
+    args = parser.parse_args()
+
+    if args.command == "parse":
+        parsed = [parse_type(t) for t in args.tokens]
+        print(json.dumps([asdict(p) for p in parsed], indent=2))
+        return 0 if all(p.known for p in parsed) else 1
+
+    typed = TypedCatalog.load(refresh=args.refresh)
+
+    if args.command == "stats":
+        rows = typed.select(source=args.source, domain=args.domain)
+        bases = Counter(BASE_TYPES[typed.base_ids[i]] for i in rows)
+        units = Counter(typed.units.values[typed.unit_ids[i]] for i in rows)
+        calc_count = sum(typed.calc[i] for i in rows)
+        print(f"{len(rows)} columns, {calc_count} calculated")
+        print("Base types: " + ", ".join(f"{b}={n}" for b, n in bases.most_common()))
+        print("Units: " + ", ".join(f"{u}={n}" for u, n in units.most_common() if u))
+        unknown = typed.unknown_tokens()
+        if unknown:
+            print("Unparsed tokens: " + ", ".join(unknown), file=sys.stderr)
+        return 0
+
+    rows = typed.select(
+        source=args.source,
+        domain=args.domain,
+        table=args.table,
+        base=args.base,
+        unit=args.unit,
+        calc=args.calc,
+        min_length=args.min_length,
+    )
+    if args.format == "json":
+        print(json.dumps([asdict(typed.row(i)) for i in rows], indent=2))
+    else:
+        for i in rows:
+            r = typed.row(i)
+            print(f"{r.source}.{r.table}.{r.name}({r.token})  {r.description}")
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,880 @@
+#!/usr/bin/env python3
+"""
+context_catalog.py — Compiled index and search over context table definitions.
+
+Compiles context/sources/*/tables/*.yaml into one SQLite file at
+target/context_catalog.sqlite holding source, domain, table, column, type token
+and description, so "columns of pvUnitTank" or "which tables have IDRecItem"
+is an indexed lookup instead of a glob-and-reparse over hundreds of files.
+
+The same file carries an FTS5 inverted index over table header lines and
+column descriptions, so "stroke length" or "required by date" is a ranked
+(BM25) search across every source instead of a grep. Column names are indexed
+both whole and split on camelCase (`DtTmRequired` also matches "required"),
+terms match as prefixes, and hits on a name outrank hits in a description.
+
+Domain files (context/sources/*/domains/*.yaml) are indexed only for their
+`# OMITTED (on all tables): IDRec sysMod* *TK ...` lines, the column patterns
+deliberately left out of every table file in that domain.
+
+Both table file layouts are understood:
+  - the compact layout used by ProdView, WellView, ODA and ComboCurve
+    (`pvUnitTank: Tanks +parent` then `  Name(s50) #Tank Name`)
+  - the HubSpot column reference layout (`- name:` / `type:` / `description:`
+    list items under top_level_columns / properties)
+
+The build is incremental: files whose (mtime, size) are unchanged are not
+read, and files whose content hash is unchanged are not re-parsed. Queries
+read the compiled catalog as-is (building it first only if it is missing or
+was built by a different parser); run `build` or split_context_tables.py to
+pick up edits.
+
+Usage:
+    # Build / refresh the catalog
+    python scripts/context_catalog.py build
+    python scripts/context_catalog.py build --rebuild
+
+    # Columns of a table (case-insensitive)
+    python scripts/context_catalog.py columns pvUnitTank
+
+    # Tables that have a column
+    python scripts/context_catalog.py find-column IDRecItem
+
+    # Ranked full-text search over table and column descriptions
+    python scripts/context_catalog.py search "stroke length"
+    python scripts/context_catalog.py search "required by date" --source wellview
+    python scripts/context_catalog.py search tank cap --kind column --limit 5
+
+    # List tables, optionally filtered
+    python scripts/context_catalog.py tables --source wellview --domain other
+
+    # Any query as JSON
+    python scripts/context_catalog.py columns wvAFECalc --format json
+
+Exit codes:
+    0 — success
+    1 — nothing found
+    2 — script error (bad arguments, unreadable catalog)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONTEXT_DIR = PROJECT_ROOT / "context" / "sources"
+CATALOG_PATH = PROJECT_ROOT / "target" / "context_catalog.sqlite"
+
+# Bump when the table layout changes; an older catalog file is discarded.
+# Parser changes are caught by parser_fingerprint().
+SCHEMA_VERSION = 3
+
+# bm25() column weights for the search index: name, description, table
+SEARCH_WEIGHTS = (10.0, 1.0, 0.5)
+SEARCH_LIMIT = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    sha256   TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tables (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    source      TEXT NOT NULL,
+    domain      TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS columns (
+    table_id    INTEGER NOT NULL REFERENCES tables(id) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    type_token  TEXT NOT NULL,
+    description TEXT NOT NULL,
+    line        INTEGER NOT NULL,
+    PRIMARY KEY (table_id, position)
+);
+CREATE TABLE IF NOT EXISTS omitted_columns (
+    path    TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    source  TEXT NOT NULL,
+    domain  TEXT NOT NULL,
+    pattern TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tables_name ON tables(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS tables_path ON tables(path);
+CREATE INDEX IF NOT EXISTS columns_name ON columns(name COLLATE NOCASE);
+
+-- One search document per table header (position NULL) and per column. The
+-- FTS rowid is the document id, so deleting a file cascades through tables
+-- to search_docs and the trigger drops the matching index rows.
+CREATE TABLE IF NOT EXISTS search_docs (
+    id       INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(id) ON DELETE CASCADE,
+    position INTEGER
+);
+CREATE INDEX IF NOT EXISTS search_docs_table ON search_docs(table_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    name, description, tbl, tokenize = 'unicode61', prefix = '2 3'
+);
+"""
+
+SEARCH_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS search_docs_delete AFTER DELETE ON search_docs BEGIN
+    DELETE FROM search WHERE rowid = old.id;
+END
+"""
+
+# `pvUnitTank: Tanks +parent` — first unindented `Name: ...` line
+HEADER_RE = re.compile(r"^([A-Za-z_]\w*):\s*(.*)$")
+# `  VolCapacity(dbl_m3) #Tank Capacity Volume` (ODA has `_meta/op(txt)`)
+COLUMN_RE = re.compile(r"^\s+([\w/$]+)\(([^)]*)\)\s*(?:#\s?(.*))?$")
+# Trailing `+parent` / `+ext,parent` tag tokens on a header line
+TAGS_RE = re.compile(r"(?:\s+\+[\w,]+)+\s*$")
+# `# Source: context/sources/prodview/domains/tanks.yaml`
+DOMAIN_RE = re.compile(r"^#\s*Source:\s*\S*/domains/(\w+)\.yaml")
+# `# oda / afe_budgeting / ODA_AFEBUDGET` — title line, for files without Source:
+TITLE_RE = re.compile(r"^#\s*\w+\s*/\s*(\w+)\s*/\s*[\w$]+\s*$")
+# `# OMITTED (on all tables): IDFlowNet sysLock* ...` and its `#   ...` continuation
+OMITTED_RE = re.compile(r"^#\s*OMITTED\s*\(on all tables\):(.*)$", re.IGNORECASE)
+OMITTED_CONT_RE = re.compile(r"^#\s{2,}(\S.*)$")
+_OMITTED_PATTERN_RE = re.compile(r"^[\w*/$]+$")
+# HubSpot list layout
+HUBSPOT_TABLE_RE = re.compile(r"^table_name:\s*(\S+)")
+HUBSPOT_SECTION_RE = re.compile(r"^(\w+):\s*$")
+HUBSPOT_ITEM_RE = re.compile(r"^\s*(-\s+)?(name|type|description):\s*(.*)$")
+# camelCase / ACRONYMWord / snake_case boundaries: IDRecItem -> ID Rec Item
+_WORD_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])|[_/]+")
+_QUERY_TERM_RE = re.compile(r"\w+")
+
+
+@dataclass
+class ColumnDef:
+    """One column line from a table file."""
+
+    name: str
+    type_token: str
+    description: str
+    line: int
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result; ``column`` is None for a table-level hit."""
+
+    source: str
+    domain: str
+    table: str
+    column: ColumnDef | None
+    description: str
+    score: float
+    path: str
+
+
+class AmbiguousTableError(LookupError):
+    """A table name matched in more than one source and none was given."""
+
+    def __init__(self, name: str, sources: list[str]):
+        super().__init__(
+            f"Table {name} exists in several sources ({', '.join(sources)}); pass a source."
+        )
+        self.name = name
+        self.sources = sources
+
+
+@dataclass
+class TableDef:
+    """One table parsed from a per-table context file."""
+
+    name: str
+    source: str
+    domain: str
+    description: str
+    tags: list[str] = field(default_factory=list)
+    columns: list[ColumnDef] = field(default_factory=list)
+    path: str = ""
+
+
+# ── Parsing ─────────────────────────────────────────────────────────────────
+
+
+def parse_table_file(content: str, source: str, path: str = "") -> list[TableDef]:
+    """Parse one tables/*.yaml file. Returns [] if it holds no table."""
+    lines = content.split("\n")
+    if any(HUBSPOT_TABLE_RE.match(line) for line in lines):
+        return _parse_hubspot(lines, source, path)
+
+    domain = ""
+    table: TableDef | None = None
+    tables: list[TableDef] = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if line.startswith("#"):
+            m = DOMAIN_RE.match(line)
+            if m:
+                domain = m.group(1)
+            elif not domain:
+                m = TITLE_RE.match(line)
+                domain = m.group(1) if m else ""
+            continue
+        m = COLUMN_RE.match(line)
+        if m and table is not None:
+            table.columns.append(
+                ColumnDef(m.group(1), m.group(2), (m.group(3) or "").strip(), lineno)
+            )
+            continue
+        m = HEADER_RE.match(line)
+        if m:
+            description, tags = m.group(2), []
+            tag_match = TAGS_RE.search(description)
+            if tag_match:
+                tags = [
+                    t for chunk in tag_match.group(0).split() for t in chunk[1:].split(",") if t
+                ]
+                description = description[: tag_match.start()]
+            table = TableDef(m.group(1), source, domain, description.strip(), tags, path=path)
+            tables.append(table)
+    for t in tables:
+        t.domain = domain
+    return tables
+
+
+def _parse_hubspot(lines: list[str], source: str, path: str) -> list[TableDef]:
+    """Parse the HubSpot `- name:` / `type:` / `description:` list layout."""
+    name = ""
+    section = ""
+    columns: list[ColumnDef] = []
+    current: dict[str, str] | None = None
+    current_line = 0
+
+    def flush() -> None:
+        if current and current.get("name"):
+            columns.append(
+                ColumnDef(
+                    current["name"],
+                    current.get("type", ""),
+                    current.get("description", ""),
+                    current_line,
+                )
+            )
+
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        m = HUBSPOT_TABLE_RE.match(line)
+        if m:
+            name = m.group(1)
+            continue
+        m = HUBSPOT_SECTION_RE.match(line)
+        if m:
+            flush()
+            current = None
+            section = m.group(1)
+            if section == "properties":
+                # The section documents the keys of the PROPERTIES variant column.
+                columns.append(
+                    ColumnDef("PROPERTIES", "VARIANT", "HubSpot properties object", lineno)
+                )
+            continue
+        if not section.endswith("columns") and section != "properties":
+            continue
+        m = HUBSPOT_ITEM_RE.match(line)
+        if not m:
+            continue
+        if m.group(1):
+            flush()
+            current, current_line = {}, lineno
+        if current is not None:
+            current[m.group(2)] = m.group(3).strip()
+    flush()
+
+    if not name:
+        return []
+    return [TableDef(name, source, "", "", [], columns, path=path)]
+
+
+def split_identifier(name: str) -> str:
+    """``DtTmRequired`` -> ``DtTmRequired Dt Tm Required`` for indexing."""
+    parts = _WORD_BOUNDARY_RE.sub(" ", name).split()
+    return " ".join([name] + parts) if len(parts) > 1 else name
+
+
+def build_match_query(text: str, prefix: bool = True) -> str:
+    """Turn free text into an FTS5 MATCH expression (implicit AND of terms).
+
+    Every term is quoted, so user input can never be parsed as FTS syntax.
+    """
+    terms = _QUERY_TERM_RE.findall(text)
+    return " ".join(f'"{t}"*' if prefix else f'"{t}"' for t in terms)
+
+
+def parse_omitted_patterns(content: str) -> list[str]:
+    """Column glob patterns from a domain header's `OMITTED (on all tables)` block.
+
+    Only the all-tables form is taken; `(on most tables)` notes can't be
+    trusted for any one table.
+    """
+    patterns: list[str] = []
+    in_block = False
+    for line in content.split("\n"):
+        m = OMITTED_RE.match(line)
+        if m:
+            in_block, text = True, m.group(1)
+        elif in_block and OMITTED_CONT_RE.match(line):
+            text = OMITTED_CONT_RE.match(line).group(1)
+        else:
+            in_block = False
+            continue
+        text = re.sub(r"\([^)]*\)", " ", text)
+        patterns.extend(
+            w for w in text.split() if _OMITTED_PATTERN_RE.match(w) and w.lower() != "columns"
+        )
+    return patterns
+
+
+def find_table_files(source: str | None = None) -> list[tuple[str, Path]]:
+    """All (source, path) pairs under context/sources/*/tables/ and */domains/."""
+    results = []
+    for source_dir in sorted(CONTEXT_DIR.iterdir()):
+        if not source_dir.is_dir():
+            continue
+        if source and source_dir.name != source:
+            continue
+        for yaml_file in sorted((source_dir / "domains").glob("*.yaml")):
+            results.append((source_dir.name, yaml_file))
+        for yaml_file in sorted((source_dir / "tables").glob("*.yaml")):
+            results.append((source_dir.name, yaml_file))
+    return results
+
+
+def parser_fingerprint() -> str:
+    """Hash of the code that turns table files into rows; a change forces a rebuild."""
+    h = hashlib.sha256(str(SCHEMA_VERSION).encode())
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+# ── Catalog ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class BuildStats:
+    files: int = 0
+    reparsed: int = 0
+    removed: int = 0
+
+
+class ContextCatalog:
+    """SQLite-backed catalog of context tables and columns."""
+
+    def __init__(self, path: Path = CATALOG_PATH):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect()
+        version = self._schema_version()
+        if version == SCHEMA_VERSION:
+            return  # read-only open: several processes may share the file
+        if version is not None:
+            # CREATE ... IF NOT EXISTS can't migrate; the catalog is derived
+            # data, so start over.
+            self.conn.close()
+            self.path.unlink()
+            self.conn = self._connect()
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(SEARCH_TRIGGER)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        self.conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _schema_version(self) -> int | None:
+        try:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None  # fresh file
+        return int(row["value"]) if row else 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> ContextCatalog:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── Build ───────────────────────────────────────────────────────────
+
+    @property
+    def is_current(self) -> bool:
+        """True if the catalog was built by this parser (contents may still lag)."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        return row is not None and row["value"] == parser_fingerprint()
+
+    def build(self, rebuild: bool = False) -> BuildStats:
+        """Bring the catalog up to date with context/sources/*/tables/."""
+        stats = BuildStats()
+        with self.conn:
+            current = self.is_current
+            if rebuild or not current:
+                # Clear the index in bulk rather than row-by-row via the trigger.
+                self.conn.execute("DELETE FROM search")
+                self.conn.execute("DROP TRIGGER search_docs_delete")
+                self.conn.execute("DELETE FROM files")  # cascades to everything else
+                self.conn.execute(SEARCH_TRIGGER)
+            known = {
+                row["path"]: row
+                for row in self.conn.execute("SELECT path, sha256, mtime_ns, size FROM files")
+            }
+            seen = set()
+            for source, filepath in find_table_files():
+                rel = str(filepath.relative_to(PROJECT_ROOT))
+                seen.add(rel)
+                stats.files += 1
+                st = filepath.stat()
+                row = known.get(rel)
+                if row and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                    continue
+
+                content = filepath.read_bytes()
+                digest = hashlib.sha256(content).hexdigest()
+                if row and row["sha256"] == digest:
+                    # Touched but not edited: just record the new stat.
+                    self.conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                        (st.st_mtime_ns, st.st_size, rel),
+                    )
+                    continue
+
+                self.conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                self.conn.execute(
+                    "INSERT INTO files (path, sha256, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                    (rel, digest, st.st_mtime_ns, st.st_size),
+                )
+                text = content.decode("utf-8")
+                if filepath.parent.name == "domains":
+                    self.conn.executemany(
+                        "INSERT INTO omitted_columns (path, source, domain, pattern) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(rel, source, filepath.stem, p) for p in parse_omitted_patterns(text)],
+                    )
+                else:
+                    for table in parse_table_file(text, source, rel):
+                        self._insert(table)
+                stats.reparsed += 1
+
+            for rel in set(known) - seen:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                stats.removed += 1
+
+            if not current:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                    (parser_fingerprint(),),
+                )
+        return stats
+
+    def _insert(self, table: TableDef) -> None:
+        cur = self.conn.execute(
+            "INSERT INTO tables (path, source, domain, name, description, tags) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                table.path,
+                table.source,
+                table.domain,
+                table.name,
+                table.description,
+                ",".join(table.tags),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO columns (table_id, position, name, type_token, description, line) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (cur.lastrowid, pos, c.name, c.type_token, c.description, c.line)
+                for pos, c in enumerate(table.columns)
+            ],
+        )
+
+        # Search documents: the header line, then one per column.
+        first_id = self.conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM search_docs"
+        ).fetchone()[0]
+        table_words = split_identifier(table.name)
+        header_text = " ".join([table.description] + [f"+{t}" for t in table.tags])
+        docs = [(first_id, None, table_words, header_text, "")]
+        docs.extend(
+            (first_id + 1 + pos, pos, split_identifier(c.name), c.description, table_words)
+            for pos, c in enumerate(table.columns)
+        )
+        self.conn.executemany(
+            "INSERT INTO search_docs (id, table_id, position) VALUES (?, ?, ?)",
+            [(doc_id, cur.lastrowid, pos) for doc_id, pos, *_ in docs],
+        )
+        self.conn.executemany(
+            "INSERT INTO search (rowid, name, description, tbl) VALUES (?, ?, ?, ?)",
+            [(doc_id, name, text, tbl) for doc_id, _, name, text, tbl in docs],
+        )
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def _table_from_row(self, row: sqlite3.Row, with_columns: bool) -> TableDef:
+        table = TableDef(
+            name=row["name"],
+            source=row["source"],
+            domain=row["domain"],
+            description=row["description"],
+            tags=[t for t in row["tags"].split(",") if t],
+            path=row["path"],
+        )
+        if with_columns:
+            table.columns = [
+                ColumnDef(c["name"], c["type_token"], c["description"], c["line"])
+                for c in self.conn.execute(
+                    "SELECT name, type_token, description, line FROM columns "
+                    "WHERE table_id = ? ORDER BY position",
+                    (row["id"],),
+                )
+            ]
+        return table
+
+    def table(self, name: str, source: str | None = None) -> TableDef | None:
+        """Look up one table (case-insensitive) with its columns.
+
+        Raises AmbiguousTableError when ``name`` matches more than one table
+        (in practice: the same name in several sources and no ``source``),
+        rather than guessing and validating against the wrong columns.
+        """
+        sql = "SELECT * FROM tables WHERE name = ? COLLATE NOCASE"
+        params: list[str] = [name]
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        rows = self.conn.execute(sql + " ORDER BY source, path", params).fetchall()
+        if len(rows) > 1:
+            raise AmbiguousTableError(name, sorted({f"{r['source']}/{r['domain']}" for r in rows}))
+        return self._table_from_row(rows[0], with_columns=True) if rows else None
+
+    def columns(self, table: str, source: str | None = None) -> list[ColumnDef]:
+        """Columns of ``table`` in file order; [] if the table is unknown.
+
+        Raises AmbiguousTableError like table().
+        """
+        found = self.table(table, source)
+        return found.columns if found else []
+
+    def tables(self, source: str | None = None, domain: str | None = None) -> list[TableDef]:
+        """All tables (without columns), optionally filtered."""
+        sql = "SELECT * FROM tables WHERE 1 = 1"
+        params: list[str] = []
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        if domain:
+            sql += " AND domain = ?"
+            params.append(domain)
+        rows = self.conn.execute(sql + " ORDER BY source, name", params)
+        return [self._table_from_row(row, with_columns=False) for row in rows]
+
+    def tables_with_column(
+        self, column: str, source: str | None = None
+    ) -> list[tuple[TableDef, ColumnDef]]:
+        """Every (table, column) pair whose column name matches (case-insensitive)."""
+        sql = (
+            "SELECT t.*, c.name AS col_name, c.type_token, c.description AS col_description, "
+            "c.line FROM columns c JOIN tables t ON t.id = c.table_id "
+            "WHERE c.name = ? COLLATE NOCASE"
+        )
+        params: list[str] = [column]
+        if source:
+            sql += " AND t.source = ?"
+            params.append(source)
+        results = []
+        for row in self.conn.execute(sql + " ORDER BY t.source, t.name", params):
+            col = ColumnDef(row["col_name"], row["type_token"], row["col_description"], row["line"])
+            results.append((self._table_from_row(row, with_columns=False), col))
+        return results
+
+    def search(
+        self,
+        text: str,
+        source: str | None = None,
+        domain: str | None = None,
+        kind: str | None = None,
+        limit: int = SEARCH_LIMIT,
+        prefix: bool = True,
+    ) -> list[SearchHit]:
+        """BM25-ranked hits for ``text`` over table headers and columns.
+
+        ``kind`` is "table" or "column" to restrict the hit type. Every term
+        must match (as a prefix unless ``prefix`` is False).
+        """
+        match = build_match_query(text, prefix=prefix)
+        if not match:
+            return []
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        sql = (
+            f"SELECT t.*, d.position, bm25(search, {weights}) AS score, "
+            "c.name AS col_name, c.type_token, c.description AS col_description, c.line "
+            "FROM search JOIN search_docs d ON d.id = search.rowid "
+            "JOIN tables t ON t.id = d.table_id "
+            "LEFT JOIN columns c ON c.table_id = d.table_id AND c.position = d.position "
+            "WHERE search MATCH ?"
+        )
+        params: list[object] = [match]
+        if source:
+            sql += " AND t.source = ?"
+            params.append(source)
+        if domain:
+            sql += " AND t.domain = ?"
+            params.append(domain)
+        if kind == "table":
+            sql += " AND d.position IS NULL"
+        elif kind == "column":
+            sql += " AND d.position IS NOT NULL"
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        hits = []
+        for row in self.conn.execute(sql, params):
+            column = None
+            if row["position"] is not None:
+                column = ColumnDef(
+                    row["col_name"], row["type_token"], row["col_description"], row["line"]
+                )
+            hits.append(
+                SearchHit(
+                    source=row["source"],
+                    domain=row["domain"],
+                    table=row["name"],
+                    column=column,
+                    description=column.description if column else row["description"],
+                    # bm25() is "lower is better"; report it the intuitive way round
+                    score=round(-row["score"], 3),
+                    path=row["path"],
+                )
+            )
+        return hits
+
+    def omitted_patterns(self) -> dict[tuple[str, str], list[str]]:
+        """(source, domain) -> column glob patterns left out of every table file."""
+        patterns: dict[tuple[str, str], list[str]] = {}
+        for row in self.conn.execute(
+            "SELECT source, domain, pattern FROM omitted_columns ORDER BY rowid"
+        ):
+            patterns.setdefault((row["source"], row["domain"]), []).append(row["pattern"])
+        return patterns
+
+    def digest(self) -> str:
+        """Hash of every indexed file's content; changes whenever the context does."""
+        h = hashlib.sha256()
+        for row in self.conn.execute("SELECT path, sha256 FROM files ORDER BY path"):
+            h.update(f"{row['path']}:{row['sha256']}\n".encode())
+        return h.hexdigest()
+
+    def counts(self) -> dict[str, int]:
+        return {
+            name: self.conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            for name in ("files", "tables", "columns")
+        }
+
+
+def open_catalog(refresh: bool = False, rebuild: bool = False) -> ContextCatalog:
+    """Open the catalog, building it if asked to or if it is missing/stale."""
+    catalog = ContextCatalog()
+    if refresh or rebuild or not catalog.is_current:
+        catalog.build(rebuild=rebuild)
+    return catalog
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def hit_limit(value: str) -> int:
+    """argparse type for ``--limit``: SQLite reads a negative LIMIT as no limit."""
+    limit = int(value)
+    if limit < 1:
+        raise argparse.ArgumentTypeError(f"limit must be at least 1, got {limit}")
+    return limit
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Query a compiled index of context table and column definitions."
+    )
+    query = argparse.ArgumentParser(add_help=False)
+    query.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    query.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Bring the catalog up to date before querying",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_p = sub.add_parser("build", help="Build or refresh the catalog")
+    build_p.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop the catalog and re-parse every table file",
+    )
+
+    columns_p = sub.add_parser("columns", parents=[query], help="List the columns of a table")
+    columns_p.add_argument("table", help="Table name, e.g. pvUnitTank")
+    columns_p.add_argument("--source", help="Restrict to one source")
+
+    find_p = sub.add_parser("find-column", parents=[query], help="List tables that have a column")
+    find_p.add_argument("column", help="Column name, e.g. IDRecItem")
+    find_p.add_argument("--source", help="Restrict to one source")
+
+    search_p = sub.add_parser("search", parents=[query], help="Ranked full-text search")
+    search_p.add_argument("text", nargs="+", help="Search terms, e.g. stroke length")
+    search_p.add_argument("--source", help="Restrict to one source")
+    search_p.add_argument("--domain", help="Restrict to one domain")
+    search_p.add_argument(
+        "--kind",
+        choices=["table", "column"],
+        help="Only table-level or only column-level hits",
+    )
+    search_p.add_argument(
+        "--limit",
+        type=hit_limit,
+        default=SEARCH_LIMIT,
+        help=f"Maximum hits (default: {SEARCH_LIMIT})",
+    )
+    search_p.add_argument(
+        "--exact",
+        action="store_true",
+        help="Match whole terms only (default: terms match as prefixes)",
+    )
+
+    tables_p = sub.add_parser("tables", parents=[query], help="List tables")
+    tables_p.add_argument("--source", help="Restrict to one source")
+    tables_p.add_argument("--domain", help="Restrict to one domain")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            with ContextCatalog() as catalog:
+                stats = catalog.build(rebuild=args.rebuild)
+                counts = catalog.counts()
+            print(
+                f"Catalog: {counts['tables']} tables, {counts['columns']} columns from "
+                f"{stats.files} files ({stats.reparsed} re-parsed, {stats.removed} removed) "
+                f"-> {CATALOG_PATH.relative_to(PROJECT_ROOT)}",
+                file=sys.stderr,
+            )
+            return 0
+
+        with open_catalog(refresh=args.refresh) as catalog:
+            if args.command == "columns":
+                try:
+                    table = catalog.table(args.table, args.source)
+                except AmbiguousTableError as exc:
+                    print(
+                        f"Table {args.table} is in several sources ({', '.join(exc.sources)}); "
+                        "pick one with --source.",
+                        file=sys.stderr,
+                    )
+                    return 2
+                if table is None:
+                    print(f"Unknown table: {args.table}", file=sys.stderr)
+                    return 1
+                if args.format == "json":
+                    print(json.dumps(asdict(table), indent=2))
+                else:
+                    print(f"{table.source} / {table.domain or '-'} / {table.name}")
+                    width = max((len(c.name) for c in table.columns), default=0)
+                    for c in table.columns:
+                        print(f"  {c.name:<{width}}  {c.type_token:<14} {c.description}")
+                return 0
+
+            if args.command == "find-column":
+                matches = catalog.tables_with_column(args.column, args.source)
+                if args.format == "json":
+                    print(
+                        json.dumps(
+                            [
+                                {
+                                    "source": t.source,
+                                    "domain": t.domain,
+                                    "table": t.name,
+                                    "column": c.name,
+                                    "type": c.type_token,
+                                    "description": c.description,
+                                    "path": t.path,
+                                    "line": c.line,
+                                }
+                                for t, c in matches
+                            ],
+                            indent=2,
+                        )
+                    )
+                else:
+                    for t, c in matches:
+                        print(f"{t.source}.{t.name}.{c.name}({c.type_token})  {t.path}:{c.line}")
+                return 0 if matches else 1
+
+            if args.command == "search":
+                hits = catalog.search(
+                    " ".join(args.text),
+                    source=args.source,
+                    domain=args.domain,
+                    kind=args.kind,
+                    limit=args.limit,
+                    prefix=not args.exact,
+                )
+                if args.format == "json":
+                    print(json.dumps([asdict(h) for h in hits], indent=2))
+                else:
+                    for h in hits:
+                        if h.column:
+                            target = f"{h.source}.{h.table}.{h.column.name}({h.column.type_token})"
+                        else:
+                            target = f"{h.source}.{h.table}"
+                        print(f"{h.score:7.2f}  {target}  {h.description}")
+                return 0 if hits else 1
+
+            tables = catalog.tables(args.source, args.domain)
+            if args.format == "json":
+                print(json.dumps([asdict(t) for t in tables], indent=2))
+            else:
+                for t in tables:
+                    print(f"{t.source}.{t.name}  {t.description}")
+            return 0 if tables else 1
+    except sqlite3.Error as exc:
+        print(f"Catalog error ({CATALOG_PATH}): {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
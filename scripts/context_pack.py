@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+context_pack.py — Minimal, token-budgeted context bundle for one model.
+
+split_context_tables.py breaks the source context into per-table files so a
+task only loads what it needs; this picks those files. Given a model it
+follows ref()/source() upstream (scripts/model_graph.py), maps every source
+table to its context/sources/<source>/tables/ file (scripts/context_catalog.py)
+and assembles, deduplicated and in priority order:
+
+  1. table files of the model's own source() tables
+  2. the conventions doc for the model's layer (staging / intermediate / marts)
+  3. the domain files of those tables (header and relationships only — the
+     domain's table listing repeats the table files)
+  4. incremental.md (incremental models) and sql-patterns.md
+  5. the same table and domain files for sources reached through ref(),
+     nearest first
+
+Items are added whole, in that order, while they fit the budget; anything
+that doesn't fit is listed as dropped. Token counts are an estimate
+(CHARS_PER_TOKEN), which is close enough for budgeting without a tokenizer.
+
+Packs are cached in target/context_packs/<model>.json together with the
+(mtime, size, sha256) of every input — the model and everything upstream of
+it, each file in the pack, and the tables/ directories of its sources — so a
+repeat request is answered without loading the graph or the catalog.
+
+Usage:
+    # Print the bundle for a model (by name or path)
+    python scripts/context_pack.py stg_prodview__tanks
+    python scripts/context_pack.py models/operations/intermediate/well_360/well_360.sql
+
+    # Tighter budget; list the files instead of printing them
+    python scripts/context_pack.py int_wellview__job_summary --budget 4000 --format manifest
+
+    # Full detail, ignoring the cache
+    python scripts/context_pack.py stg_wellview__jobs --format json --no-cache
+
+Exit codes:
+    0 — success
+    2 — script error (unknown model)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from context_catalog import CONTEXT_DIR, AmbiguousTableError, ContextCatalog, open_catalog
+from model_graph import ModelGraph, load_graph
+from validate_staging import CONTEXT_SOURCE_MAP, CONTEXT_TABLE_PREFIXES
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONVENTIONS_DIR = PROJECT_ROOT / "docs" / "conventions"
+PACK_DIR = PROJECT_ROOT / "target" / "context_packs"
+
+# Bump when the pack layout changes.
+PACK_VERSION = 1
+
+DEFAULT_BUDGET = 12_000
+CHARS_PER_TOKEN = 4
+
+# Path segment -> conventions doc for the model's layer.
+LAYER_DOCS = {
+    "staging": "staging.md",
+    "intermediate": "intermediate.md",
+    "marts": "marts.md",
+}
+
+# Rank within one dependency distance; lower is kept first.
+RANK_TABLE = 0
+RANK_CONVENTIONS = 1
+RANK_DOMAIN = 2
+RANK_PATTERNS = 3
+
+DOMAIN_LISTING_MARKER = "# Tables in this domain"
+INCREMENTAL_RE = re.compile(r"""materialized\s*=\s*['"]incremental['"]""")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class PackItem:
+    path: str
+    kind: str  # table | domain | conventions
+    reason: str  # why it is in the pack
+    distance: int  # ref() hops from the model (0 = the model itself)
+    rank: int
+    tokens: int = 0
+    included: bool = False
+
+
+@dataclass
+class ContextPack:
+    model: str
+    model_path: str
+    budget: int
+    tokens: int = 0
+    items: list[PackItem] = field(default_factory=list)
+    unresolved: list[str] = field(default_factory=list)  # source tables with no context file
+    text: str = ""
+
+    @property
+    def included(self) -> list[PackItem]:
+        return [i for i in self.items if i.included]
+
+    @property
+    def dropped(self) -> list[PackItem]:
+        return [i for i in self.items if not i.included]
+
+
+# ── Resolution ──────────────────────────────────────────────────────────────
+
+
+def source_distances(graph: ModelGraph, model: str) -> tuple[dict[str, int], set[str]]:
+    """(source node -> fewest ref() hops to reach it, upstream model names)."""
+    names = graph.by_name
+    distances: dict[str, int] = {}
+    seen = {model}
+    queue = deque([(model, 0)])
+    while queue:
+        name, hops = queue.popleft()
+        entry = names.get(name)
+        if entry is None:
+            continue  # package model or a ref() to a model that doesn't exist
+        for src in entry.sources:
+            distances.setdefault(src, hops)
+        for parent in entry.refs:
+            if parent not in seen:
+                seen.add(parent)
+                queue.append((parent, hops + 1))
+    return distances, seen
+
+
+def context_table_name(source: str, table: str) -> tuple[str, str]:
+    """Map a source('x', 'y') call to the (context source, table) it documents."""
+    name = table.lower()
+    for prefix in CONTEXT_TABLE_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return CONTEXT_SOURCE_MAP.get(source, source), name
+
+
+def domain_relationships(path: Path) -> str:
+    """A domain file without its trailing table listing."""
+    text = path.read_text(encoding="utf-8")
+    head, marker, _ = text.partition(DOMAIN_LISTING_MARKER)
+    return head.rstrip() + "\n" if marker else text
+
+
+def collect_items(
+    catalog: ContextCatalog, model_path: str, sql: str, distances: dict[str, int]
+) -> tuple[list[PackItem], list[str]]:
+    """Every candidate file for the pack, deduplicated, plus unresolved sources."""
+    items: dict[str, PackItem] = {}
+    unresolved = []
+
+    def add(path: Path, kind: str, reason: str, distance: int, rank: int) -> None:
+        rel = str(path.relative_to(PROJECT_ROOT))
+        current = items.get(rel)
+        if current is None or (distance, rank) < (current.distance, current.rank):
+            items[rel] = PackItem(rel, kind, reason, distance, rank)
+
+    parts = Path(model_path).parts
+    for segment, doc in LAYER_DOCS.items():
+        if segment in parts:
+            add(CONVENTIONS_DIR / doc, "conventions", f"{segment} model", 0, RANK_CONVENTIONS)
+            break
+    if INCREMENTAL_RE.search(sql):
+        add(CONVENTIONS_DIR / "incremental.md", "conventions", "incremental model", 0, RANK_PATTERNS)
+    add(CONVENTIONS_DIR / "sql-patterns.md", "conventions", "shared SQL patterns", 0, RANK_PATTERNS)
+
+    for node, distance in sorted(distances.items(), key=lambda kv: (kv[1], kv[0])):
+        source, _, table = node.partition(".")
+        ctx_source, name = context_table_name(source, table)
+        try:
+            found = catalog.table(name, ctx_source)
+        except AmbiguousTableError:
+            found = None
+        if found is None:
+            unresolved.append(f"{source}.{table}")
+            continue
+        reason = f"source('{source}', '{table}')"
+        add(PROJECT_ROOT / found.path, "table", reason, distance, RANK_TABLE)
+        domain = CONTEXT_DIR / found.source / "domains" / f"{found.domain}.yaml"
+        if domain.exists():
+            add(domain, "domain", f"domain of {found.name}", distance, RANK_DOMAIN)
+    return sorted(items.values(), key=lambda i: (i.distance, i.rank, i.path)), unresolved
+
+
+def assemble(pack: ContextPack) -> None:
+    """Fill ``pack.text`` with whole items, in order, up to the budget."""
+    sections = []
+    for item in pack.items:
+        path = PROJECT_ROOT / item.path
+        body = domain_relationships(path) if item.kind == "domain" else path.read_text(encoding="utf-8")
+        section = f"# ==> {item.path} <==\n{body.rstrip()}\n"
+        item.tokens = estimate_tokens(section)
+        if pack.tokens + item.tokens <= pack.budget:
+            item.included = True
+            pack.tokens += item.tokens
+            sections.append(section)
+    pack.text = "\n".join(sections)
+
+
+# ── Cache ───────────────────────────────────────────────────────────────────
+
+
+def pack_fingerprint(budget: int) -> str:
+    """Code and settings that shape a pack; a change invalidates every cached one."""
+    h = hashlib.sha256(f"{PACK_VERSION}:{budget}".encode())
+    for name in ("context_pack.py", "model_graph.py", "context_catalog.py"):
+        h.update((Path(__file__).parent / name).read_bytes())
+    return h.hexdigest()
+
+
+def _stamp(path: Path) -> list:
+    """[mtime_ns, size, sha256] for a file; directories are compared by mtime only."""
+    st = path.stat()
+    if path.is_dir():
+        return [st.st_mtime_ns, 0, ""]
+    return [st.st_mtime_ns, st.st_size, hashlib.sha256(path.read_bytes()).hexdigest()]
+
+
+def _unchanged(rel: str, stamp: list) -> bool:
+    path = PROJECT_ROOT / rel
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if st.st_mtime_ns == stamp[0] and (not stamp[2] or st.st_size == stamp[1]):
+        return True
+    if not stamp[2]:
+        return False
+    return hashlib.sha256(path.read_bytes()).hexdigest() == stamp[2]
+
+
+def cache_path(model: str) -> Path:
+    return PACK_DIR / f"{model}.json"
+
+
+def load_cached(model: str, fingerprint: str) -> ContextPack | None:
+    try:
+        data = json.loads(cache_path(model).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+    if not all(_unchanged(rel, stamp) for rel, stamp in data["inputs"].items()):
+        return None
+    pack = data["pack"]
+    pack["items"] = [PackItem(**i) for i in pack["items"]]
+    return ContextPack(**pack)
+
+
+def save_cached(pack: ContextPack, fingerprint: str, inputs: list[Path]) -> None:
+    payload = {
+        "fingerprint": fingerprint,
+        "inputs": {str(p.relative_to(PROJECT_ROOT)): _stamp(p) for p in inputs if p.exists()},
+        "pack": asdict(pack),
+    }
+    PACK_DIR.mkdir(parents=True, exist_ok=True)
+    path = cache_path(pack.model)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ── Build ───────────────────────────────────────────────────────────────────
+
+
+def model_name(arg: str) -> str:
+    """Accept a model name or a path to its .sql file."""
+    return Path(arg).stem if arg.endswith(".sql") else arg
+
+
+def build_pack(model: str, budget: int = DEFAULT_BUDGET, use_cache: bool = True) -> ContextPack:
+    """Build (or fetch from cache) the context pack for ``model``.
+
+    Raises KeyError if the model is not in the project.
+    """
+    fingerprint = pack_fingerprint(budget)
+    if use_cache:
+        cached = load_cached(model, fingerprint)
+        if cached is not None:
+            return cached
+
+    graph = load_graph()
+    names = graph.by_name
+    if model not in names:
+        raise KeyError(model)
+    entry = names[model]
+    sql = (PROJECT_ROOT / entry.path).read_text(encoding="utf-8")
+    distances, upstream = source_distances(graph, model)
+
+    with open_catalog(refresh=True) as catalog:
+        items, unresolved = collect_items(catalog, entry.path, sql, distances)
+
+    pack = ContextPack(model, entry.path, budget, items=items, unresolved=unresolved)
+    assemble(pack)
+
+    # Anything that could change the pack: the upstream models (their ref()s
+    # and source()s decide which files are candidates), every candidate, and
+    # the tables/ directories a new context file for an unresolved source
+    # would land in.
+    inputs = [PROJECT_ROOT / names[n].path for n in sorted(upstream) if n in names]
+    inputs += [PROJECT_ROOT / i.path for i in items]
+    sources = {context_table_name(*node.split(".", 1))[0] for node in distances}
+    inputs += [CONTEXT_DIR / s / "tables" for s in sorted(sources)]
+    try:
+        save_cached(pack, fingerprint, inputs)
+    except OSError as exc:
+        print(f"Warning: could not cache pack: {exc}", file=sys.stderr)
+    return pack
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Assemble a token-budgeted context bundle for one dbt model."
+    )
+    parser.add_argument("model", help="Model name or path to its .sql file")
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_BUDGET,
+        help=f"Hard token budget (estimated; default: {DEFAULT_BUDGET})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "manifest", "json"],
+        default="text",
+        help="text: the bundle itself; manifest: files with token counts; json: full detail",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild even if cached")
+    args = parser.parse_args()
+
+    try:
+        pack = build_pack(model_name(args.model), args.budget, use_cache=not args.no_cache)
+    except KeyError as exc:
+        print(f"Unknown model: {exc.args[0]}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        print(json.dumps(asdict(pack), indent=2))
+        return 0
+    if args.format == "manifest":
+        for item in pack.items:
+            mark = "+" if item.included else "-"
+            print(f"{mark} {item.tokens:>6}  {item.path}  ({item.reason})")
+    else:
+        sys.stdout.write(pack.text)
+
+    for table in pack.unresolved:
+        print(f"No context file for source {table}", file=sys.stderr)
+    print(
+        f"{pack.model}: {len(pack.included)} files, ~{pack.tokens:,}/{pack.budget:,} tokens"
+        + (f", {len(pack.dropped)} dropped for budget" if pack.dropped else ""),
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+masking_plan.py — Apply masking policies only where something changed.
+
+Every model runs `apply_masking_policy_cached('models')` as a post-hook, and
+prod runs it for all sources on-run-start. dbt_snow_mask then lists the
+schema's policies and issues an ALTER ... SET MASKING POLICY per masked
+column, on every run, even when nothing changed.
+
+This script keeps the masking state as of the last prod run in an
+artifact (target/masking_applied.json; keep it next to the prod artifacts
+in CI) and diffs the current manifest against it:
+
+  skip      policies unchanged, and the object survives a run (incremental,
+            snapshot, seed, source): nothing to do
+  reapply   table or view: `create or replace` drops its policies, so the
+            post-hook has to run whatever the state says
+  apply     new or changed policy on an object that survives a run
+  unset     policy removed from the yml on an object that survives a run;
+            dbt_snow_mask never unsets, so this comes from --format sql
+
+Nodes in the skip list are passed to dbt as the `masking_policy_skip` var,
+and apply_masking_policy_cached (macros/) returns before querying anything
+for them. Column policies are read from `meta.masking_policy` or
+`config.meta.masking_policy`.
+
+Usage:
+    # What would change against the recorded state
+    python scripts/masking_plan.py plan
+
+    # Prod run: skip the no-op nodes
+    dbt build --target prod --vars "$(python scripts/masking_plan.py plan --format vars)"
+
+    # The ALTER statements the changes need (including unsets)
+    python scripts/masking_plan.py plan --format sql
+
+    # After a successful prod run (and the plan's unset statements), record
+    # what is now applied
+    python scripts/masking_plan.py record --run-results target/run_results.json
+
+Exit codes:
+    0 — success (plan: nothing to apply or unset)
+    1 — plan: changes pending
+    2 — script error (missing manifest, unreadable state)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DBT_PROJECT = PROJECT_ROOT / "dbt_project.yml"
+MANIFEST_PATH = PROJECT_ROOT / "target" / "manifest.json"
+STATE_PATH = PROJECT_ROOT / "target" / "masking_applied.json"
+
+META_KEY = "masking_policy"
+# Objects a normal (not --full-refresh) run alters in place, keeping policies.
+PERSISTENT = {"incremental", "snapshot", "seed", "source"}
+# dbt_snow_mask's materialization -> Snowflake object type
+OBJECT_TYPES = {"view": "view"}
+
+# Bump when the state layout changes; an old state is treated as empty.
+STATE_VERSION = 1
+
+_VAR_RE = r"^\s*{}:\s*['\"]?([^'\"\n#]+?)['\"]?\s*(?:#.*)?$"
+
+
+# ── Manifest ────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class MaskedNode:
+    unique_id: str
+    relation: str  # DATABASE.SCHEMA.IDENTIFIER
+    materialized: str  # "source" for sources
+    policies: dict[str, str]  # column -> policy name
+
+    @property
+    def fingerprint(self) -> str:
+        payload = json.dumps([self.relation, self.materialized, sorted(self.policies.items())])
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def column_policy(column: dict) -> str | None:
+    meta = column.get("meta") or {}
+    config_meta = (column.get("config") or {}).get("meta") or {}
+    return meta.get(META_KEY) or config_meta.get(META_KEY)
+
+
+def masked_nodes(manifest: dict) -> dict[str, MaskedNode]:
+    """unique_id -> masking metadata for every built node and source."""
+    nodes = {}
+    for uid, node in [*manifest.get("nodes", {}).items(), *manifest.get("sources", {}).items()]:
+        resource = node.get("resource_type")
+        if resource == "source":
+            materialized = "source"
+            identifier = node.get("identifier") or node.get("name")
+        elif resource in ("model", "snapshot", "seed"):
+            materialized = (node.get("config") or {}).get("materialized", "")
+            identifier = node.get("alias") or node.get("name")
+        else:
+            continue
+        if materialized == "ephemeral":
+            continue
+        policies = {
+            name: policy
+            for name, column in (node.get("columns") or {}).items()
+            if (policy := column_policy(column))
+        }
+        if not policies:
+            continue
+        relation = ".".join(str(p) for p in (node.get("database"), node.get("schema"), identifier))
+        nodes[uid] = MaskedNode(uid, relation.upper(), materialized, policies)
+    return nodes
+
+
+# ── State ───────────────────────────────────────────────────────────────────
+
+
+def load_state(path: Path) -> dict[str, MaskedNode]:
+    """The recorded state; {} if there is none yet. ValueError if it is malformed."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object, got {type(data).__name__}")
+    if data.get("version") != STATE_VERSION:
+        return {}
+    nodes = data.get("nodes", {})
+    if not isinstance(nodes, dict) or not all(isinstance(e, dict) for e in nodes.values()):
+        raise ValueError(f"{path}: 'nodes' must map unique_id to a node object")
+    try:
+        return {uid: MaskedNode(**entry) for uid, entry in nodes.items()}
+    except TypeError as exc:
+        raise ValueError(f"{path}: malformed node ({exc})") from exc
+
+
+def save_state(nodes: dict[str, MaskedNode], path: Path) -> None:
+    payload = {"version": STATE_VERSION, "nodes": {uid: asdict(n) for uid, n in sorted(nodes.items())}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ── Plan ────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class NodePlan:
+    unique_id: str
+    action: str  # skip | reapply | apply | unset
+    relation: str
+    materialized: str
+    apply: dict[str, str] = field(default_factory=dict)  # column -> policy
+    unset: list[str] = field(default_factory=list)
+
+
+def plan(
+    current: dict[str, MaskedNode], applied: dict[str, MaskedNode], full_refresh: bool = False
+) -> list[NodePlan]:
+    persistent = PERSISTENT - ({"incremental", "seed"} if full_refresh else set())
+    plans = []
+    for uid in sorted(current.keys() | applied.keys()):
+        now, before = current.get(uid), applied.get(uid)
+        if now is None:
+            # Masking removed from the yml (or the node deleted): an object
+            # that survives the run keeps the old policies until unset.
+            if before.materialized in persistent:
+                plans.append(NodePlan(uid, "unset", before.relation, before.materialized, unset=sorted(before.policies)))
+            continue
+        if now.materialized not in persistent:
+            plans.append(NodePlan(uid, "reapply", now.relation, now.materialized, apply=dict(now.policies)))
+            continue
+        if before is not None and before.fingerprint == now.fingerprint:
+            plans.append(NodePlan(uid, "skip", now.relation, now.materialized))
+            continue
+        # A moved relation (new schema/alias) or a new materialization (a view
+        # turned incremental is created as a fresh table) is a new object:
+        # apply everything.
+        same_object = before is not None and (before.relation, before.materialized) == (now.relation, now.materialized)
+        old = before.policies if same_object else {}
+        plans.append(
+            NodePlan(
+                uid,
+                "apply" if now.policies != old else "skip",
+                now.relation,
+                now.materialized,
+                apply={c: p for c, p in now.policies.items() if old.get(c) != p},
+                unset=sorted(old.keys() - now.policies.keys()),
+            )
+        )
+    return plans
+
+
+def policy_location(project: Path = DBT_PROJECT) -> str | None:
+    """DB.SCHEMA of the shared policies, or None when each schema has its own."""
+    text = project.read_text(encoding="utf-8")
+
+    def var(name: str) -> str:
+        m = re.search(_VAR_RE.format(name), text, re.MULTILINE)
+        return m.group(1).strip() if m else ""
+
+    if var("use_common_masking_policy_db").upper() not in ("TRUE", "YES"):
+        return None
+    return f"{var('common_masking_policy_db')}.{var('common_masking_policy_schema')}"
+
+
+def render_sql(plans: list[NodePlan], location: str | None, force: bool = True) -> str:
+    lines = []
+    for p in plans:
+        if p.action not in ("apply", "unset"):
+            continue
+        kind = "table" if p.materialized == "source" else OBJECT_TYPES.get(p.materialized, "table")
+        schema = location or p.relation.rsplit(".", 1)[0]
+        for column, policy in sorted(p.apply.items()):
+            lines.append(
+                f"alter {kind} {p.relation} modify column {column} "
+                f"set masking policy {schema}.{policy}{' force' if force else ''};"
+            )
+        for column in p.unset:
+            lines.append(f"alter {kind} {p.relation} modify column {column} unset masking policy;")
+    return "\n".join(lines)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def _read_manifest(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Diff column masking metadata against the last applied state."
+    )
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH, help="manifest.json (default: target/)")
+    parser.add_argument(
+        "--state", type=Path, default=STATE_PATH, help="Applied-state artifact (default: target/masking_applied.json)"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan_p = sub.add_parser("plan", help="Show what the next run has to apply")
+    plan_p.add_argument("--format", choices=["text", "json", "vars", "sql"], default="text")
+    plan_p.add_argument(
+        "--full-refresh", action="store_true", help="The run rebuilds incrementals and seeds too"
+    )
+
+    record_p = sub.add_parser("record", help="Record the manifest's policies as applied")
+    record_p.add_argument(
+        "--run-results",
+        type=Path,
+        help="Only record nodes that succeeded in this run (others keep their previous state)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        current = masked_nodes(_read_manifest(args.manifest))
+        applied = load_state(args.state)
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.command == "record":
+        recorded = dict(current)
+        if args.run_results:
+            try:
+                results = json.loads(args.run_results.read_text(encoding="utf-8"))["results"]
+            except (OSError, ValueError, KeyError) as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 2
+            ok = {r["unique_id"] for r in results if r.get("status") == "success"}
+            for uid, node in current.items():
+                # Sources are masked on-run-start, before any node runs.
+                if node.materialized == "source" or uid in ok:
+                    continue
+                if uid in applied:
+                    recorded[uid] = applied[uid]  # didn't run: still as before
+                else:
+                    del recorded[uid]
+        save_state(recorded, args.state)
+        print(f"Recorded {len(recorded)} masked nodes in {args.state}", file=sys.stderr)
+        return 0
+
+    plans = plan(current, applied, args.full_refresh)
+    counts = {a: sum(1 for p in plans if p.action == a) for a in ("skip", "reapply", "apply", "unset")}
+    skip = [p.unique_id for p in plans if p.action == "skip"]
+
+    if args.format == "vars":
+        print(json.dumps({"masking_policy_skip": skip}))
+    elif args.format == "json":
+        print(json.dumps({"counts": counts, "nodes": [asdict(p) for p in plans]}, indent=2))
+    elif args.format == "sql":
+        try:
+            location = policy_location()
+        except OSError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+        sql = render_sql(plans, location)
+        if sql:
+            print(sql)
+    else:
+        for p in plans:
+            if p.action == "skip":
+                continue
+            detail = ", ".join(
+                [f"{c}={pol}" for c, pol in sorted(p.apply.items())] + [f"-{c}" for c in p.unset]
+            )
+            print(f"{p.action:<8} {p.unique_id}  {detail}")
+
+    print(
+        f"\n{len(plans)} masked nodes: {counts['skip']} skip, {counts['reapply']} reapply (rebuilt), "
+        f"{counts['apply']} apply, {counts['unset']} unset"
+        + ("" if applied else f" (no state at {args.state})"),
+        file=sys.stderr,
+    )
+    return 1 if counts["apply"] or counts["unset"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+model_graph.py — Manifest-free dependency graph for dbt models.
+
+Scans every model for ref() / source() calls and keeps a persisted DAG index
+in target/model_graph_index.json, so "what changed, and what sits downstream
+of it" can be answered in milliseconds without `dbt parse`. The index is
+refreshed incrementally: files whose (mtime, size) are unchanged are not
+re-read, and files whose content hash is unchanged are not re-parsed.
+
+Selectors are model names (file stems), or `source:<source>.<table>` to pick
+every model that reads a source table.
+
+Usage:
+    # Changed models (git diff vs origin/main) plus everything downstream
+    python scripts/model_graph.py --changed
+
+    # Everything downstream of a model, as a dbt --select string
+    python scripts/model_graph.py stg_prodview__tanks --downstream --format select
+
+    # Models reading a source table, and what feeds a mart
+    python scripts/model_graph.py source:prodview.pvt_pvunittank --downstream
+    python scripts/model_graph.py well_360 --upstream
+
+    # Rebuild the index from scratch
+    python scripts/model_graph.py --rebuild --stats
+
+Exit codes:
+    0 — success
+    2 — script error (unknown model, bad arguments)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from validate_staging import JINJA_EXPR, JINJA_STMT, tokenize
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODEL_DIRS = ["models", "snapshots"]
+INDEX_PATH = PROJECT_ROOT / "target" / "model_graph_index.json"
+
+# Bump when the index layout changes. Extraction changes (here or in the
+# shared lexer) are caught by extractor_fingerprint().
+INDEX_VERSION = 1
+
+_QUOTED = r"""['"]([^'"]+)['"]"""
+REF_RE = re.compile(
+    rf"\bref\(\s*{_QUOTED}\s*(?:,\s*{_QUOTED}\s*)?(?:,\s*v(?:ersion)?\s*=\s*[^)]*)?\)"
+)
+SOURCE_RE = re.compile(rf"\bsource\(\s*{_QUOTED}\s*,\s*{_QUOTED}\s*\)")
+
+
+@dataclass
+class ModelEntry:
+    """Dependencies extracted from one model file."""
+
+    name: str
+    path: str
+    sha256: str
+    mtime_ns: int
+    size: int
+    refs: list[str] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)  # "source.table"
+
+
+def extract_dependencies(sql: str) -> tuple[list[str], list[str]]:
+    """Return (refs, sources) called from Jinja in ``sql``.
+
+    Only {{ }} / {% %} blocks are searched: Jinja comments never render, but
+    Jinja inside SQL comments still does, matching what dbt sees.
+    """
+    refs: set[str] = set()
+    sources: set[str] = set()
+    for tok in tokenize(sql):
+        if tok.kind not in (JINJA_EXPR, JINJA_STMT):
+            continue
+        for m in REF_RE.finditer(tok.text):
+            # ref('package', 'model') names the model second
+            refs.add(m.group(2) or m.group(1))
+        for m in SOURCE_RE.finditer(tok.text):
+            sources.add(f"{m.group(1)}.{m.group(2)}".lower())
+    return sorted(refs), sorted(sources)
+
+
+def extractor_fingerprint() -> str:
+    """Hash of the code that turns SQL into edges; a change forces a rescan."""
+    h = hashlib.sha256(str(INDEX_VERSION).encode())
+    h.update(Path(__file__).read_bytes())
+    h.update((Path(__file__).parent / "validate_staging.py").read_bytes())
+    return h.hexdigest()
+
+
+def find_model_files() -> list[Path]:
+    files = []
+    for d in MODEL_DIRS:
+        root = PROJECT_ROOT / d
+        if root.is_dir():
+            files.extend(root.rglob("*.sql"))
+    return sorted(files)
+
+
+class ModelGraph:
+    """Persisted ref()/source() index with downstream/upstream queries."""
+
+    def __init__(self, index_path: Path = INDEX_PATH):
+        self.index_path = index_path
+        self.fingerprint = extractor_fingerprint()
+        self.entries: dict[str, ModelEntry] = {}  # keyed by relative path
+        self.reparsed = 0
+        self._children: dict[str, set[str]] | None = None
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        self.entries = {
+            path: ModelEntry(**entry) for path, entry in data.get("models", {}).items()
+        }
+
+    def save(self) -> None:
+        payload = {
+            "fingerprint": self.fingerprint,
+            "models": {path: asdict(e) for path, e in sorted(self.entries.items())},
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the tree. Returns True if changed."""
+        changed = False
+        seen = set()
+        for filepath in find_model_files():
+            rel = str(filepath.relative_to(PROJECT_ROOT))
+            seen.add(rel)
+            st = filepath.stat()
+            entry = self.entries.get(rel)
+            if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                continue
+
+            content = filepath.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry and entry.sha256 == digest:
+                # Touched but not edited: just record the new stat.
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                changed = True
+                continue
+
+            refs, sources = extract_dependencies(content.decode("utf-8"))
+            self.entries[rel] = ModelEntry(
+                name=filepath.stem,
+                path=rel,
+                sha256=digest,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                refs=refs,
+                sources=sources,
+            )
+            self.reparsed += 1
+            changed = True
+
+        for rel in set(self.entries) - seen:
+            del self.entries[rel]
+            changed = True
+
+        if changed:
+            self._children = None
+        return changed
+
+    # ── Queries ──────────────────────────────────────────────────────────
+
+    @property
+    def by_name(self) -> dict[str, ModelEntry]:
+        return {e.name: e for e in self.entries.values()}
+
+    @property
+    def children(self) -> dict[str, set[str]]:
+        """Reverse edges: node -> models that ref() it (sources as 'source:x.y')."""
+        if self._children is None:
+            children: dict[str, set[str]] = {}
+            for e in self.entries.values():
+                for parent in e.refs:
+                    children.setdefault(parent, set()).add(e.name)
+                for src in e.sources:
+                    children.setdefault(f"source:{src}", set()).add(e.name)
+            self._children = children
+        return self._children
+
+    def resolve(self, selectors: list[str]) -> set[str]:
+        """Turn selectors into node ids; raises KeyError on unknown names."""
+        names = self.by_name
+        nodes = set()
+        for sel in selectors:
+            if sel.startswith("source:"):
+                node = "source:" + sel[len("source:"):].lower()
+                if node not in self.children:
+                    raise KeyError(sel)
+                nodes.add(node)
+            elif sel in names:
+                nodes.add(sel)
+            else:
+                raise KeyError(sel)
+        return nodes
+
+    def downstream(self, nodes: set[str]) -> set[str]:
+        """Models reachable from ``nodes`` via ref()/source() edges."""
+        seen: set[str] = set()
+        queue = deque(nodes)
+        while queue:
+            for child in self.children.get(queue.popleft(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        return seen
+
+    def upstream(self, nodes: set[str]) -> set[str]:
+        """Models (and source:x.y nodes) that ``nodes`` depend on."""
+        names = self.by_name
+        seen: set[str] = set()
+        queue = deque(n for n in nodes if n in names)
+        while queue:
+            entry = names.get(queue.popleft())
+            if entry is None:
+                continue
+            for parent in [*entry.refs, *(f"source:{s}" for s in entry.sources)]:
+                if parent not in seen:
+                    seen.add(parent)
+                    queue.append(parent)
+        return seen
+
+    def topological(self, nodes: set[str]) -> list[str]:
+        """Order model names so parents come before children (ties by name)."""
+        names = self.by_name
+        models = sorted(n for n in nodes if n in names)
+        indegree = {
+            n: sum(1 for p in names[n].refs if p in nodes) for n in models
+        }
+        ready = deque(n for n in models if indegree[n] == 0)
+        order = []
+        while ready:
+            n = ready.popleft()
+            order.append(n)
+            for child in sorted(self.children.get(n, ())):
+                if child in indegree:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        ready.append(child)
+        # Cycles shouldn't exist in dbt, but never drop nodes if they do.
+        order.extend(n for n in models if n not in set(order))
+        return order
+
+
+def changed_model_names(base: str = "origin/main") -> list[str]:
+    """Model names touched vs ``base`` (falls back to HEAD), including deletions."""
+    for ref in (base, "HEAD"):
+        result = subprocess.run(
+            ["git", "diff", "--name-only", ref, "--", *MODEL_DIRS],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+        )
+        if result.returncode == 0:
+            return sorted(
+                {Path(f).stem for f in result.stdout.split() if f.endswith(".sql")}
+            )
+    return []
+
+
+def load_graph(rebuild: bool = False) -> ModelGraph:
+    """Load the persisted index, refresh it, and save if anything changed."""
+    graph = ModelGraph()
+    if not rebuild:
+        graph.load()
+    if graph.refresh():
+        try:
+            graph.save()
+        except OSError as exc:
+            print(f"Warning: could not write {graph.index_path}: {exc}", file=sys.stderr)
+    return graph
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Query a persisted ref()/source() dependency index without dbt parse."
+    )
+    parser.add_argument(
+        "selectors",
+        nargs="*",
+        help="Model names or source:<source>.<table>",
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Add models changed vs origin/main to the selection",
+    )
+    direction = parser.add_mutually_exclusive_group()
+    direction.add_argument(
+        "--downstream",
+        action="store_true",
+        help="Include everything downstream (default with --changed)",
+    )
+    direction.add_argument(
+        "--upstream",
+        action="store_true",
+        help="Include everything upstream instead",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["names", "paths", "select", "json"],
+        default="names",
+        help="names: one per line (topological); paths: file paths; "
+        "select: one line for dbt --select; json: full detail",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the persisted index and rescan every file",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print index statistics to stderr",
+    )
+    args = parser.parse_args()
+
+    graph = load_graph(rebuild=args.rebuild)
+    if args.stats:
+        edges = sum(len(e.refs) + len(e.sources) for e in graph.entries.values())
+        print(
+            f"Index: {len(graph.entries)} models, {edges} edges, "
+            f"{graph.reparsed} re-parsed ({graph.index_path.relative_to(PROJECT_ROOT)})",
+            file=sys.stderr,
+        )
+
+    selectors = list(args.selectors)
+    if args.changed:
+        # Deleted models are gone from the index; anything that still ref()s
+        # them was edited too and shows up as changed on its own.
+        known = graph.by_name
+        selectors += [n for n in changed_model_names() if n in known]
+    if not selectors:
+        if args.changed or args.stats:
+            return 0
+        parser.error("no selectors given (pass model names, source:x.y, or --changed)")
+
+    try:
+        seeds = graph.resolve(selectors)
+    except KeyError as exc:
+        print(f"Unknown model or source: {exc.args[0]}", file=sys.stderr)
+        return 2
+
+    if args.upstream:
+        selected = seeds | graph.upstream(seeds)
+    elif args.downstream or args.changed:
+        selected = seeds | graph.downstream(seeds)
+    else:
+        selected = seeds
+
+    ordered = graph.topological(selected)
+    names = graph.by_name
+    if args.format == "names":
+        print("\n".join(ordered))
+    elif args.format == "paths":
+        print("\n".join(names[n].path for n in ordered))
+    elif args.format == "select":
+        print(" ".join(ordered))
+    else:
+        print(
+            json.dumps(
+                {
+                    "selected": ordered,
+                    "sources": sorted(n for n in selected if n.startswith("source:")),
+                    "models": {
+                        n: {"path": names[n].path, "refs": names[n].refs, "sources": names[n].sources}
+                        for n in ordered
+                    },
+                },
+                indent=2,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
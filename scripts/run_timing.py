@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+run_timing.py — Where the time goes in a dbt build, from its artifacts.
+
+Reads run_results.json and manifest.json from one or more runs (a local
+target/, the `target` / `prod-artifacts` artifacts the validate-dbt-changes
+workflow uploads, ...) and reports, without a warehouse connection:
+
+  - per-node execution time (median across runs), rows and bytes where the
+    adapter reports them, and share of the serial total
+  - the critical path: the longest chain of dependent nodes, i.e. the wall
+    time no thread count can beat
+  - slack: how much longer a node could take before it lands on that path
+  - the simulated wall time and speedup at each thread count
+  - what-if: wall time saved at the run's thread count if each of the
+    slowest critical-path nodes took no time at all — the upper bound on
+    making it incremental or moving it to a bigger warehouse
+
+Edges come from the manifest's depends_on, bridged through nodes that did
+not run (ephemeral models, unselected parents). In a `dbt build`, a
+single-parent test also gates that parent's children, as dbt schedules it.
+The simulation is a list scheduler that always starts the ready node with
+the longest remaining chain; dbt's own queue is close to this but not
+identical, so treat the speedup figures as estimates.
+
+Usage:
+    # Latest local run
+    python scripts/run_timing.py target/
+
+    # Several runs (medians per node), e.g. downloaded CI artifacts
+    python scripts/run_timing.py runs/2026-10-01/ runs/2026-10-08/ runs/2026-10-15/
+
+    # run_results.json from one place, manifest from another
+    python scripts/run_timing.py ci/run_results.json --manifest prod-artifacts/manifest.json
+
+    # Models only, top 40, custom thread counts, machine-readable
+    python scripts/run_timing.py target/ --resource-type model --top 40 --threads 4 8 12 --format json
+
+Exit codes:
+    0 — success
+    2 — script error (missing or unreadable artifacts)
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import statistics
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+RUN_RESULTS = "run_results.json"
+MANIFEST = "manifest.json"
+
+DEFAULT_THREADS = (1, 2, 4, 8, 16, 32)
+# Byte counters some adapters put in adapter_response (Snowflake reports none).
+BYTES_KEYS = ("bytes_processed", "bytes_billed", "bytes_written")
+# Slower than this and on the critical path: worth a materialization/size look.
+HINT_MIN_SECONDS = 30.0
+WHAT_IF_NODES = 10
+
+
+# ── Artifacts ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class RunInfo:
+    path: str
+    invocation_id: str
+    generated_at: str
+    command: str
+    threads: int | None
+    elapsed: float | None  # observed wall time, seconds
+
+
+@dataclass
+class NodeResult:
+    unique_id: str
+    status: str
+    execution_time: float
+    rows: int | None
+    bytes: int | None
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ArtifactError(f"{path}: not found")
+    except (OSError, ValueError) as exc:
+        raise ArtifactError(f"{path}: {exc}")
+
+
+def artifact_paths(arg: Path) -> tuple[Path, Path]:
+    """(run_results.json, manifest.json) for a directory or a run_results path."""
+    if arg.is_dir():
+        return arg / RUN_RESULTS, arg / MANIFEST
+    return arg, arg.with_name(MANIFEST)
+
+
+def load_run_results(path: Path) -> tuple[RunInfo, list[NodeResult]]:
+    data = _read_json(path)
+    meta = data.get("metadata", {})
+    args = data.get("args", {})
+    info = RunInfo(
+        path=str(path),
+        invocation_id=meta.get("invocation_id", ""),
+        generated_at=meta.get("generated_at", ""),
+        command=args.get("which", ""),
+        threads=args.get("threads"),
+        elapsed=data.get("elapsed_time"),
+    )
+    results = []
+    for r in data.get("results", []):
+        response = r.get("adapter_response") or {}
+        rows = response.get("rows_affected")
+        nbytes = next((response[k] for k in BYTES_KEYS if response.get(k) is not None), None)
+        results.append(
+            NodeResult(
+                unique_id=r["unique_id"],
+                status=r.get("status", ""),
+                execution_time=float(r.get("execution_time") or 0.0),
+                rows=rows if isinstance(rows, int) and rows >= 0 else None,
+                bytes=nbytes,
+            )
+        )
+    return info, results
+
+
+@dataclass
+class ManifestNode:
+    unique_id: str
+    name: str
+    resource_type: str
+    materialized: str
+    depends_on: list[str]
+    path: str
+    warehouse: str  # rendered snowflake_warehouse config, "" for the target's default
+
+
+def load_manifest(path: Path) -> dict[str, ManifestNode]:
+    """unique_id -> node, for every executable node in the manifest."""
+    data = _read_json(path)
+    nodes = {}
+    for uid, node in data.get("nodes", {}).items():
+        nodes[uid] = ManifestNode(
+            unique_id=uid,
+            name=node.get("name", uid.rsplit(".", 1)[-1]),
+            resource_type=node.get("resource_type", uid.split(".", 1)[0]),
+            materialized=(node.get("config") or {}).get("materialized", ""),
+            depends_on=(node.get("depends_on") or {}).get("nodes", []),
+            path=node.get("original_file_path", ""),
+            warehouse=(node.get("config") or {}).get("snowflake_warehouse") or "",
+        )
+    return nodes
+
+
+# ── Aggregation ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class NodeTiming:
+    unique_id: str
+    name: str
+    resource_type: str
+    materialized: str
+    path: str
+    seconds: float  # median over runs
+    max_seconds: float
+    runs: int
+    rows: int | None
+    bytes: int | None
+    statuses: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Profile:
+    """Everything loaded from a set of runs, keyed by unique_id."""
+
+    runs: list[RunInfo]
+    nodes: dict[str, NodeTiming]
+    manifest: dict[str, ManifestNode]
+
+    @property
+    def is_build(self) -> bool:
+        return any(r.command == "build" for r in self.runs)
+
+    @property
+    def threads(self) -> int | None:
+        counts = [r.threads for r in self.runs if r.threads]
+        return max(counts) if counts else None
+
+
+def load_runs(
+    paths: list[Path], manifest_path: Path | None = None
+) -> Iterator[tuple[RunInfo, list[NodeResult], dict[str, ManifestNode]]]:
+    """Yield (run, results, manifest) per artifact path; --manifest is read once."""
+    shared = load_manifest(manifest_path) if manifest_path is not None else None
+    for arg in paths:
+        results_path, default_manifest = artifact_paths(arg)
+        info, results = load_run_results(results_path)
+        yield info, results, shared if shared is not None else load_manifest(default_manifest)
+
+
+def load_profile(paths: list[Path], manifest_path: Path | None = None) -> Profile:
+    return merge_runs(load_runs(paths, manifest_path))
+
+
+def merge_runs(loaded) -> Profile:
+    """Merge loaded runs into median timings per node.
+
+    Manifests are merged too (later runs win), so a node added between runs
+    still gets its edges.
+    """
+    runs = []
+    samples: dict[str, list[NodeResult]] = defaultdict(list)
+    manifest: dict[str, ManifestNode] = {}
+    for info, results, run_manifest in loaded:
+        runs.append(info)
+        for r in results:
+            samples[r.unique_id].append(r)
+        manifest.update(run_manifest)
+
+    nodes = {}
+    for uid, rs in samples.items():
+        ran = [r for r in rs if r.status != "skipped"] or rs
+        mnode = manifest.get(uid)
+        rows = [r.rows for r in ran if r.rows is not None]
+        nbytes = [r.bytes for r in ran if r.bytes is not None]
+        nodes[uid] = NodeTiming(
+            unique_id=uid,
+            name=mnode.name if mnode else uid.rsplit(".", 1)[-1],
+            resource_type=mnode.resource_type if mnode else uid.split(".", 1)[0],
+            materialized=mnode.materialized if mnode else "",
+            path=mnode.path if mnode else "",
+            seconds=statistics.median(r.execution_time for r in ran),
+            max_seconds=max(r.execution_time for r in ran),
+            runs=len(ran),
+            rows=int(statistics.median(rows)) if rows else None,
+            bytes=int(statistics.median(nbytes)) if nbytes else None,
+            statuses=sorted({r.status for r in rs}),
+        )
+    return Profile(runs, nodes, manifest)
+
+
+# ── DAG ─────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Dag:
+    weights: dict[str, float]
+    parents: dict[str, set[str]]
+    children: dict[str, set[str]]
+
+    def topological(self) -> list[str]:
+        indegree = {n: len(self.parents[n]) for n in self.weights}
+        ready = sorted(n for n, d in indegree.items() if d == 0)
+        order = []
+        while ready:
+            n = ready.pop()
+            order.append(n)
+            for c in self.children[n]:
+                indegree[c] -= 1
+                if indegree[c] == 0:
+                    ready.append(c)
+        if len(order) != len(self.weights):
+            raise ArtifactError("dependency cycle in manifest")
+        return order
+
+
+def build_dag(profile: Profile) -> Dag:
+    """DAG over the nodes that ran, weighted by median execution time."""
+    executed = set(profile.nodes)
+    manifest = profile.manifest
+    bridged: dict[str, set[str]] = {}
+
+    def executed_parents(uid: str) -> set[str]:
+        # Parents that ran; walks through ephemeral / unselected nodes.
+        if uid in bridged:
+            return bridged[uid]
+        bridged[uid] = set()  # guards against cycles in a corrupt manifest
+        found = set()
+        node = manifest.get(uid)
+        for p in node.depends_on if node else ():
+            if p in executed:
+                found.add(p)
+            elif p in manifest:
+                found |= executed_parents(p)
+        bridged[uid] = found
+        return found
+
+    parents = {uid: set(executed_parents(uid)) for uid in executed}
+    children: dict[str, set[str]] = {uid: set() for uid in executed}
+    for uid, ps in parents.items():
+        for p in ps:
+            children[p].add(uid)
+
+    if profile.is_build:
+        # dbt build runs a node only after its parents' tests pass. Tests on
+        # several nodes (relationships) are skipped here: gating with them
+        # can form cycles, and dbt special-cases them the same way.
+        for uid in executed:
+            if not uid.startswith("test.") or len(parents[uid]) != 1:
+                continue
+            (tested,) = parents[uid]
+            for child in list(children[tested]):
+                if child != uid and not child.startswith("test."):
+                    parents[child].add(uid)
+                    children[uid].add(child)
+
+    weights = {uid: t.seconds for uid, t in profile.nodes.items()}
+    return Dag(weights, parents, children)
+
+
+@dataclass
+class PathAnalysis:
+    length: float  # critical path, seconds
+    path: list[str]
+    head: dict[str, float]  # longest chain ending at node (inclusive)
+    tail: dict[str, float]  # longest chain starting at node (inclusive)
+
+    def slack(self, uid: str, weight: float) -> float:
+        # Clamp float noise so critical nodes report exactly 0.
+        slack = self.length - (self.head[uid] + self.tail[uid] - weight)
+        return slack if slack > 1e-9 * max(self.length, 1.0) else 0.0
+
+
+def critical_path(dag: Dag) -> PathAnalysis:
+    order = dag.topological()
+    head: dict[str, float] = {}
+    best_parent: dict[str, str | None] = {}
+    for n in order:
+        parent = max(sorted(dag.parents[n]), key=lambda p: head[p], default=None)
+        head[n] = dag.weights[n] + (head[parent] if parent else 0.0)
+        best_parent[n] = parent
+    tail: dict[str, float] = {}
+    for n in reversed(order):
+        tail[n] = dag.weights[n] + max((tail[c] for c in dag.children[n]), default=0.0)
+
+    if not order:
+        return PathAnalysis(0.0, [], head, tail)
+    end = max(order, key=lambda n: head[n])
+    path = []
+    node: str | None = end
+    while node is not None:
+        path.append(node)
+        node = best_parent[node]
+    return PathAnalysis(head[end], path[::-1], head, tail)
+
+
+def simulate(dag: Dag, threads: int, tail: dict[str, float], weights: dict[str, float] | None = None) -> float:
+    """Wall time of a list schedule on ``threads`` workers.
+
+    Ready nodes start in order of longest remaining chain (``tail``), the
+    usual critical-path heuristic.
+    """
+    weights = weights or dag.weights
+    indegree = {n: len(dag.parents[n]) for n in dag.weights}
+    ready = [(-tail[n], n) for n, d in indegree.items() if d == 0]
+    heapq.heapify(ready)
+    running: list[tuple[float, str]] = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < threads:
+            _, n = heapq.heappop(ready)
+            heapq.heappush(running, (now + weights[n], n))
+        now, n = heapq.heappop(running)
+        for c in dag.children[n]:
+            indegree[c] -= 1
+            if indegree[c] == 0:
+                heapq.heappush(ready, (-tail[c], c))
+    return now
+
+
+# ── Report ──────────────────────────────────────────────────────────────────
+
+
+def hint(t: NodeTiming, slack: float) -> str:
+    """Where a change would pay off for a critical-path node."""
+    if slack or t.seconds < HINT_MIN_SECONDS or t.resource_type != "model":
+        return ""
+    if t.materialized == "table":
+        return "incremental?"
+    if t.materialized == "incremental":
+        return "resize?"
+    if t.materialized == "view":
+        return "slow view"
+    return "critical"
+
+
+def analyse(profile: Profile, thread_counts: list[int], resource_type: str | None, top: int) -> dict:
+    dag = build_dag(profile)
+    cp = critical_path(dag)
+    serial = sum(dag.weights.values())
+
+    speedup = []
+    for k in sorted(set(thread_counts)):
+        wall = simulate(dag, k, cp.tail)
+        speedup.append(
+            {"threads": k, "wall_seconds": round(wall, 2), "speedup": round(serial / wall, 2) if wall else None}
+        )
+
+    ranked = sorted(
+        (t for t in profile.nodes.values() if resource_type in (None, t.resource_type)),
+        key=lambda t: t.seconds,
+        reverse=True,
+    )
+    rows = []
+    for t in ranked[:top]:
+        slack = cp.slack(t.unique_id, t.seconds)
+        row = asdict(t)
+        row.update(
+            share=round(100 * t.seconds / serial, 2) if serial else 0.0,
+            slack=round(slack, 2),
+            critical=slack == 0.0,
+            hint=hint(t, slack),
+        )
+        rows.append(row)
+
+    run_threads = profile.threads or 4
+    base = simulate(dag, run_threads, cp.tail)
+    what_if = []
+    candidates = sorted(
+        (n for n in cp.path if not n.startswith("test.")), key=lambda n: dag.weights[n], reverse=True
+    )
+    for uid in candidates[:WHAT_IF_NODES]:
+        weights = dict(dag.weights)
+        weights[uid] = 0.0
+        wall = simulate(dag, run_threads, cp.tail, weights)
+        what_if.append(
+            {
+                "unique_id": uid,
+                "name": profile.nodes[uid].name,
+                "seconds": round(dag.weights[uid], 2),
+                "wall_saved": round(base - wall, 2),
+            }
+        )
+
+    return {
+        "runs": [asdict(r) for r in profile.runs],
+        "nodes": len(dag.weights),
+        "serial_seconds": round(serial, 2),
+        "critical_path": {
+            "seconds": round(cp.length, 2),
+            "nodes": [{"name": profile.nodes[n].name, "unique_id": n, "seconds": round(dag.weights[n], 2)} for n in cp.path],
+        },
+        "max_speedup": round(serial / cp.length, 2) if cp.length else None,
+        "speedup": speedup,
+        "what_if": {"threads": run_threads, "wall_seconds": round(base, 2), "nodes": what_if},
+        "ranked": rows,
+    }
+
+
+def _fmt_count(n: int | None) -> str:
+    if n is None:
+        return "-"
+    for unit in ("", "K", "M", "G", "T"):
+        if abs(n) < 1000:
+            return f"{n:.0f}{unit}" if unit == "" else f"{n:.1f}{unit}"
+        n /= 1000
+    return f"{n:.1f}P"
+
+
+def print_report(report: dict) -> None:
+    for run in report["runs"]:
+        elapsed = f"{run['elapsed']:.0f}s" if run["elapsed"] is not None else "?"
+        print(
+            f"run {run['invocation_id'][:8] or '?'}  {run['generated_at'][:19]}  "
+            f"dbt {run['command'] or '?'}  threads={run['threads'] or '?'}  wall={elapsed}"
+        )
+    print(
+        f"\n{report['nodes']} nodes, {report['serial_seconds']:.0f}s serial, "
+        f"critical path {report['critical_path']['seconds']:.0f}s "
+        f"(max speedup {report['max_speedup'] or '-'}x)\n"
+    )
+
+    print(f"{'#':>3}  {'node':<48} {'mat':<12} {'median':>8} {'max':>8} {'share':>6} "
+          f"{'slack':>8} {'rows':>7} {'bytes':>7}  hint")
+    for i, r in enumerate(report["ranked"], start=1):
+        mark = "*" if r["critical"] else " "
+        print(
+            f"{i:>3}{mark} {r['name'][:48]:<48} {r['materialized'] or r['resource_type']:<12} "
+            f"{r['seconds']:>7.1f}s {r['max_seconds']:>7.1f}s {r['share']:>5.1f}% "
+            f"{r['slack']:>7.0f}s {_fmt_count(r['rows']):>7} {_fmt_count(r['bytes']):>7}  {r['hint']}"
+        )
+
+    print("\ncritical path:")
+    for n in report["critical_path"]["nodes"]:
+        print(f"  {n['seconds']:>8.1f}s  {n['name']}")
+
+    print("\nthreads  wall      speedup")
+    for s in report["speedup"]:
+        print(f"{s['threads']:>7}  {s['wall_seconds']:>7.0f}s  {s['speedup'] or '-':>6}x")
+
+    what_if = report["what_if"]
+    if what_if["nodes"]:
+        print(f"\nif the node took no time ({what_if['threads']} threads, {what_if['wall_seconds']:.0f}s wall):")
+        for n in what_if["nodes"]:
+            print(f"  {-n['wall_saved']:>8.1f}s  {n['name']} ({n['seconds']:.1f}s)")
+
+
+def thread_count(value: str) -> int:
+    """argparse type for ``--threads``: the scheduler needs at least one worker."""
+    threads = int(value)
+    if threads < 1:
+        raise argparse.ArgumentTypeError(f"thread count must be at least 1, got {threads}")
+    return threads
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Rank dbt nodes by run time and find the critical path, from run artifacts."
+    )
+    parser.add_argument(
+        "artifacts",
+        nargs="+",
+        type=Path,
+        help="Artifact directories (containing run_results.json + manifest.json) or run_results.json files",
+    )
+    parser.add_argument("--manifest", type=Path, help="manifest.json to use for every run")
+    parser.add_argument(
+        "--resource-type",
+        choices=["model", "test", "seed", "snapshot"],
+        help="Only rank this resource type (the DAG always uses every node)",
+    )
+    parser.add_argument("--top", type=int, default=25, help="Rows in the ranked table (default: 25)")
+    parser.add_argument(
+        "--threads",
+        type=thread_count,
+        nargs="+",
+        help=f"Thread counts to simulate (default: {' '.join(map(str, DEFAULT_THREADS))} plus the run's own)",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    try:
+        profile = load_profile(args.artifacts, args.manifest)
+        thread_counts = args.threads or [*DEFAULT_THREADS, *([profile.threads] if profile.threads else [])]
+        report = analyse(profile, thread_counts, args.resource_type, args.top)
+    except ArtifactError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
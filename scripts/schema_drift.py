@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+schema_drift.py — Compare the context catalog with a warehouse column export.
+
+The context files describe source columns, and they go stale as the Fivetran
+and Estuary schemas change. Usually we find out when a staging view fails
+(docs/solutions/build-errors/prodview-source-table-missing-validate-before-build.md).
+This script diffs an offline export of information_schema.columns against
+the compiled context catalog (scripts/context_catalog.py), so no Snowflake
+connection is needed:
+
+    select table_catalog, table_schema, table_name, column_name,
+           data_type, numeric_scale
+    from <database>.information_schema.columns
+    where table_schema in ('FORMENTERAOPS_PV30_DBO', 'FORMENTERAOPS_WV120_CALC', ...)
+
+Save the result as CSV, or as Parquet (which needs pyarrow). Column headers
+are case-insensitive. table_catalog and numeric_scale are optional.
+
+Warehouse schemas map to context sources through the dbt source definitions
+(models/**/*.yml `sources:` blocks, plus the same source-name and table-prefix
+mapping as validate_staging.py's CONTEXT_COLUMNS). Each table side is reduced
+to a hash of its sorted (column, type family) pairs, so the ~700 matched
+tables are compared in one pass and only the ones whose hashes differ are
+diffed column by column. The report, per source:
+
+  + added     in the warehouse, not in the context file (columns covered by
+              the domain's OMITTED list or loader columns like _fivetran_*
+              are ignored)
+  - dropped   in the context file, not in the warehouse
+  ~ changed   type family differs (a `dbl` column now TEXT, ...)
+  missing     documented table that the export has no trace of, although
+              its schema is in the export
+
+Usage:
+    # Full report; exit 1 on any drift
+    python scripts/schema_drift.py exports/columns.csv
+
+    # One source, machine-readable
+    python scripts/schema_drift.py exports/columns.parquet --source prodview --format json
+
+    # Also list warehouse tables that have no context file
+    python scripts/schema_drift.py exports/columns.csv --verbose
+
+Exit codes:
+    0 — no drift
+    1 — drift found
+    2 — script error (unreadable export, missing columns, no pyarrow for Parquet)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Iterator
+
+from column_types import parse_type
+from context_catalog import open_catalog
+from validate_staging import CONTEXT_SOURCE_MAP, CONTEXT_SYSTEM_COLUMNS, CONTEXT_TABLE_PREFIXES
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = PROJECT_ROOT / "models"
+
+REQUIRED_FIELDS = ("table_schema", "table_name", "column_name", "data_type")
+
+# Context base type -> the warehouse type family it is loaded as. Used for
+# the per-table hash, so an unchanged table hashes the same on both sides.
+CONTEXT_FAMILY = {
+    "string": "string",
+    "text": "string",
+    "double": "float",
+    "float": "float",
+    "number": "number",
+    "integer": "number",
+    "boolean": "boolean",
+    "datetime": "timestamp",
+    "timestamp": "timestamp",
+    "date": "date",
+    "variant": "variant",
+}
+
+# Warehouse families a context base type may legitimately land in. A double
+# synced as NUMBER(38, 6) is not drift; a double synced as TEXT is.
+COMPATIBLE = {
+    "string": {"string"},
+    "text": {"string"},
+    "double": {"float", "number"},
+    "float": {"float", "number"},
+    "number": {"number", "float"},
+    "integer": {"number"},
+    "boolean": {"boolean"},
+    "datetime": {"timestamp", "date"},
+    "timestamp": {"timestamp", "date"},
+    "date": {"date", "timestamp"},
+    "variant": {"variant"},
+}
+
+# Snowflake information_schema DATA_TYPE -> family
+WAREHOUSE_FAMILY = {
+    "TEXT": "string",
+    "VARCHAR": "string",
+    "CHAR": "string",
+    "CHARACTER": "string",
+    "STRING": "string",
+    "NUMBER": "number",
+    "DECIMAL": "number",
+    "NUMERIC": "number",
+    "INT": "number",
+    "INTEGER": "number",
+    "BIGINT": "number",
+    "SMALLINT": "number",
+    "FLOAT": "float",
+    "FLOAT4": "float",
+    "FLOAT8": "float",
+    "DOUBLE": "float",
+    "DOUBLE PRECISION": "float",
+    "REAL": "float",
+    "BOOLEAN": "boolean",
+    "DATE": "date",
+    "DATETIME": "timestamp",
+    "TIMESTAMP": "timestamp",
+    "TIMESTAMP_NTZ": "timestamp",
+    "TIMESTAMP_LTZ": "timestamp",
+    "TIMESTAMP_TZ": "timestamp",
+    "TIME": "time",
+    "VARIANT": "variant",
+    "OBJECT": "variant",
+    "ARRAY": "variant",
+    "BINARY": "binary",
+    "VARBINARY": "binary",
+}
+
+_SOURCE_NAME_RE = re.compile(r"^  - name:\s*['\"]?(\w+)")
+_SOURCE_ATTR_RE = re.compile(r"^    (database|schema):\s*['\"]?([\w$]+)")
+
+
+# ── Inputs ──────────────────────────────────────────────────────────────────
+
+
+def source_locations(models_dir: Path = MODELS_DIR) -> dict[tuple[str, str], set[str]]:
+    """(DATABASE, SCHEMA) -> dbt source names declared there.
+
+    Reads the `sources:` blocks line by line; only the top-level database
+    and schema keys of each source matter here.
+    """
+    locations: dict[tuple[str, str], set[str]] = {}
+    for path in sorted(models_dir.rglob("*.yml")):
+        text = path.read_text(encoding="utf-8")
+        if "\nsources:" not in f"\n{text}":
+            continue
+        name = None
+        attrs: dict[str, str] = {}
+        for line in [*text.split("\n"), "  - name: _end"]:
+            m = _SOURCE_NAME_RE.match(line)
+            if m:
+                if name and "schema" in attrs:
+                    key = (attrs.get("database", "").upper(), attrs["schema"].upper())
+                    locations.setdefault(key, set()).add(name)
+                name, attrs = m.group(1), {}
+                continue
+            m = _SOURCE_ATTR_RE.match(line)
+            if m and name:
+                attrs[m.group(1)] = m.group(2)
+    return locations
+
+
+@dataclass(frozen=True)
+class WarehouseColumn:
+    database: str
+    schema: str
+    table: str
+    column: str
+    data_type: str
+    scale: str = ""
+
+    @property
+    def family(self) -> str:
+        base = self.data_type.upper().split("(")[0].strip()
+        family = WAREHOUSE_FAMILY.get(base, base.lower())
+        if family == "number" and self.scale not in ("", "0", None):
+            return "float"  # NUMBER(p, s>0) holds what the context calls a double
+        return family
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _rows_csv(path: Path) -> Iterator[dict[str, str]]:
+    with path.open(encoding="utf-8-sig", newline="") as fh:
+        reader = csv.DictReader(fh)
+        if reader.fieldnames is None:
+            raise ExportError(f"{path}: empty file")
+        reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+        yield from reader
+
+
+def _rows_parquet(path: Path) -> Iterator[dict[str, str]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("reading Parquet needs pyarrow (pip install pyarrow), or export CSV")
+    table = pq.read_table(path)
+    names = [n.lower() for n in table.column_names]
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield {k: "" if v is None else str(v) for k, v in zip(names, row.values())}
+
+
+def read_export(path: Path) -> list[WarehouseColumn]:
+    """Load an information_schema.columns export (.csv or .parquet)."""
+    rows = _rows_parquet(path) if path.suffix.lower() == ".parquet" else _rows_csv(path)
+    columns = []
+    for row in rows:
+        missing = [f for f in REQUIRED_FIELDS if f not in row]
+        if missing:
+            raise ExportError(f"{path}: missing column(s) {', '.join(missing)}")
+        columns.append(
+            WarehouseColumn(
+                database=(row.get("table_catalog") or "").upper(),
+                schema=row["table_schema"].upper(),
+                table=row["table_name"],
+                column=row["column_name"],
+                data_type=row["data_type"],
+                scale=row.get("numeric_scale") or "",
+            )
+        )
+    return columns
+
+
+@dataclass
+class ContextColumns:
+    source: str
+    name: str
+    path: str
+    columns: dict[str, str]  # lower-cased name -> base type
+    omitted: tuple[str, ...]  # lower-cased globs the file deliberately leaves out
+
+    def ignores(self, column: str) -> bool:
+        return any(fnmatchcase(column, p) for p in self.omitted)
+
+
+def load_context_columns() -> dict[tuple[str, str], ContextColumns]:
+    """(context source, lower-cased table) -> documented columns with base types."""
+    system = tuple(p.lower() for p in CONTEXT_SYSTEM_COLUMNS)
+    tables: dict[tuple[str, str], ContextColumns] = {}
+    with open_catalog(refresh=True) as catalog:
+        omitted = catalog.omitted_patterns()
+        for row in catalog.conn.execute(
+            "SELECT t.source, t.domain, t.name, t.path, c.name AS col, c.type_token "
+            "FROM tables t LEFT JOIN columns c ON c.table_id = t.id ORDER BY t.id, c.position"
+        ):
+            key = (row["source"], row["name"].lower())
+            entry = tables.get(key)
+            if entry is None:
+                patterns = tuple(p.lower() for p in omitted.get((row["source"], row["domain"]), ()))
+                entry = tables[key] = ContextColumns(
+                    row["source"], row["name"], row["path"], {}, patterns + system
+                )
+            if row["col"] is not None:
+                entry.columns[row["col"].lower()] = parse_type(row["type_token"]).base
+    return tables
+
+
+# ── Comparison ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class TableDrift:
+    source: str
+    table: str  # context table name
+    warehouse: str  # DATABASE.SCHEMA.TABLE
+    path: str
+    added: list[str] = field(default_factory=list)  # "COL (TYPE)"
+    dropped: list[str] = field(default_factory=list)  # "Col (context type)"
+    changed: list[str] = field(default_factory=list)  # "Col: context type -> TYPE"
+
+
+@dataclass
+class DriftReport:
+    compared: int = 0
+    unchanged: int = 0  # identical column-set hashes
+    drift: list[TableDrift] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)  # "source.Table (path)"
+    undocumented: list[str] = field(default_factory=list)  # DATABASE.SCHEMA.TABLE
+
+
+def column_set_hash(pairs) -> str:
+    """Order-independent hash of (column, family) pairs."""
+    return hashlib.sha256("\n".join(sorted(f"{c}:{f}" for c, f in pairs)).encode()).hexdigest()
+
+
+def context_key(source: str, table: str) -> tuple[str, str]:
+    name = table.lower()
+    for prefix in CONTEXT_TABLE_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return CONTEXT_SOURCE_MAP.get(source, source), name
+
+
+def compare(
+    export: list[WarehouseColumn],
+    context: dict[tuple[str, str], ContextColumns],
+    locations: dict[tuple[str, str], set[str]],
+    only_source: str | None = None,
+) -> DriftReport:
+    """Diff every exported table against its context file in one pass."""
+    by_schema: dict[str, set[str]] = {}
+    for (_, schema), sources in locations.items():
+        by_schema.setdefault(schema, set()).update(sources)
+
+    warehouse: dict[tuple[str, str, str], list[WarehouseColumn]] = {}
+    for col in export:
+        warehouse.setdefault((col.database, col.schema, col.table), []).append(col)
+
+    report = DriftReport()
+    seen: set[tuple[str, str]] = set()
+    scanned_sources: set[str] = set()
+    for (database, schema, table), cols in sorted(warehouse.items()):
+        sources = locations.get((database, schema)) if database else None
+        sources = sources or by_schema.get(schema, set())
+        qualified = ".".join(p for p in (database, schema, table) if p)
+        match = None
+        for source in sorted(sources):
+            key = context_key(source, table)
+            if only_source and key[0] != only_source:
+                continue
+            scanned_sources.add(key[0])
+            if key in context:
+                match = key
+                break
+        if match is None:
+            if sources and (not only_source or only_source in {context_key(s, "")[0] for s in sources}):
+                report.undocumented.append(qualified)
+            continue
+
+        seen.add(match)
+        ctx = context[match]
+        report.compared += 1
+        actual = {c.column.lower(): c for c in cols if not ctx.ignores(c.column.lower())}
+        expected = {n: b for n, b in ctx.columns.items() if not ctx.ignores(n)}
+        if column_set_hash((n, c.family) for n, c in actual.items()) == column_set_hash(
+            (n, CONTEXT_FAMILY.get(b, b)) for n, b in expected.items()
+        ):
+            report.unchanged += 1
+            continue
+
+        drift = TableDrift(ctx.source, ctx.name, qualified, ctx.path)
+        for name in sorted(actual.keys() - expected.keys()):
+            drift.added.append(f"{actual[name].column} ({actual[name].data_type})")
+        for name in sorted(expected.keys() - actual.keys()):
+            drift.dropped.append(f"{name} ({expected[name]})")
+        for name in sorted(actual.keys() & expected.keys()):
+            base, wh = expected[name], actual[name]
+            if base in COMPATIBLE and wh.family not in COMPATIBLE[base]:
+                drift.changed.append(f"{name}: {base} -> {wh.data_type}")
+        if drift.added or drift.dropped or drift.changed:
+            report.drift.append(drift)
+        else:
+            report.unchanged += 1
+
+    for key, ctx in sorted(context.items()):
+        if key[0] in scanned_sources and key not in seen:
+            report.missing.append(f"{ctx.source}.{ctx.name} ({ctx.path})")
+    return report
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Diff an information_schema.columns export against the context catalog."
+    )
+    parser.add_argument("export", type=Path, help="information_schema.columns export (.csv or .parquet)")
+    parser.add_argument("--source", help="Only this context source (prodview, wellview, oda, ...)")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Also list warehouse tables with no context file"
+    )
+    args = parser.parse_args()
+
+    try:
+        export = read_export(args.export)
+        context = load_context_columns()
+    except (OSError, ExportError, sqlite3.Error) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    report = compare(export, context, source_locations(), args.source)
+
+    if args.format == "json":
+        print(json.dumps(asdict(report), indent=2))
+        return 1 if report.drift or report.missing else 0
+
+    by_source: dict[str, list[TableDrift]] = {}
+    for d in report.drift:
+        by_source.setdefault(d.source, []).append(d)
+    for source, drifts in sorted(by_source.items()):
+        print(f"{source}: {len(drifts)} tables drifted")
+        for d in drifts:
+            print(f"  {d.table}  ({d.warehouse} vs {d.path})")
+            for col in d.added:
+                print(f"    + {col}")
+            for col in d.dropped:
+                print(f"    - {col}")
+            for col in d.changed:
+                print(f"    ~ {col}")
+    for table in report.missing:
+        print(f"missing  {table}")
+    if args.verbose:
+        for table in report.undocumented:
+            print(f"no context  {table}")
+
+    print(
+        f"\n{report.compared} tables compared ({report.unchanged} unchanged, "
+        f"{len(report.drift)} drifted), {len(report.missing)} documented tables missing, "
+        f"{len(report.undocumented)} warehouse tables without context",
+        file=sys.stderr,
+    )
+    return 1 if report.drift or report.missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
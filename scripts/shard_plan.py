@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+shard_plan.py — Split a dbt selection into timing-balanced CI shards.
+
+validate-dbt-changes.yaml builds `state:modified+` in one job, so a PR that
+touches prodview and wellview staging builds both trees (and everything
+downstream) one after the other. This script takes the selected nodes, the
+DAG and per-model timings from past runs, and plans N shards that can run
+as parallel jobs, each with its own selector.
+
+Shards must respect dependencies: a job defers every unselected parent to
+prod, so a node and its selected parents have to be built in the same job
+or in an earlier one. The plan is therefore a short sequence of stages:
+
+  - within a stage, each connected group of selected nodes stays whole and
+    the groups are packed into at most N shards, largest first, balanced
+    on their simulated run time (run_timing.py's scheduler at --threads)
+  - a stage boundary is a cut between DAG depths, e.g. staging models in
+    stage 1 and the marts that join them in stage 2; the cut splits one
+    big group into independent ones (prodview staging, wellview staging)
+
+The planner tries every way of cutting the depth range into at most
+--max-stages stages and keeps the one with the lowest estimated wall time,
+counting --stage-overhead per stage for job start-up, deps and parse.
+
+Stage 1 jobs run as today (--defer --favor-state). Later stages build
+against the CI schema the earlier stages wrote, so they defer *without*
+--favor-state; a job only starts after every shard of the previous stage.
+Multi-parent tests (relationships) whose parents end up in different
+shards are not picked up by --indirect-selection cautious; they are listed
+so the last stage can run them.
+
+The DAG comes from a manifest.json (--manifest; ephemeral models are
+bridged), or from model_graph.py's ref() index when there is none. Timings
+are medians over the given run_results.json files; models with no history
+get the median of the rest.
+
+Usage:
+    # Plan 4 shards for the models in `dbt ls` output
+    dbt ls --resource-type model --select "state:modified+" --state prod-artifacts/ > selected.txt
+    python scripts/shard_plan.py --select-file selected.txt --shards 4 \\
+        --manifest target/manifest.json --timings prod-artifacts/
+
+    # Local, no dbt: changed models + downstream from the ref() index
+    python scripts/shard_plan.py --changed --shards 3 --timings runs/*/
+
+    # GitHub Actions matrix / selectors.yml entries
+    python scripts/shard_plan.py --select-file selected.txt --shards 4 --format json
+    python scripts/shard_plan.py --select-file selected.txt --shards 4 --write
+
+    # Plan the fixture project in scripts/fixtures/shard_plan/ and check the result
+    python scripts/shard_plan.py --self-test
+
+Exit codes:
+    0 — success
+    1 — --self-test: the plan differs from the expected one
+    2 — script error (unknown model, unreadable artifacts, empty selection)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from model_graph import changed_model_names, load_graph
+from run_timing import ArtifactError, Dag, critical_path, load_manifest, load_profile, simulate, thread_count
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SELECTORS_PATH = PROJECT_ROOT / "selectors.yml"
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "shard_plan"
+
+# Everything after this line in selectors.yml is replaced by --write.
+GENERATED_MARKER = "  # CI shards: generated by scripts/shard_plan.py --write"
+SELECTOR_PREFIX = "ci-shard"
+
+DEFAULT_SECONDS = 10.0  # per node when there is no history at all
+
+
+# ── Inputs ──────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ProjectGraph:
+    """Parents by node name for the whole project."""
+
+    parents: dict[str, set[str]]
+    ephemeral: set[str] = field(default_factory=set)
+    tests: dict[str, set[str]] = field(default_factory=dict)  # test -> tested nodes
+
+
+def graph_from_manifest(path: Path) -> ProjectGraph:
+    nodes = load_manifest(path)
+    names = {uid: n.name for uid, n in nodes.items()}
+    graph = ProjectGraph({})
+    for uid, node in nodes.items():
+        parents = {names[p] for p in node.depends_on if p in names}
+        if node.resource_type == "test":
+            graph.tests[node.name] = parents
+            continue
+        graph.parents[node.name] = parents
+        if node.materialized == "ephemeral":
+            graph.ephemeral.add(node.name)
+    return graph
+
+
+def graph_from_index() -> ProjectGraph:
+    return ProjectGraph({e.name: set(e.refs) for e in load_graph().entries.values()})
+
+
+def read_selection(path: str) -> list[str]:
+    """Node names from `dbt ls` output: plain names, unique_ids, fqn paths or JSON lines."""
+    text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+    names = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            row = json.loads(line)
+            names.append(row.get("name") or row["unique_id"].rsplit(".", 1)[-1])
+        else:
+            names.append(line.rsplit(".", 1)[-1])
+    return names
+
+
+def load_timings(paths: list[Path]) -> tuple[dict[str, float], int | None]:
+    """Median seconds by node name, and the thread count the runs used."""
+    if not paths:
+        return {}, None
+    profile = load_profile(paths)
+    return {t.name: t.seconds for t in profile.nodes.values()}, profile.threads
+
+
+# ── Planning ────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Shard:
+    stage: int
+    index: int
+    nodes: list[str]  # parents before children
+    seconds: float  # simulated
+
+    @property
+    def selector(self) -> str:
+        return f"{SELECTOR_PREFIX}-{self.stage}-{self.index}"
+
+
+class Planner:
+    def __init__(
+        self,
+        selected: set[str],
+        graph: ProjectGraph,
+        weights: dict[str, float],
+        shards: int,
+        threads: int,
+    ):
+        self.selected = selected
+        self.weights = weights
+        self.shards = shards
+        self.threads = threads
+        self.parents = self._selected_parents(graph)
+        self.children: dict[str, set[str]] = {n: set() for n in selected}
+        for n, ps in self.parents.items():
+            for p in ps:
+                self.children[p].add(n)
+        self.depth = self._depths()
+
+    def _selected_parents(self, graph: ProjectGraph) -> dict[str, set[str]]:
+        """Selected parents of each selected node, seen through ephemeral models."""
+
+        def walk(name: str, seen: set[str]) -> set[str]:
+            found = set()
+            for p in graph.parents.get(name, ()):
+                if p in seen:
+                    continue
+                seen.add(p)
+                if p in self.selected:
+                    found.add(p)
+                if p in graph.ephemeral:
+                    found |= walk(p, seen)
+            return found
+
+        return {n: walk(n, set()) for n in self.selected}
+
+    def _depths(self) -> dict[str, int]:
+        depth: dict[str, int] = {}
+        for n in self.topological(self.selected):
+            depth[n] = 1 + max((depth[p] for p in self.parents[n]), default=-1)
+        return depth
+
+    def topological(self, nodes: set[str]) -> list[str]:
+        indegree = {n: sum(1 for p in self.parents[n] if p in nodes) for n in nodes}
+        ready = sorted((n for n, d in indegree.items() if d == 0), reverse=True)
+        order = []
+        while ready:
+            n = ready.pop()
+            order.append(n)
+            for c in sorted(self.children[n], reverse=True):
+                if c in indegree:
+                    indegree[c] -= 1
+                    if indegree[c] == 0:
+                        ready.append(c)
+        order.extend(sorted(n for n in nodes if n not in set(order)))  # cycles: keep every node
+        return order
+
+    def estimate(self, nodes: set[str]) -> float:
+        """Simulated wall time of building ``nodes`` in one job."""
+        dag = Dag(
+            {n: self.weights[n] for n in nodes},
+            {n: self.parents[n] & nodes for n in nodes},
+            {n: self.children[n] & nodes for n in nodes},
+        )
+        return simulate(dag, self.threads, critical_path(dag).tail)
+
+    def components(self, nodes: set[str]) -> list[set[str]]:
+        """Weakly connected groups of ``nodes`` (edges between members only)."""
+        seen: set[str] = set()
+        groups = []
+        for start in sorted(nodes):
+            if start in seen:
+                continue
+            group, stack = set(), [start]
+            while stack:
+                n = stack.pop()
+                if n in group:
+                    continue
+                group.add(n)
+                stack.extend((self.parents[n] | self.children[n]) & nodes - group)
+            seen |= group
+            groups.append(group)
+        return groups
+
+    def pack(self, nodes: set[str]) -> list[set[str]]:
+        """Longest-first packing of connected groups into at most N shards."""
+        groups = sorted(self.components(nodes), key=lambda g: (-self.estimate(g), min(g)))
+        bins: list[tuple[float, set[str]]] = []
+        for g in groups:
+            if len(bins) < self.shards:
+                bins.append((self.estimate(g), set(g)))
+                continue
+            i = min(range(len(bins)), key=lambda j: bins[j][0])
+            bins[i] = (bins[i][0] + self.estimate(g), bins[i][1] | g)
+        return [b for _, b in bins]
+
+    def plan(self, max_stages: int, overhead: float) -> list[list[set[str]]]:
+        """Stages (each a list of shards) with the lowest estimated wall time.
+
+        Dynamic programme over cut points in the depth range: best[(i, s)] is
+        the cheapest way to build depths >= i in at most s stages.
+        """
+        levels = max(self.depth.values()) + 1
+        by_depth = [{n for n, d in self.depth.items() if d == k} for k in range(levels)]
+        stage_cost: dict[tuple[int, int], tuple[float, list[set[str]]]] = {}
+
+        def stage(i: int, j: int) -> tuple[float, list[set[str]]]:
+            if (i, j) not in stage_cost:
+                shards = self.pack(set().union(*by_depth[i:j]))
+                wall = max(self.estimate(s) for s in shards)
+                stage_cost[(i, j)] = (wall + overhead, shards)
+            return stage_cost[(i, j)]
+
+        best: dict[tuple[int, int], tuple[float, list[list[set[str]]]]] = {}
+
+        def solve(i: int, stages_left: int) -> tuple[float, list[list[set[str]]]]:
+            if (i, stages_left) in best:
+                return best[(i, stages_left)]
+            cost, shards = stage(i, levels)
+            result = (cost, [shards])
+            if stages_left > 1:
+                for j in range(i + 1, levels):
+                    head_cost, head = stage(i, j)
+                    if head_cost >= result[0]:
+                        continue
+                    tail_cost, tail = solve(j, stages_left - 1)
+                    if head_cost + tail_cost < result[0]:
+                        result = (head_cost + tail_cost, [head, *tail])
+            best[(i, stages_left)] = result
+            return result
+
+        return solve(0, max_stages)[1]
+
+
+def plan_shards(planner: Planner, max_stages: int, overhead: float) -> list[Shard]:
+    """Plan the stages and number their shards, slowest first within a stage."""
+    return [
+        Shard(stage, index, planner.topological(nodes), round(planner.estimate(nodes), 1))
+        for stage, stage_shards in enumerate(planner.plan(max_stages, overhead), start=1)
+        for index, nodes in enumerate(sorted(stage_shards, key=lambda s: -planner.estimate(s)), start=1)
+    ]
+
+
+def cross_shard_tests(graph: ProjectGraph, shards: list[Shard]) -> list[str]:
+    """Multi-parent tests on selected nodes whose parents span shards."""
+    where = {n: s.selector for s in shards for n in s.nodes}
+    return sorted(
+        test
+        for test, parents in graph.tests.items()
+        if len(parents) > 1
+        and parents <= where.keys()
+        and len({where[p] for p in parents}) > 1
+    )
+
+
+# ── Self-test ───────────────────────────────────────────────────────────────
+
+# Two staging branches joined by one mart, timed at 1 thread: splitting the
+# branches into parallel shards and the mart into a second stage beats a
+# single job, and the relationships test across the branches is orphaned.
+FIXTURE_EXPECTED = [
+    (1, ["stg_a__customers", "stg_a__orders", "int_a__orders"]),
+    (1, ["stg_b__tanks", "stg_b__wells", "int_b__tank_volumes"]),
+    (2, ["fct_summary"]),
+]
+FIXTURE_CROSS_SHARD = ["relationships_stg_a__orders_well_id__id__ref_stg_b__wells_"]
+
+
+def self_test() -> int:
+    """Plan the fixture project (2 shards, 2 stages, 30s overhead) and check it."""
+    graph = graph_from_manifest(FIXTURE_DIR / "manifest.json")
+    timings, threads = load_timings([FIXTURE_DIR])
+    selected = graph.parents.keys() - graph.ephemeral
+    planner = Planner(selected, graph, {n: timings[n] for n in selected}, 2, threads or 4)
+    shards = plan_shards(planner, 2, 30.0)
+
+    failures = []
+    got = [(s.stage, s.nodes) for s in shards]
+    if got != FIXTURE_EXPECTED:
+        failures.append(f"shards: expected {FIXTURE_EXPECTED}, got {got}")
+    orphans = cross_shard_tests(graph, shards)
+    if orphans != FIXTURE_CROSS_SHARD:
+        failures.append(f"cross-shard tests: expected {FIXTURE_CROSS_SHARD}, got {orphans}")
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    print(
+        f"shard_plan self-test: {'FAILED' if failures else 'ok'} "
+        f"({len(shards)} shards from {FIXTURE_DIR.relative_to(PROJECT_ROOT)})",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+# ── Output ──────────────────────────────────────────────────────────────────
+
+
+def render_selectors(shards: list[Shard]) -> str:
+    lines = [GENERATED_MARKER]
+    for s in shards:
+        lines += [f"  - name: {s.selector}", "    definition:", "      union:"]
+        lines += [f"        - {n}" for n in s.nodes]
+    return "\n".join(lines) + "\n"
+
+
+def write_selectors(shards: list[Shard], path: Path = SELECTORS_PATH) -> None:
+    """Replace the generated shard selectors at the end of selectors.yml."""
+    text = path.read_text(encoding="utf-8")
+    head, _, _ = text.partition(GENERATED_MARKER)
+    path.write_text(head.rstrip("\n") + "\n\n" + render_selectors(shards), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Plan dependency-respecting, timing-balanced CI shards for a dbt selection."
+    )
+    parser.add_argument("models", nargs="*", help="Selected model names")
+    parser.add_argument("--select-file", help="`dbt ls` output with the selection ('-' for stdin)")
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Add models changed vs origin/main, plus everything downstream (ref() index)",
+    )
+    parser.add_argument("--shards", type=int, default=4, help="Parallel jobs per stage (default: 4)")
+    parser.add_argument("--max-stages", type=int, default=2, help="Sequential stages at most (default: 2)")
+    parser.add_argument(
+        "--stage-overhead",
+        type=float,
+        default=120.0,
+        help="Seconds a job spends before building: checkout, deps, parse (default: 120)",
+    )
+    parser.add_argument("--manifest", type=Path, help="manifest.json for the DAG (default: ref() index)")
+    parser.add_argument(
+        "--timings", nargs="*", type=Path, default=[], help="Artifact dirs or run_results.json files"
+    )
+    parser.add_argument("--threads", type=thread_count, help="dbt threads per job (default: from the runs, else 4)")
+    parser.add_argument("--format", choices=["text", "json", "selectors"], default="text")
+    parser.add_argument(
+        "--write", action="store_true", help="Write the shard selectors into selectors.yml"
+    )
+    parser.add_argument(
+        "--self-test", action="store_true", help="Plan the committed fixture project and check the result"
+    )
+    args = parser.parse_args()
+
+    if args.self_test:
+        try:
+            return self_test()
+        except (ArtifactError, OSError, KeyError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+
+    try:
+        graph = graph_from_manifest(args.manifest) if args.manifest else graph_from_index()
+        timings, run_threads = load_timings(args.timings)
+        names = list(args.models)
+        if args.select_file:
+            names += read_selection(args.select_file)
+    except (ArtifactError, OSError, ValueError, KeyError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    if args.changed:
+        index = load_graph()
+        changed = {n for n in changed_model_names() if n in index.by_name}
+        names += changed | index.downstream(changed)
+
+    selected = {n for n in names if n not in graph.ephemeral}
+    unknown = sorted(selected - graph.parents.keys())
+    if unknown:
+        print(f"Unknown model(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if not selected:
+        print("Nothing selected", file=sys.stderr)
+        return 2
+
+    known = [timings[n] for n in selected if n in timings]
+    fallback = statistics.median(known) if known else DEFAULT_SECONDS
+    weights = {n: timings.get(n, fallback) for n in selected}
+    threads = args.threads or run_threads or 4
+
+    planner = Planner(selected, graph, weights, max(args.shards, 1), threads)
+    shards = plan_shards(planner, max(args.max_stages, 1), args.stage_overhead)
+    stages = shards[-1].stage
+    serial = planner.estimate(selected)
+    wall = sum(max(s.seconds for s in shards if s.stage == k) + args.stage_overhead for k in range(1, stages + 1))
+    orphans = cross_shard_tests(graph, shards)
+
+    if args.write:
+        write_selectors(shards)
+        print(f"Wrote {len(shards)} shard selectors to {SELECTORS_PATH.relative_to(PROJECT_ROOT)}", file=sys.stderr)
+
+    if args.format == "json":
+        print(
+            json.dumps(
+                {
+                    "threads": threads,
+                    "single_job_seconds": round(serial + args.stage_overhead, 1),
+                    "planned_seconds": round(wall, 1),
+                    "without_history": sorted(n for n in selected if n not in timings),
+                    "cross_shard_tests": orphans,
+                    "shards": [asdict(s) | {"selector": s.selector} for s in shards],
+                    "matrix": {
+                        f"stage{k}": {
+                            "include": [
+                                {"shard": s.selector, "select": " ".join(s.nodes)}
+                                for s in shards
+                                if s.stage == k
+                            ]
+                        }
+                        for k in range(1, stages + 1)
+                    },
+                },
+                indent=2,
+            )
+        )
+    elif args.format == "selectors":
+        print(render_selectors(shards), end="")
+    else:
+        for s in shards:
+            preview = ", ".join(s.nodes[:4]) + (f", … (+{len(s.nodes) - 4})" if len(s.nodes) > 4 else "")
+            print(f"{s.selector:<14} {len(s.nodes):>4} nodes {s.seconds:>8.0f}s  {preview}")
+        for test in orphans:
+            print(f"cross-shard test  {test}")
+
+    print(
+        f"\n{len(selected)} nodes ({len(selected) - len(known)} without history), {threads} threads/job: "
+        f"one job ~{(serial + args.stage_overhead) / 60:.1f} min, {len(shards)} shards in "
+        f"{stages} stage(s) ~{wall / 60:.1f} min",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,11 +27,40 @@ Usage:
 
     # Split specific domain file
     python scripts/split_context_tables.py --file context/sources/prodview/tanks.yaml
+
+    # Ignore the manifest and re-render every domain (still skips identical writes)
+    python scripts/split_context_tables.py --force
+
+    # Reverse: rebuild context/sources/<source>/<domain>.yaml from domains/ + tables/
+    python scripts/split_context_tables.py --reverse --source prodview
+
+    # Exit 1 if the domain files and domains/ + tables/ have drifted (pre-commit)
+    python scripts/split_context_tables.py --check
+
+Splitting is incremental. target/context_split_manifest.json records the hash
+of each domain file and of every output it produced. Unchanged domain files
+are skipped without parsing, outputs whose content is identical are never
+rewritten (so mtimes stay put), writes are atomic (temp file + rename), and
+table files dropped from a domain are pruned. The compiled table catalog
+(scripts/context_catalog.py) is refreshed at the end of every real run.
+
+--reverse only rebuilds a domain file if splitting the result gives back the
+current domains/ and tables/ files byte for byte, and it keeps an existing
+domain file holding anything the split layout doesn't (--force overwrites).
+--check reads the tree once and matches each generated table file to its
+entry in the domains/ listing, and each block of a kept full domain file to
+its table file, and fails if no block matched. It also reports listing entries with no table file, unlisted or
+orphaned table files, tables listed twice, and stale domain-level copies.
+It takes a fraction of a second, so both layouts can be kept without a
+re-split.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
 import re
 import sys
 from dataclasses import dataclass, field
@@ -39,6 +68,10 @@ from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONTEXT_DIR = PROJECT_ROOT / "context" / "sources"
+MANIFEST_PATH = PROJECT_ROOT / "target" / "context_split_manifest.json"
+
+# Heads the table listing that closes every split domain file.
+LISTING_MARKER = "# Tables in this domain (column details in tables/ directory):"
 
 
 @dataclass
@@ -55,6 +88,15 @@ class TableEntry:
     def filename(self) -> str:
         return f"{self.name}.yaml"
 
+    def listing_line(self) -> str:
+        """The `#   name: description` line naming this table in its domain file."""
+        # Extract the description part from the header line
+        desc = self.header_line.split(":", 1)[1].strip() if ":" in self.header_line else ""
+        # Truncate long descriptions
+        if len(desc) > 80:
+            desc = desc[:77] + "..."
+        return f"#   {self.name}: {desc}"
+
     def to_yaml(self) -> str:
         """Render as a standalone per-table YAML file."""
         lines = [
@@ -85,21 +127,30 @@ class DomainFile:
         # Add table listing
         if self.tables:
             lines.append("")
-            lines.append("# Tables in this domain (column details in tables/ directory):")
-            for t in self.tables:
-                # Extract the description part from the header line
-                desc = t.header_line.split(":", 1)[1].strip() if ":" in t.header_line else ""
-                # Truncate long descriptions
-                if len(desc) > 80:
-                    desc = desc[:77] + "..."
-                lines.append(f"#   {t.name}: {desc}")
+            lines.append(LISTING_MARKER)
+            lines.extend(t.listing_line() for t in self.tables)
 
         return "\n".join(lines).rstrip() + "\n"
 
+    def to_source_yaml(self) -> str:
+        """Render as the single domain file the split started from."""
+        lines = list(self.header_lines)
+        for t in self.tables:
+            lines.extend([t.header_line, *t.columns, ""])
+        return "\n".join(lines).rstrip() + "\n"
+
+
+# Table header lines: start with pv* or wv* (not indented)
+TABLE_HEADER_RE = re.compile(r"^(pv\w+|wv\w+|WV\w+):\s*(.*)$")
+
 
 def parse_domain_file(filepath: Path, source: str) -> DomainFile:
     """Parse a domain YAML file into header + table entries."""
-    content = filepath.read_text(encoding="utf-8")
+    return parse_domain_text(filepath.read_text(encoding="utf-8"), filepath, source)
+
+
+def parse_domain_text(content: str, filepath: Path, source: str) -> DomainFile:
+    """Parse domain YAML ``content``; ``filepath`` names the domain (its stem)."""
     lines = content.split("\n")
     domain = filepath.stem  # e.g., "tanks" from "tanks.yaml"
 
@@ -107,11 +158,8 @@ def parse_domain_file(filepath: Path, source: str) -> DomainFile:
     tables: list[TableEntry] = []
     current_table: TableEntry | None = None
 
-    # Pattern for table header lines: starts with pv* or wv* (not indented)
-    table_pattern = re.compile(r"^(pv\w+|wv\w+|WV\w+):\s*(.*)$")
-
     for line in lines:
-        match = table_pattern.match(line)
+        match = TABLE_HEADER_RE.match(line)
         if match:
             # Save previous table
             if current_table:
@@ -173,54 +221,143 @@ def find_domain_files(source: str | None = None) -> list[tuple[str, Path]]:
     return results
 
 
+def sha256_text(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def write_if_changed(path: Path, content: str, dry_run: bool = False) -> bool:
+    """Atomically write ``content`` unless the file already holds it.
+
+    Returns True if the file was (or, in a dry run, would be) written.
+    """
+    if sha256_file(path) == sha256_text(content):
+        return False
+    rel = path.relative_to(PROJECT_ROOT)
+    if dry_run:
+        print(f"  {'UPDATE' if path.exists() else 'CREATE'} {rel} ({len(content)} bytes)")
+        return True
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+    return True
+
+
+class SplitManifest:
+    """Hashes of each domain file and of every output it produced.
+
+    Keys are paths relative to PROJECT_ROOT:
+      {"domains": {"context/sources/x/d.yaml": {
+          "sha256": ..., "tables": N, "outputs": {"context/.../t.yaml": sha256}}}}
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = path
+        self.domains: dict[str, dict] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.domains = data.get("domains", {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, rel: str, input_hash: str) -> bool:
+        """True if ``rel`` was split from identical input and outputs exist."""
+        entry = self.domains.get(rel)
+        return (
+            entry is not None
+            and entry["sha256"] == input_hash
+            and all((PROJECT_ROOT / out).exists() for out in entry["outputs"])
+        )
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"domains": self.domains}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
 def split_domain_file(
     domain_file: DomainFile,
     dry_run: bool = False,
-) -> tuple[int, int]:
-    """Split a domain file into per-table files.
+) -> tuple[int, int, dict[str, str]]:
+    """Split a domain file into per-table files, skipping identical outputs.
 
-    Returns (tables_created, bytes_written).
+    Returns (files_written, bytes_written, outputs) where ``outputs`` maps
+    each output path (relative to PROJECT_ROOT) to its content hash.
     """
     source_dir = CONTEXT_DIR / domain_file.source
     tables_dir = source_dir / "tables"
     domains_dir = source_dir / "domains"
 
-    tables_created = 0
+    files_written = 0
     bytes_written = 0
+    outputs: dict[str, str] = {}
 
     if not dry_run:
         tables_dir.mkdir(exist_ok=True)
         domains_dir.mkdir(exist_ok=True)
 
-    # Write per-table files
-    for table in domain_file.tables:
-        table_path = tables_dir / table.filename
-        content = table.to_yaml()
-
-        if dry_run:
-            print(f"  CREATE {table_path.relative_to(PROJECT_ROOT)} ({len(content)} bytes)")
-        else:
-            table_path.write_text(content, encoding="utf-8")
-
-        tables_created += 1
-        bytes_written += len(content)
+    rendered = [(tables_dir / t.filename, t.to_yaml()) for t in domain_file.tables]
+    # Domain-level file (header + table listing, no columns)
+    rendered.append(
+        (domains_dir / f"{domain_file.domain}.yaml", domain_file.to_domain_yaml())
+    )
 
-    # Write domain-level file (header + table listing, no columns)
-    domain_path = domains_dir / f"{domain_file.domain}.yaml"
-    domain_content = domain_file.to_domain_yaml()
+    for path, content in rendered:
+        outputs[str(path.relative_to(PROJECT_ROOT))] = sha256_text(content)
+        if write_if_changed(path, content, dry_run=dry_run):
+            files_written += 1
+            bytes_written += len(content)
 
-    if dry_run:
-        print(f"  CREATE {domain_path.relative_to(PROJECT_ROOT)} ({len(domain_content)} bytes)")
-    else:
-        domain_path.write_text(domain_content, encoding="utf-8")
+    return files_written, bytes_written, outputs
 
-    bytes_written += len(domain_content)
 
-    return tables_created, bytes_written
+def prune_outputs(
+    manifest: SplitManifest,
+    previous: dict[str, dict],
+    dry_run: bool = False,
+) -> int:
+    """Delete outputs that re-split domains no longer produce.
 
+    ``previous`` holds the manifest entries of the re-split domains before
+    this run. A file is only removed if no domain produces it any more and
+    it still has the hash we wrote (hand-edited files are reported instead).
+    """
+    produced = {out for entry in manifest.domains.values() for out in entry["outputs"]}
+    pruned = 0
+    for rel, old_entry in previous.items():
+        for out, digest in old_entry["outputs"].items():
+            if out in produced:
+                continue
+            path = PROJECT_ROOT / out
+            current = sha256_file(path)
+            if current is None:
+                continue
+            if current != digest:
+                print(f"  KEEP {out} (no longer produced by {rel}, but edited by hand)")
+                continue
+            print(f"  PRUNE {out}")
+            if not dry_run:
+                path.unlink()
+            pruned += 1
+    return pruned
+
+
+def update_index(
+    source: str,
+    domain_counts: list[tuple[str, int]],
+    dry_run: bool = False,
+) -> int:
+    """Update or create _index.yaml from (domain, table count) pairs.
 
-def update_index(source: str, domain_files: list[DomainFile], dry_run: bool = False) -> None:
-    """Update or create _index.yaml with the new structure reference."""
+    Returns the bytes written (0 if the index was already up to date).
+    """
     index_path = CONTEXT_DIR / source / "_index.yaml"
 
     lines = [
@@ -229,23 +366,295 @@ def update_index(source: str, domain_files: list[DomainFile], dry_run: bool = Fa
         "#",
         "# Domain files (load for cross-table context):",
     ]
-    for df in domain_files:
-        lines.append(f"#   domains/{df.domain}.yaml — {len(df.tables)} tables")
+    for domain, count in domain_counts:
+        lines.append(f"#   domains/{domain}.yaml — {count} tables")
 
     lines.append("#")
     lines.append("# Per-table files (load for single-model work):")
     lines.append(f"#   tables/{{table_name}}.yaml")
     lines.append("#")
 
-    total_tables = sum(len(df.tables) for df in domain_files)
-    lines.append(f"# Total: {len(domain_files)} domains, {total_tables} tables")
+    total_tables = sum(count for _, count in domain_counts)
+    lines.append(f"# Total: {len(domain_counts)} domains, {total_tables} tables")
 
     content = "\n".join(lines) + "\n"
+    return len(content) if write_if_changed(index_path, content, dry_run=dry_run) else 0
 
-    if dry_run:
-        print(f"  UPDATE {index_path.relative_to(PROJECT_ROOT)}")
-    else:
-        index_path.write_text(content, encoding="utf-8")
+
+# ---------------------------------------------------------------------------
+# Reverse mode and consistency check
+# ---------------------------------------------------------------------------
+
+TABLE_TITLE_RE = re.compile(r"^# (\w+) / (\w+) / ([\w$]+)\s*$")
+LISTING_ENTRY_RE = re.compile(r"^#   ([\w$]+):")
+
+
+@dataclass
+class TableFile:
+    """A tables/<name>.yaml file read back."""
+
+    path: Path
+    domain: str
+    name: str
+    content: str
+    entry: TableEntry | None  # None unless TableEntry.to_yaml() reproduces the file
+
+
+@dataclass
+class SplitDomain:
+    """A domains/<domain>.yaml file and the table files that name it."""
+
+    path: Path
+    source: str
+    domain: str
+    content: str
+    header_lines: list[str]
+    listed: list[str]  # table names in the file's table listing
+    listing: dict[str, str]  # lowercased table name -> its listing line
+    files: list[TableFile]  # listing order, unlisted files after
+
+    def problems(self) -> list[str]:
+        """Listing entries without a table file, and table files not listed."""
+        rel = self.path.relative_to(PROJECT_ROOT)
+        have = {f.name.lower() for f in self.files}
+        listed = [name.lower() for name in self.listed]
+        problems = [
+            f"{rel}: lists {name} more than once (only one tables/{name}.yaml survives the split)"
+            for i, name in enumerate(self.listed)
+            if listed.index(name.lower()) < i
+        ]
+        problems += [
+            f"{rel}: lists {name}, but no table file names this domain"
+            for name in self.listed
+            if name.lower() not in have
+        ]
+        problems += [
+            f"{f.path.relative_to(PROJECT_ROOT)}: not listed in {rel}"
+            for f in self.files
+            if f.name.lower() not in listed
+        ]
+        return problems
+
+    def to_domain_file(self) -> DomainFile | None:
+        """The DomainFile this layout was split from; None if a table file is hand-written."""
+        if any(f.entry is None for f in self.files):
+            return None
+        return DomainFile(
+            path=CONTEXT_DIR / self.source / f"{self.domain}.yaml",
+            source=self.source,
+            domain=self.domain,
+            header_lines=self.header_lines,
+            tables=[f.entry for f in self.files],
+        )
+
+    def matches(self, df: DomainFile) -> bool:
+        """True if splitting ``df`` writes exactly this domain file and these table files."""
+        return df.to_domain_yaml() == self.content and [t.to_yaml() for t in df.tables] == [
+            f.content for f in self.files
+        ]
+
+
+def read_table_file(path: Path) -> TableFile | None:
+    """Read a per-table file; None if it has no `# source / domain / table` title."""
+    content = path.read_text(encoding="utf-8")
+    lines = content.rstrip("\n").split("\n")
+    m = TABLE_TITLE_RE.match(lines[0])
+    if not m:
+        return None
+    source, domain, name = m.groups()
+    entry = None
+    if len(lines) > 3 and TABLE_HEADER_RE.match(lines[3]):
+        entry = TableEntry(
+            name=name, header_line=lines[3], columns=lines[4:], domain=domain, source=source
+        )
+        if entry.to_yaml() != content:
+            entry = None
+    return TableFile(path, domain, name, content, entry)
+
+
+def load_split_layout(source: str) -> tuple[dict[str, SplitDomain], list[str]]:
+    """Read one source's domains/ and tables/ in a single pass.
+
+    Returns (domain -> SplitDomain, table files naming a domain that has no
+    domains/ file).
+    """
+    source_dir = CONTEXT_DIR / source
+    by_domain: dict[str, dict[str, TableFile]] = {}
+    for path in sorted((source_dir / "tables").glob("*.yaml")):
+        tf = read_table_file(path)
+        if tf is not None:
+            # Listings and file names don't always agree on case (combo_curve)
+            by_domain.setdefault(tf.domain, {})[tf.name.lower()] = tf
+
+    layout = {}
+    for path in sorted((source_dir / "domains").glob("*.yaml")):
+        content = path.read_text(encoding="utf-8")
+        head, marker, listing = content.partition("\n" + LISTING_MARKER)
+        if marker:
+            # to_domain_yaml() puts one blank line between header and listing
+            header_lines = head.split("\n")[:-1]
+            entries = [(m.group(1), line) for line in listing.split("\n") if (m := LISTING_ENTRY_RE.match(line))]
+        else:
+            header_lines, entries = content.rstrip("\n").split("\n"), []
+        listed = [name for name, _ in entries]
+        files = by_domain.pop(path.stem, {})
+        ordered = [files.pop(name.lower()) for name in listed if name.lower() in files]
+        ordered += [files[name] for name in sorted(files)]
+        layout[path.stem] = SplitDomain(
+            path, source, path.stem, content, header_lines, listed, {n.lower(): l for n, l in entries}, ordered
+        )
+
+    orphans = [
+        f"{tf.path.relative_to(PROJECT_ROOT)}: names domain {domain}, "
+        f"which has no domains/{domain}.yaml"
+        for domain, files in sorted(by_domain.items())
+        for tf in files.values()
+    ]
+    return layout, orphans
+
+
+def split_sources(source: str | None = None) -> list[str]:
+    """Sources laid out as domains/ + tables/."""
+    return [
+        d.name
+        for d in sorted(CONTEXT_DIR.iterdir())
+        if (d / "domains").is_dir() and (source is None or d.name == source)
+    ]
+
+
+def first_difference(a: str, b: str) -> int:
+    """1-based number of the first line where ``a`` and ``b`` differ."""
+    for lineno, (x, y) in enumerate(zip(a.split("\n"), b.split("\n")), start=1):
+        if x != y:
+            return lineno
+    return min(a.count("\n"), b.count("\n")) + 1
+
+
+def check_consistency(source: str | None = None) -> tuple[int, list[str]]:
+    """Compare every domain file with its split layout in one pass.
+
+    Each generated table file is matched to its entry in the domains/
+    listing, which has to be the line the split renders from the file's
+    header. Where a full domain file is still kept next to domains/, each
+    of its table blocks is also hashed in both representations (the block
+    rendered as its table file, and the table file itself). Also reports
+    split layouts that disagree with themselves: listing entries without a
+    table file, unlisted table files, and stale listings.
+
+    Returns (table blocks compared, divergences).
+    """
+    compared = 0
+    drift: list[str] = []
+    for src in split_sources(source):
+        layout, orphans = load_split_layout(src)
+        drift.extend(orphans)
+        for sd in layout.values():
+            rel = sd.path.relative_to(PROJECT_ROOT)
+            problems = sd.problems()
+            # Hand-written table files (entry None) have no rendered listing line
+            for f in sd.files:
+                line = sd.listing.get(f.name.lower())
+                if f.entry is None or line is None:
+                    continue
+                compared += 1
+                if f.entry.listing_line() != line:
+                    problems.append(f"{rel}: listing entry for {f.name} differs from tables/{f.path.name}")
+            drift.extend(problems)
+            df = sd.to_domain_file()
+            if not problems and df is not None and df.to_domain_yaml() != sd.content:
+                drift.append(
+                    f"{rel}: table listing is out of date "
+                    f"with tables/ (line {first_difference(df.to_domain_yaml(), sd.content)})"
+                )
+
+        for _, filepath in find_domain_files(src):
+            rel = filepath.relative_to(PROJECT_ROOT)
+            sd = layout.get(filepath.stem)
+            if sd is None:
+                drift.append(f"{rel}: not split yet (no domains/{filepath.stem}.yaml)")
+                continue
+            content = filepath.read_text(encoding="utf-8")
+            parsed = parse_domain_text(content, filepath, src)
+            if not parsed.tables and LISTING_MARKER in content:
+                # A copy of the domain-level file rather than a full domain file
+                if content != sd.content:
+                    drift.append(
+                        f"{rel}: differs from domains/{sd.domain}.yaml "
+                        f"(line {first_difference(content, sd.content)})"
+                    )
+                continue
+
+            if parsed.header_lines != sd.header_lines:
+                drift.append(f"{rel}: header differs from domains/{sd.domain}.yaml")
+            ours = {t.name: sha256_text(t.to_yaml()) for t in parsed.tables}
+            theirs = {f.name: sha256_text(f.content) for f in sd.files}
+            compared += len(ours)
+            for name in sorted(ours.keys() | theirs.keys()):
+                if name not in theirs:
+                    drift.append(f"{rel}: {name} has no table file")
+                elif name not in ours:
+                    drift.append(f"{rel}: tables/{name}.yaml is not in the domain file")
+                elif ours[name] != theirs[name]:
+                    drift.append(f"{rel}: {name} differs from tables/{name}.yaml")
+    return compared, drift
+
+
+def replaceable(path: Path, sd: SplitDomain) -> bool:
+    """True if ``path`` holds nothing that ``sd`` doesn't: it splits into exactly
+    ``sd``, or it is a verbatim copy of the domain-level file."""
+    content = path.read_text(encoding="utf-8")
+    return content == sd.content or sd.matches(parse_domain_text(content, path, sd.source))
+
+
+def reverse_split(
+    manifest: SplitManifest,
+    source: str | None = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> tuple[int, int]:
+    """Rebuild each context/sources/<source>/<domain>.yaml from domains/ + tables/.
+
+    A domain is only rebuilt if splitting the result reproduces the current
+    files byte for byte. An existing domain file that would split into
+    something else (edited since the split) is kept unless ``force``.
+    Rebuilt files are recorded in the manifest as already split.
+
+    Returns (files written, domains skipped).
+    """
+    written = skipped = 0
+    for src in split_sources(source):
+        layout, _ = load_split_layout(src)
+        for sd in layout.values():
+            df = sd.to_domain_file()
+            rel = str(df.path.relative_to(PROJECT_ROOT)) if df else ""
+            reason = ""
+            if sd.problems():
+                reason = "listing and table files disagree (see --check)"
+            elif df is None:
+                reason = "has table files the splitter did not write"
+            elif not sd.matches(parse_domain_text(df.to_source_yaml(), df.path, src)):
+                reason = "rebuilt file would not split back to the same files"
+            elif df.path.exists() and not force and not replaceable(df.path, sd):
+                reason = f"{rel} was edited since the split (see --check; --force overwrites)"
+            if reason:
+                print(f"  SKIP {sd.path.relative_to(PROJECT_ROOT)}: {reason}")
+                skipped += 1
+                continue
+
+            content = df.to_source_yaml()
+            if write_if_changed(df.path, content, dry_run=dry_run):
+                if not dry_run:
+                    print(f"  WROTE {rel} ({len(df.tables)} tables)")
+                written += 1
+            manifest.domains[rel] = {
+                "sha256": sha256_text(content),
+                "tables": len(df.tables),
+                "outputs": {
+                    str(p.relative_to(PROJECT_ROOT)): sha256_text(c)
+                    for p, c in [(sd.path, sd.content), *((f.path, f.content) for f in sd.files)]
+                },
+            }
+    return written, skipped
 
 
 def main() -> int:
@@ -265,8 +674,51 @@ def main() -> int:
         action="store_true",
         help="Show what would be created without writing files",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-split every domain even if the manifest says it is unchanged "
+        "(with --reverse: overwrite domain files edited since the split)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Rebuild the domain files from domains/ + tables/ instead of splitting",
+    )
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="Don't write; exit 1 if domain files and domains/ + tables/ have drifted",
+    )
     args = parser.parse_args()
 
+    if args.check:
+        compared, drift = check_consistency(args.source)
+        if not compared:
+            # Nothing matched up, so agreement would mean nothing
+            print("Error: no table blocks matched between the domain files and the split files", file=sys.stderr)
+            return 1
+        for line in drift:
+            print(f"  DRIFT {line}")
+        print(
+            f"Checked {compared} table blocks: "
+            + (f"{len(drift)} divergences" if drift else "domain files and split files agree"),
+            file=sys.stderr,
+        )
+        return 1 if drift else 0
+
+    if args.reverse:
+        manifest = SplitManifest()
+        written, skipped = reverse_split(
+            manifest, args.source, dry_run=args.dry_run, force=args.force
+        )
+        if not args.dry_run:
+            manifest.save()
+        prefix = "[DRY RUN] " if args.dry_run else ""
+        print(f"\n{prefix}Done: {written} domain files rebuilt, {skipped} skipped")
+        return 0
+
     if args.file:
         filepath = Path(args.file)
         if not filepath.is_absolute():
@@ -280,40 +732,77 @@ def main() -> int:
         print("No domain YAML files found to process.", file=sys.stderr)
         return 1
 
-    total_tables = 0
+    prefix = "[DRY RUN] " if args.dry_run else ""
+    manifest = SplitManifest()
+    previous: dict[str, dict] = {}
+    total_written = 0
     total_bytes = 0
+    skipped = 0
 
-    # Group by source for index updates
-    by_source: dict[str, list[DomainFile]] = {}
+    # Group by source for index updates: (domain, table count)
+    by_source: dict[str, list[tuple[str, int]]] = {}
 
     for source, filepath in domain_files_to_process:
-        print(f"\n{'[DRY RUN] ' if args.dry_run else ''}Processing: {filepath.relative_to(PROJECT_ROOT)}")
+        rel = str(filepath.relative_to(PROJECT_ROOT))
+        input_hash = sha256_file(filepath)
+        by_source.setdefault(source, [])
+
+        if not args.force and manifest.is_current(rel, input_hash):
+            by_source[source].append((filepath.stem, manifest.domains[rel]["tables"]))
+            skipped += 1
+            continue
 
+        print(f"\n{prefix}Processing: {rel}")
         df = parse_domain_file(filepath, source)
         print(f"  Found {len(df.tables)} tables in {df.domain} domain")
 
-        tables, bytes_written = split_domain_file(df, dry_run=args.dry_run)
-        total_tables += tables
+        written, bytes_written, outputs = split_domain_file(df, dry_run=args.dry_run)
+        print(f"  {written} written, {len(outputs) - written} unchanged")
+        total_written += written
         total_bytes += bytes_written
 
-        if source not in by_source:
-            by_source[source] = []
-        by_source[source].append(df)
+        if rel in manifest.domains:
+            previous[rel] = manifest.domains[rel]
+        manifest.domains[rel] = {
+            "sha256": input_hash,
+            "tables": len(df.tables),
+            "outputs": outputs,
+        }
+        by_source[source].append((df.domain, len(df.tables)))
+
+    # Domain files deleted since the last run: forget them and prune outputs.
+    if not args.file:
+        for rel in list(manifest.domains):
+            in_scope = args.source is None or Path(rel).parent.name == args.source
+            if in_scope and not (PROJECT_ROOT / rel).exists():
+                previous[rel] = manifest.domains.pop(rel)
+
+    pruned = prune_outputs(manifest, previous, dry_run=args.dry_run)
+
+    # Update index files (a single --file run doesn't know the other domains)
+    for source, counts in ([] if args.file else by_source.items()):
+        index_bytes = update_index(source, counts, dry_run=args.dry_run)
+        if index_bytes:
+            print(f"\n{prefix}Updated index: context/sources/{source}/_index.yaml")
+            total_written += 1
+            total_bytes += index_bytes
 
-    # Update index files
-    for source, dfs in by_source.items():
-        print(f"\n{'[DRY RUN] ' if args.dry_run else ''}Updating index: context/sources/{source}/_index.yaml")
-        update_index(source, dfs, dry_run=args.dry_run)
+    if not args.dry_run:
+        manifest.save()
 
-    print(f"\n{'[DRY RUN] ' if args.dry_run else ''}Done: {total_tables} table files, {total_bytes:,} bytes")
+    print(
+        f"\n{prefix}Done: {total_written} files written ({total_bytes:,} bytes), "
+        f"{skipped} domains unchanged, {pruned} pruned"
+    )
 
     if not args.dry_run:
-        print("\nOriginal domain files preserved (not deleted).")
-        print("New structure:")
-        print("  context/sources/{source}/domains/  — domain relationships")
-        print("  context/sources/{source}/tables/    — per-table column definitions")
-        print("\nTo verify: find context/sources/*/tables/ -name '*.yaml' | wc -l")
+        # Keep the compiled table catalog in step with the files just written.
+        # Imported here so --check, --reverse and dry runs never touch sqlite.
+        from context_catalog import ContextCatalog
 
+        with ContextCatalog() as catalog:
+            stats = catalog.build()
+        print(f"Catalog: {stats.reparsed} table files re-indexed, {stats.removed} removed")
     return 0
 
 
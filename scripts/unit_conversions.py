@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+unit_conversions.py — Factor table from Peloton's WellView unit-conversion script.
+
+Peloton ships WellView's US-unit views as one Snowflake script
+(context/sources/wellview_unit_conversions_raw.txt, ~14,600 lines of
+`CREATE OR REPLACE VIEW "UNITSUS UNITS"."WV..." AS SELECT ...`). Every
+converted column follows one of three shapes:
+
+    "DEPTHBTM"/0.3048 AS "DEPTHBTM", CAST(... 'FTKB' ...) AS "DEPTHBTMUNITLABEL",
+    "TEMPSTART"/0.555555555555556+32 AS "TEMPSTART", CAST(... '°F' ...) ...
+    POWER(NULLIF("DENSITY", 0),-1)/7.07409872233005E-06+-131.5 AS "DENSITY", ...
+
+i.e. us_value = x / divisor + addend, with x replaced by 1/x for the
+reciprocal units (API gravity, min/ft). Columns that are labelled but not
+scaled (durations already in days) get divisor 1. Pass-through columns
+carry no unit and are not recorded.
+
+The parser reads the script a line at a time and only buffers the current
+view (the source table comes from its closing FROM line), so a new Peloton
+release is handled the same way regardless of size. Output is a dbt seed,
+seeds/seed_wellview_unit_conversions.csv, which doubles as the on-disk form
+of the Python lookup returned by load_factor_table().
+
+Usage:
+    # Regenerate the seed from the raw script
+    python scripts/unit_conversions.py build
+
+    # Fail if the seed is out of date with the raw script (CI)
+    python scripts/unit_conversions.py build --check
+
+    # Look up a factor (table with or without the WVT_ prefix; any case)
+    python scripts/unit_conversions.py lookup wvJobRigPump StrokeLength
+
+    # Every conversion that produces a unit
+    python scripts/unit_conversions.py units FTKB
+
+Exit codes:
+    0 — success
+    1 — not found / seed out of date
+    2 — script error (unparseable line, missing input)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import re
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RAW_SCRIPT_PATH = PROJECT_ROOT / "context" / "sources" / "wellview_unit_conversions_raw.txt"
+SEED_PATH = PROJECT_ROOT / "seeds" / "seed_wellview_unit_conversions.csv"
+
+# Prefix the calc schema puts on WellView tables (WVT_WVJOBRIGPUMP).
+TABLE_PREFIX = "WVT_"
+
+SEED_COLUMNS = [
+    "table_name",
+    "source_table",
+    "column_name",
+    "conversion",
+    "divisor",
+    "addend",  # not "offset": reserved in Snowflake, and seed columns are unquoted
+    "us_unit",
+]
+
+LINEAR = "linear"
+RECIPROCAL = "reciprocal"
+
+_NUMBER = r"-?\d+(?:\.\d+)?(?:E[-+]?\d+)?"
+VIEW_RE = re.compile(r'^CREATE OR REPLACE VIEW "[^"]+"\."([^"]+)" AS SELECT\s*$')
+FROM_RE = re.compile(r'^FROM "[^"]+"\."([^"]+)";\s*$')
+CONVERTED_RE = re.compile(
+    rf"""^(?:"(?P<col>[^"]+)"|POWER\(NULLIF\("(?P<rcol>[^"]+)",\s*0\),\s*-1\))
+    (?:/(?P<divisor>{_NUMBER}))?(?:\+(?P<addend>{_NUMBER}))?
+    \s+AS\s+"(?P<alias>[^"]+)",\s*
+    CAST\(CASE\ WHEN\ "[^"]+"\ IS\ NULL\ THEN\ NULL\ ELSE\ '(?P<label>[^']*)'\ END
+    \ AS\ VARCHAR\(\d+\)\)\ AS\ "[^"]+",?\s*$""",
+    re.VERBOSE,
+)
+# `"COL", ` / `"_FIVETRAN_SYNCED" AS "UPDATEDATE", ` — no unit, not recorded
+PASSTHROUGH_RE = re.compile(r'^"[^"]+"(?:\s+AS\s+"[^"]+")?\s*,?\s*$')
+IGNORED_RE = re.compile(r"^(?:\s*$|USE DATABASE |//)")
+
+
+@dataclass(slots=True, frozen=True)
+class Conversion:
+    """How one WellView column (SI storage) maps to its US-unit view column.
+
+    ``divisor``/``addend`` keep the script's literal text so the seed is a
+    faithful copy; use ``factor``/``shift`` for arithmetic.
+    """
+
+    table_name: str  # view name, e.g. WVJOBRIGPUMP
+    source_table: str  # e.g. WVT_WVJOBRIGPUMP
+    column_name: str
+    conversion: str  # LINEAR or RECIPROCAL
+    divisor: str
+    addend: str
+    us_unit: str
+
+    @property
+    def factor(self) -> float:
+        return float(self.divisor)
+
+    @property
+    def shift(self) -> float:
+        return float(self.addend)
+
+    def apply(self, value: float) -> float:
+        """Convert a stored (SI) value to the US unit the view reports."""
+        x = 1.0 / value if self.conversion == RECIPROCAL else value
+        return x / self.factor + self.shift
+
+
+class ScriptParseError(ValueError):
+    def __init__(self, lineno: int, line: str, reason: str):
+        super().__init__(f"line {lineno}: {reason}: {line[:120]}")
+
+
+def parse_conversion_script(lines: Iterable[str]) -> Iterator[Conversion]:
+    """Yield every unit conversion in the script, one view at a time.
+
+    Raises ScriptParseError on a line that fits none of the known shapes, so
+    a format change in a new release fails loudly instead of dropping rows.
+    """
+    view: str | None = None
+    pending: list[tuple[str, str, str, str, str]] = []
+    for lineno, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        m = VIEW_RE.match(line)
+        if m:
+            if view is not None:
+                raise ScriptParseError(lineno, line, f"view {view} has no FROM line")
+            view, pending = m.group(1), []
+            continue
+        m = FROM_RE.match(line)
+        if m:
+            if view is None:
+                raise ScriptParseError(lineno, line, "FROM outside a view")
+            for column, kind, divisor, addend, label in pending:
+                yield Conversion(view, m.group(1), column, kind, divisor, addend, label)
+            view, pending = None, []
+            continue
+        if IGNORED_RE.match(line):
+            continue
+        if view is None:
+            raise ScriptParseError(lineno, line, "column outside a view")
+        m = CONVERTED_RE.match(line)
+        if m:
+            pending.append(
+                (
+                    m.group("alias"),
+                    RECIPROCAL if m.group("rcol") else LINEAR,
+                    m.group("divisor") or "1",
+                    m.group("addend") or "0",
+                    m.group("label"),
+                )
+            )
+            continue
+        if PASSTHROUGH_RE.match(line):
+            continue
+        raise ScriptParseError(lineno, line, "unrecognised column expression")
+    if view is not None:
+        raise ScriptParseError(lineno, "", f"view {view} has no FROM line")
+
+
+def render_seed(conversions: Iterable[Conversion]) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(SEED_COLUMNS)
+    for c in conversions:
+        writer.writerow([getattr(c, name) for name in SEED_COLUMNS])
+    return buf.getvalue()
+
+
+def build_seed(raw_path: Path = RAW_SCRIPT_PATH) -> tuple[str, int]:
+    """Parse the raw script and return (seed CSV text, row count)."""
+    with raw_path.open(encoding="utf-8") as fh:
+        rows = list(parse_conversion_script(fh))
+    return render_seed(rows), len(rows)
+
+
+# ── Lookup ──────────────────────────────────────────────────────────────────
+
+
+def _key(table: str, column: str) -> tuple[str, str]:
+    table = table.upper()
+    if table.startswith(TABLE_PREFIX):
+        table = table[len(TABLE_PREFIX):]
+    return table, column.upper()
+
+
+@lru_cache(maxsize=1)
+def load_factor_table(seed_path: Path = SEED_PATH) -> dict[tuple[str, str], Conversion]:
+    """(TABLE, COLUMN) -> Conversion, read once per process from the seed."""
+    with seed_path.open(encoding="utf-8", newline="") as fh:
+        return {
+            _key(row["table_name"], row["column_name"]): Conversion(**row)
+            for row in csv.DictReader(fh)
+        }
+
+
+def lookup(table: str, column: str) -> Conversion | None:
+    """O(1) factor lookup; table and column are case-insensitive, WVT_ optional."""
+    return load_factor_table().get(_key(table, column))
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Extract WellView unit conversion factors from Peloton's view script."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_p = sub.add_parser("build", help="Regenerate the seed from the raw script")
+    build_p.add_argument(
+        "--raw",
+        type=Path,
+        default=RAW_SCRIPT_PATH,
+        help="Peloton script to parse (default: the copy under context/sources/)",
+    )
+    build_p.add_argument(
+        "--check",
+        action="store_true",
+        help="Don't write; exit 1 if the seed differs from what the script produces",
+    )
+
+    lookup_p = sub.add_parser("lookup", help="Show the conversion for a column")
+    lookup_p.add_argument("table", help="WellView table, e.g. wvJobRigPump")
+    lookup_p.add_argument("column", help="Column, e.g. StrokeLength")
+
+    units_p = sub.add_parser("units", help="List conversions producing a US unit")
+    units_p.add_argument("unit", help="Unit label as in the script, e.g. FTKB, PSI, BBL/DAY")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        try:
+            content, count = build_seed(args.raw)
+        except (OSError, ScriptParseError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+        rel = SEED_PATH.relative_to(PROJECT_ROOT)
+        current = SEED_PATH.read_text(encoding="utf-8") if SEED_PATH.exists() else None
+        if args.check:
+            if current != content:
+                print(f"{rel} is out of date; run: python scripts/unit_conversions.py build",
+                      file=sys.stderr)
+                return 1
+            print(f"{rel} is up to date ({count} conversions)", file=sys.stderr)
+            return 0
+        if current == content:
+            print(f"{rel} unchanged ({count} conversions)", file=sys.stderr)
+        else:
+            SEED_PATH.write_text(content, encoding="utf-8")
+            print(f"Wrote {rel} ({count} conversions)", file=sys.stderr)
+        return 0
+
+    try:
+        table = load_factor_table()
+    except OSError as exc:
+        print(f"Error: {exc} (run: python scripts/unit_conversions.py build)", file=sys.stderr)
+        return 2
+
+    if args.command == "lookup":
+        conv = lookup(args.table, args.column)
+        if conv is None:
+            print(f"No conversion for {args.table}.{args.column}", file=sys.stderr)
+            return 1
+        for name, value in asdict(conv).items():
+            print(f"{name:<13} {value}")
+        return 0
+
+    matches = [c for c in table.values() if c.us_unit.upper() == args.unit.upper()]
+    for c in matches:
+        print(f"{c.table_name}.{c.column_name}  /{c.divisor}+{c.addend}  {c.conversion}")
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
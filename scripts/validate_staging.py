@@ -18,9 +18,31 @@ Usage:
     # JSON output for programmatic consumption
     python scripts/validate_staging.py --format json
 
+    # Stream one JSON line per file (then a summary line); stop at first error
+    python scripts/validate_staging.py --format ndjson --fail-fast
+
     # Summary only (no per-file details)
     python scripts/validate_staging.py --summary
 
+    # Run only some rules, or downgrade/disable individual violations
+    python scripts/validate_staging.py --rules CTE_PATTERN
+    python scripts/validate_staging.py --skip-rules COLUMN_GROUPING --severity TAGS_THIRD=off
+
+    # Limit the worker pool (default: one process per CPU core)
+    python scripts/validate_staging.py --jobs 4
+
+    # Bypass the on-disk result cache (target/validate_staging_cache.json)
+    python scripts/validate_staging.py --no-cache
+
+    # Persistent JSON-RPC/LSP server on stdio for editors and agents
+    python scripts/validate_staging.py --serve
+
+    # Revalidate staging models as they are saved (inotify, else polling)
+    python scripts/validate_staging.py --watch
+
+    # Per-rule timings (stderr) + Chrome trace (target/validate_staging_trace.json)
+    python scripts/validate_staging.py --profile
+
 Exit codes:
     0 — all checked models pass
     1 — one or more models have violations
@@ -30,12 +52,21 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import difflib
+import hashlib
 import json
+import os
 import re
 import subprocess
 import sys
+import time
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from functools import cached_property, lru_cache, partial
 from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -44,6 +75,9 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 STAGING_DIR = PROJECT_ROOT / "models" / "operations" / "staging"
 
+# Bump when rule semantics change in a way the source hash would not capture.
+VALIDATOR_VERSION = "1.1.0"
+
 # The 5 required CTE names, in order
 REQUIRED_CTES = ["source", "renamed", "filtered", "enhanced", "final"]
 
@@ -71,6 +105,21 @@ EXCLUDE_PATTERNS = [
     "wiserock_tables",
 ]
 
+# Below this many files, process-pool startup costs more than it saves.
+PARALLEL_MIN_FILES = 16
+
+# Result cache lives in dbt's target/ so `dbt clean` wipes it too.
+CACHE_PATH = PROJECT_ROOT / "target" / "validate_staging_cache.json"
+# Least-recently-used entries beyond this are evicted on save.
+CACHE_MAX_ENTRIES = 2000
+
+# source() names whose context lives under a different directory name.
+CONTEXT_SOURCE_MAP = {"wellview_calcs": "wellview"}
+# Warehouse table prefixes that context table names drop (PVT_PVUNITTANK -> pvUnitTank).
+CONTEXT_TABLE_PREFIXES = ("pvt_", "wvt_")
+# Loader / connector columns that no context file lists.
+CONTEXT_SYSTEM_COLUMNS = ("_fivetran_*", "_portable_*", "_airbyte_*", "_meta/*")
+
 
 # ---------------------------------------------------------------------------
 # Data classes
@@ -111,30 +160,288 @@ class FileResult:
 
 
 # ---------------------------------------------------------------------------
-# Parsing helpers
+# Lexer
 # ---------------------------------------------------------------------------
 
+# Token kinds. Jinja and comments are "trivia": they never affect CTE
+# structure, but rules can still inspect them (config block, grouping comments).
+JINJA_EXPR = "jinja_expr"  # {{ ... }}
+JINJA_STMT = "jinja_stmt"  # {% ... %}
+JINJA_COMMENT = "jinja_comment"  # {# ... #}
+LINE_COMMENT = "line_comment"  # -- ...
+BLOCK_COMMENT = "block_comment"  # /* ... */
+STRING = "string"  # '...'
+QUOTED_IDENT = "quoted_ident"  # "..."
+WORD = "word"
+PUNCT = "punct"
+
+TRIVIA_KINDS = frozenset(
+    {JINJA_EXPR, JINJA_STMT, JINJA_COMMENT, LINE_COMMENT, BLOCK_COMMENT}
+)
+COMMENT_KINDS = frozenset({LINE_COMMENT, BLOCK_COMMENT, JINJA_COMMENT})
+
+# One alternation, tried left to right at each position. Every branch either
+# consumes up to a fixed terminator or to end-of-input, so the scan is linear
+# (possessive loops, no backtracking on unterminated blocks). Jinja blocks
+# skip over their own string literals, so "{{ this }}" inside a config()
+# post_hook string doesn't end the outer block. Jinja is still live inside
+# SQL comments when dbt renders, so a line comment stops before '{{'/'{%',
+# and block comments are split around their Jinja after matching.
+#
+# There are no capture groups: findall() builds the token strings in C, and
+# tokenize() recovers each kind from its first characters, which select the
+# branch unambiguously. That is several times cheaper per token than
+# match objects with lastgroup.
+_JINJA_STR = r"'(?:[^'\\]|\\.)*+'|" r'"(?:[^"\\]|\\.)*+"'
+_JINJA_STMT_PAT = rf"""\{{%(?:[^'"%]|{_JINJA_STR}|%(?!\}}))*+%\}}"""
+_JINJA_EXPR_PAT = rf"""\{{\{{(?:[^'"}}]|{_JINJA_STR}|\}}(?!\}}))*+\}}\}}"""
+_TOKEN_RE = re.compile(
+    rf"""
+      \w+                              # word
+    | \s+                              # whitespace
+    | \{{\#(?:.*?\#\}}|.*)              # jinja comment
+    | (?:{_JINJA_STMT_PAT}|\{{%.*)          # jinja statement
+    | (?:{_JINJA_EXPR_PAT}|\{{\{{.*)         # jinja expression
+    | --(?:[^\n{{]|\{{(?![{{%\#]))*      # line comment
+    | /\*(?:.*?\*/|.*)                  # block comment
+    | '(?:[^'\\]|\\.)*'?                # string
+    | "[^"]*"?                         # quoted identifier
+    | .                                # punctuation
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_COMMENT_JINJA_RE = re.compile(f"({_JINJA_STMT_PAT}|{_JINJA_EXPR_PAT})", re.DOTALL)
+
+_WS = "ws"
+# Token kind by first character; None where the first two decide.
+_FIRST_CHAR_KIND = {
+    chr(i): _WS if chr(i).isspace() else WORD if chr(i).isalnum() or chr(i) == "_" else PUNCT
+    for i in range(128)
+}
+_FIRST_CHAR_KIND.update({"'": STRING, '"': QUOTED_IDENT, "{": None, "-": None, "/": None})
+_TWO_CHAR_KIND = {
+    "{#": JINJA_COMMENT,
+    "{%": JINJA_STMT,
+    "{{": JINJA_EXPR,
+    "--": LINE_COMMENT,
+    "/*": BLOCK_COMMENT,
+}
+
+
+class Token(NamedTuple):
+    """A single lexical token with its 1-based starting line."""
+
+    kind: str
+    text: str
+    line: int
+
+    def is_word(self, value: str) -> bool:
+        return self.kind == WORD and self.text.lower() == value
+
+
+def tokenize(sql: str) -> list[Token]:
+    """Tokenize SQL + Jinja in a single linear pass (whitespace dropped)."""
+    tokens: list[Token] = []
+    append = tokens.append
+    new = tuple.__new__  # skips NamedTuple's Python-level __new__
+    line = 1
+    for text in _TOKEN_RE.findall(sql):
+        kind = _FIRST_CHAR_KIND.get(text[0], "")
+        if kind is None:
+            kind = _TWO_CHAR_KIND.get(text[:2], PUNCT)
+        elif not kind:  # non-ASCII
+            kind = _WS if text[0].isspace() else WORD if text[0].isalnum() else PUNCT
+        if kind == WORD or kind == PUNCT:
+            append(new(Token, (kind, text, line)))
+            continue
+        if kind == BLOCK_COMMENT and ("{{" in text or "{%" in text):
+            for i, part in enumerate(_COMMENT_JINJA_RE.split(text)):
+                if part:
+                    append(new(Token, (_TWO_CHAR_KIND[part[:2]] if i % 2 else kind, part, line)))
+                    line += part.count("\n")
+            continue
+        if kind != _WS:
+            append(new(Token, (kind, text, line)))
+        line += text.count("\n")
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Parsed model
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CteSpan:
+    """A top-level CTE. ``start``/``end`` index ``ParsedModel.tokens`` and
+    bracket the body, exclusive of the enclosing parentheses."""
+
+    name: str
+    line: int
+    start: int
+    end: int
 
-def strip_jinja(sql: str) -> str:
-    """Remove Jinja blocks/expressions for structural analysis.
 
-    Preserves line count by replacing with spaces so line numbers stay valid.
+@dataclass
+class ParsedModel:
+    """Everything the rules need, derived from one tokenization of the file.
+
+    Only the token stream is built up front. The config block, CTE spans,
+    per-CTE bodies and trailing select are computed on first access, so a
+    run that only enables config rules never walks the CTE structure.
     """
-    # Remove block tags  {% ... %}
-    sql = re.sub(r"\{%.*?%\}", lambda m: " " * len(m.group()), sql, flags=re.DOTALL)
-    # Remove expression tags  {{ ... }}
-    sql = re.sub(r"\{\{.*?\}\}", lambda m: " " * len(m.group()), sql, flags=re.DOTALL)
-    # Remove comments  {# ... #}
-    sql = re.sub(r"\{#.*?#\}", lambda m: " " * len(m.group()), sql, flags=re.DOTALL)
-    return sql
-
-
-def extract_config_block(raw_sql: str) -> str | None:
-    """Extract the config() block from raw SQL (before Jinja stripping)."""
-    match = re.search(
-        r"\{\{\s*config\s*\((.*?)\)\s*\}\}", raw_sql, re.DOTALL
-    )
-    return match.group(1) if match else None
+
+    tokens: list[Token]
+
+    @cached_property
+    def config(self) -> str | None:
+        """Text inside config(...), if present."""
+        for tok in self.tokens:
+            if tok.kind != JINJA_EXPR:
+                continue
+            match = _CONFIG_RE.match(tok.text)
+            if match:
+                return match.group(1)
+        return None
+
+    @property
+    def has_config(self) -> bool:
+        return self.config is not None
+
+    @cached_property
+    def _structure(self) -> tuple[list[CteSpan], int | None]:
+        return _parse_structure(self.tokens)
+
+    @property
+    def ctes(self) -> list[CteSpan]:
+        return self._structure[0]
+
+    @property
+    def main_select_line(self) -> int | None:
+        """Line of the trailing 'select * from x', if present."""
+        return self._structure[1]
+
+    @cached_property
+    def cte_names(self) -> list[str]:
+        return [c.name for c in self.ctes]
+
+    def cte(self, name: str) -> CteSpan | None:
+        for c in self.ctes:
+            if c.name == name:
+                return c
+        return None
+
+    def cte_tokens(self, name: str, include_comments: bool = False) -> list[Token]:
+        """Body tokens of a CTE, optionally keeping SQL/Jinja comments."""
+        span = self.cte(name)
+        if span is None:
+            return []
+        body = self.tokens[span.start:span.end]
+        if include_comments:
+            return body
+        return [t for t in body if t.kind not in COMMENT_KINDS]
+
+    @cached_property
+    def comments(self) -> list[Token]:
+        return [t for t in self.tokens if t.kind == LINE_COMMENT]
+
+    @cached_property
+    def sources(self) -> list[tuple[str, str]]:
+        """Distinct (source, table) pairs from source() calls, in file order."""
+        found: dict[tuple[str, str], None] = {}
+        for tok in self.tokens:
+            if tok.kind == JINJA_EXPR:
+                for m in _SOURCE_CALL_RE.finditer(tok.text):
+                    found[(m.group(1), m.group(2))] = None
+        return list(found)
+
+
+_SOURCE_CALL_RE = re.compile(r"""\bsource\(\s*['"](\w+)['"]\s*,\s*['"](\w+)['"]\s*\)""")
+_CONFIG_RE = re.compile(r"\{\{-?\s*config\s*\((.*)\)\s*-?\}\}\Z", re.DOTALL)
+
+
+def _match_parens(code: list[Token]) -> dict[int, int]:
+    """Map each '(' position in ``code`` to its matching ')' in one pass."""
+    pairs: dict[int, int] = {}
+    stack: list[int] = []
+    for i, tok in enumerate(code):
+        if tok.kind != PUNCT:
+            continue
+        if tok.text == "(":
+            stack.append(i)
+        elif tok.text == ")" and stack:
+            pairs[stack.pop()] = i
+    return pairs
+
+
+def _parse_structure(tokens: list[Token]) -> tuple[list[CteSpan], int | None]:
+    """Find top-level CTE spans and the line of the trailing select."""
+    ctes: list[CteSpan] = []
+
+    # Structural analysis runs over code tokens only; keep a map back to
+    # positions in the full token list so rules can see comments too.
+    code_idx = [i for i, t in enumerate(tokens) if t.kind not in TRIVIA_KINDS]
+    code = [tokens[i] for i in code_idx]
+    pairs = _match_parens(code)
+
+    pos = next((i for i, t in enumerate(code) if t.is_word("with")), None)
+    if pos is None:
+        return ctes, None
+    pos += 1
+    if pos < len(code) and code[pos].is_word("recursive"):
+        pos += 1
+
+    # name as ( ... ) [, name as ( ... )]*
+    while pos + 2 < len(code):
+        name, as_kw, lparen = code[pos], code[pos + 1], code[pos + 2]
+        if not (
+            name.kind == WORD
+            and as_kw.is_word("as")
+            and lparen.kind == PUNCT
+            and lparen.text == "("
+        ):
+            break
+        close = pairs.get(pos + 2)
+        if close is None:
+            break
+        ctes.append(
+            CteSpan(
+                name=name.text.lower(),
+                line=name.line,
+                start=code_idx[pos + 2] + 1,
+                end=code_idx[close],
+            )
+        )
+        pos = close + 1
+        if pos < len(code) and code[pos].kind == PUNCT and code[pos].text == ",":
+            pos += 1
+            continue
+        break
+
+    # Main statement should open with 'select * from <name>'.
+    main_select_line = None
+    if ctes:
+        tail = code[pos:pos + 4]
+        if (
+            len(tail) == 4
+            and tail[0].is_word("select")
+            and tail[1].text == "*"
+            and tail[2].is_word("from")
+            and tail[3].kind == WORD
+        ):
+            main_select_line = tail[0].line
+
+    return ctes, main_select_line
+
+
+def parse_model(raw_sql: str) -> ParsedModel:
+    """Tokenize once; everything else on the model is derived lazily."""
+    return ParsedModel(tokens=tokenize(raw_sql))
+
+
+# ---------------------------------------------------------------------------
+# Parsing helpers
+# ---------------------------------------------------------------------------
 
 
 def extract_tags(config_text: str) -> list[str]:
@@ -146,115 +453,47 @@ def extract_tags(config_text: str) -> list[str]:
     return [t.strip().strip("'\"") for t in raw.split(",") if t.strip()]
 
 
-def find_cte_names(sql_stripped: str) -> list[tuple[str, int]]:
-    """Find all CTE definitions and their line numbers.
-
-    Returns list of (cte_name, line_number) tuples in order of appearance.
-    Handles patterns like:
-      - 'with source as ('        (same line)
-      - 'with\n\nsource as ('     (with on separate line)
-      - ', renamed as ('           (subsequent CTEs)
-      - 'renamed as ('             (start of line)
-    """
-    ctes = []
-
-    # First, strip the leading 'with' keyword to simplify matching.
-    # Replace 'with' (as CTE introducer) with whitespace.
-    cleaned = re.sub(
-        r"\bwith\b(?=[\s\n]+\w+\s+as\s*\()",
-        lambda m: " " * len(m.group()),
-        sql_stripped,
-        count=1,
-        flags=re.IGNORECASE,
-    )
-
-    # Now match: name as (
-    pattern = re.compile(
-        r"(?:^|[,\s])(\w+)\s+as\s*\(", re.IGNORECASE | re.MULTILINE
-    )
-    for match in pattern.finditer(cleaned):
-        name = match.group(1).lower()
-        # Skip SQL keywords that aren't CTE names
-        if name in (
-            "select", "insert", "update", "delete", "merge",
-            "with", "not", "cast", "case", "when", "then",
-            "else", "end", "from", "where", "and", "or",
-            "join", "left", "right", "inner", "outer", "cross",
-            "on", "group", "order", "having", "limit", "union",
-            "intersect", "except", "values", "set", "into",
-        ):
-            continue
-        line = sql_stripped[: match.start()].count("\n") + 1
-        ctes.append((name, line))
-    return ctes
-
-
-def find_final_select(sql_stripped: str) -> int | None:
-    """Find the line of the final SELECT statement (after all CTEs)."""
-    # Look for 'select * from final' or 'select * from enhanced' etc at end
-    pattern = re.compile(
-        r"^\s*select\s+\*\s+from\s+(\w+)\s*$", re.IGNORECASE | re.MULTILINE
-    )
-    matches = list(pattern.finditer(sql_stripped))
-    if matches:
-        last = matches[-1]
-        return sql_stripped[: last.start()].count("\n") + 1
-    return None
+_SURROGATE_KEY_RE = re.compile(r"generate_surrogate_key|surrogate_key|_sk\b", re.IGNORECASE)
 
 
-def has_surrogate_key_in_enhanced(sql_stripped: str, raw_sql: str) -> bool:
+def has_surrogate_key_in_enhanced(model: ParsedModel) -> bool:
     """Check if the enhanced CTE contains a surrogate key generation."""
-    # Check in raw SQL (before Jinja stripping) for the macro call
-    # Find the enhanced CTE region
-    enhanced_match = re.search(
-        r"enhanced\s+as\s*\((.*?)\)(?:\s*,|\s*\n\s*\w+\s+as|\s*\n\s*select)",
-        raw_sql,
-        re.DOTALL | re.IGNORECASE,
-    )
-    if not enhanced_match:
-        # Try a broader match — find enhanced as ( ... until the next CTE
-        enhanced_start = re.search(
-            r"enhanced\s+as\s*\(", raw_sql, re.IGNORECASE
-        )
-        if not enhanced_start:
-            return False
-        region = raw_sql[enhanced_start.end():]
-    else:
-        region = enhanced_match.group(1)
-
-    return bool(
-        re.search(r"generate_surrogate_key|surrogate_key|_sk\b", region, re.IGNORECASE)
+    return any(
+        _SURROGATE_KEY_RE.search(t.text) for t in model.cte_tokens("enhanced")
     )
 
 
-def has_loaded_at_in_enhanced(raw_sql: str) -> bool:
+def has_loaded_at_in_enhanced(model: ParsedModel) -> bool:
     """Check if enhanced CTE contains _loaded_at."""
-    enhanced_start = re.search(r"enhanced\s+as\s*\(", raw_sql, re.IGNORECASE)
-    if not enhanced_start:
-        return False
-    region = raw_sql[enhanced_start.end():]
-    # Cut at next CTE definition
-    next_cte = re.search(r"\)\s*,\s*\n\s*\w+\s+as\s*\(", region, re.IGNORECASE)
-    if next_cte:
-        region = region[:next_cte.start()]
-    return "_loaded_at" in region
+    return any("_loaded_at" in t.text for t in model.cte_tokens("enhanced"))
 
 
-def has_explicit_column_list_in_final(sql_stripped: str) -> bool:
+def has_explicit_column_list_in_final(model: ParsedModel) -> bool:
     """Check that the final CTE has an explicit column list (not SELECT *)."""
-    final_match = re.search(
-        r"final\s+as\s*\(\s*select\s+(.*?)\s+from\s+",
-        sql_stripped,
-        re.DOTALL | re.IGNORECASE,
-    )
-    if not final_match:
+    body = [t for t in model.cte_tokens("final") if t.kind not in TRIVIA_KINDS]
+    if not body or not body[0].is_word("select"):
+        return False
+
+    # Collect the select list: everything up to the first top-level FROM.
+    select_list: list[Token] = []
+    depth = 0
+    for tok in body[1:]:
+        if tok.kind == PUNCT and tok.text == "(":
+            depth += 1
+        elif tok.kind == PUNCT and tok.text == ")":
+            depth -= 1
+        elif depth == 0 and tok.is_word("from"):
+            break
+        select_list.append(tok)
+
+    if not select_list:
         return False
-    select_body = final_match.group(1).strip()
     # SELECT * is not explicit
-    if select_body == "*":
+    if len(select_list) == 1 and select_list[0].text == "*":
         return False
     # Must have at least 2 columns to be considered explicit
-    return select_body.count(",") >= 1 or "\n" in select_body
+    has_comma = any(t.kind == PUNCT and t.text == "," for t in select_list)
+    return has_comma or select_list[0].line != select_list[-1].line
 
 
 def detect_source_from_path(filepath: Path) -> str | None:
@@ -269,20 +508,15 @@ def detect_source_from_path(filepath: Path) -> str | None:
     return None
 
 
-def has_config_block(raw_sql: str) -> bool:
-    """Check if the file has a config() block."""
-    return bool(re.search(r"\{\{\s*config\s*\(", raw_sql))
-
-
 def check_materialized_view(config_text: str) -> bool:
     """Check that staging model is materialized as view."""
     match = re.search(r"materialized\s*=\s*['\"](\w+)['\"]", config_text)
     return match is not None and match.group(1) == "view"
 
 
-def has_column_grouping_comments(sql_stripped: str) -> bool:
-    """Check for column grouping comments in renamed or final CTE."""
-    grouping_patterns = [
+_GROUPING_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
         r"--\s*identifiers",
         r"--\s*dates",
         r"--\s*descriptive",
@@ -290,47 +524,338 @@ def has_column_grouping_comments(sql_stripped: str) -> bool:
         r"--\s*audit",
         r"--\s*dbt metadata",
         r"--\s*ingestion",
-    ]
+    )
+]
+
+
+def has_column_grouping_comments(model: ParsedModel) -> bool:
+    """Check for column grouping comments in renamed or final CTE."""
+    comments = model.comments
     count = sum(
-        1 for p in grouping_patterns
-        if re.search(p, sql_stripped, re.IGNORECASE)
+        1 for p in _GROUPING_PATTERNS
+        if any(p.match(c.text) for c in comments)
     )
     return count >= 2  # At least 2 grouping comments
 
 
+# Words in a select list that are never column references.
+_SQL_WORDS = frozenset(
+    """
+    select distinct from where as case when then else end and or not is null
+    true false in like ilike rlike between over partition by order asc desc
+    nulls first last rows range unbounded preceding following current row
+    interval on using join left right inner outer full cross lateral qualify
+    group having limit escape
+    current_date current_time current_timestamp localtimestamp sysdate
+    year quarter month week day dayofweek dayofyear hour minute second
+    millisecond microsecond nanosecond epoch_second epoch_millisecond
+    """.split()
+)
+# Words after which a name is an alias or relation, not a column.
+_NOT_AFTER = frozenset({"as", "from", "join"})
+# Unit-conversion / cleaning macros whose first argument is a source column.
+_COLUMN_MACRO_RE = re.compile(
+    r"""\b(?:pv_\w+|wv_\w+|clean_null_string)\(\s*['"]([A-Za-z_]\w*)['"]"""
+)
+
+
+def referenced_columns(model: ParsedModel, cte: str) -> list[tuple[str, int]]:
+    """(column, line) for every input column a CTE reads, in order.
+
+    Covers bare and qualified names, quoted identifiers and the first
+    argument of column macros ({{ pv_cbm_to_bbl('volcapacity') }}). Aliases
+    (after AS), casts and variant paths (after ':'), relations (after
+    FROM/JOIN), function names and qualifiers are not references; a variant
+    root (``properties:name``) is.
+    """
+    body = [t for t in model.cte_tokens(cte) if t.kind != JINJA_STMT]
+    return [(column, line) for _, column, line in column_refs(body)]
+
+
+def column_refs(body: list[Token]) -> list[tuple[str | None, str, int]]:
+    """(qualifier, column, line) for the column references in ``body``.
+
+    The token-level rules behind referenced_columns(); ``qualifier`` is the
+    relation alias in ``t.col`` and None for bare names and macro arguments.
+    """
+    refs: list[tuple[str | None, str, int]] = []
+    last = len(body) - 1
+    for i, tok in enumerate(body):
+        kind = tok.kind
+        if kind == JINJA_EXPR:
+            refs.extend((None, m.group(1), tok.line) for m in _COLUMN_MACRO_RE.finditer(tok.text))
+            continue
+        if kind == WORD:
+            if tok.text[0].isdigit() or tok.text.lower() in _SQL_WORDS:
+                continue
+        elif kind != QUOTED_IDENT:
+            continue
+        if i < last:
+            nxt = body[i + 1]
+            if nxt.kind == PUNCT and nxt.text in "(.":
+                continue
+        qualifier = None
+        if i:
+            prev = body[i - 1]
+            if prev.text == ":" or (prev.kind == WORD and prev.text.lower() in _NOT_AFTER):
+                continue
+            if prev.text == "." and i >= 2 and body[i - 2].kind in (WORD, QUOTED_IDENT):
+                qualifier = body[i - 2].text.strip('"')
+        refs.append((qualifier, tok.text.strip('"') if kind == QUOTED_IDENT else tok.text, tok.line))
+    return refs
+
+
+def cte_aliases(model: ParsedModel, cte: str) -> set[str]:
+    """Lower-cased names a CTE defines with AS (columns it adds to select *)."""
+    body = [t for t in model.cte_tokens(cte) if t.kind not in TRIVIA_KINDS]
+    return {
+        body[i + 1].text.strip('"').lower()
+        for i, t in enumerate(body[:-1])
+        if t.is_word("as") and body[i + 1].kind in (WORD, QUOTED_IDENT)
+    }
+
+
 # ---------------------------------------------------------------------------
-# Validation rules
+# Context catalog
 # ---------------------------------------------------------------------------
 
 
-def validate_file(filepath: Path) -> FileResult:
-    """Run all validation rules against a single staging model file."""
-    result = FileResult(path=str(filepath.relative_to(PROJECT_ROOT)))
+@dataclass(frozen=True)
+class ContextTable:
+    """Known columns of one source table, from context/sources/<source>/tables/."""
 
-    # Check exclusions
-    for pattern in EXCLUDE_PATTERNS:
-        if pattern in str(filepath):
-            result.skipped = True
-            result.skip_reason = f"Excluded by pattern: {pattern}"
-            return result
+    path: str
+    columns: frozenset[str]  # lower-cased
+    omitted: tuple[str, ...]  # lower-cased globs deliberately left out of the file
 
-    if not filepath.exists():
-        result.violations.append(
-            Violation(
-                rule="FILE_EXISTS",
-                severity="error",
-                message=f"File not found: {filepath}",
+    def has_column(self, column: str) -> bool:
+        col = column.lower()
+        return col in self.columns or any(fnmatchcase(col, p) for p in self.omitted)
+
+
+@dataclass(frozen=True)
+class ContextIndex:
+    tables: dict[tuple[str, str], ContextTable]
+    digest: str
+
+    def lookup(self, source: str, table: str) -> ContextTable | None:
+        """Resolve a source('x', 'y') call to its context table, if documented."""
+        name = table.lower()
+        for prefix in CONTEXT_TABLE_PREFIXES:
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        return self.tables.get((CONTEXT_SOURCE_MAP.get(source, source), name))
+
+
+# Set in iter_validate's pool workers, whose parent has already refreshed
+# the catalog: refreshing it again from each worker would rebuild the same
+# SQLite file concurrently.
+_CATALOG_REFRESHED = False
+
+
+def _mark_catalog_refreshed() -> None:
+    """Pool initializer: open the context catalog read-only in this process."""
+    global _CATALOG_REFRESHED
+    _CATALOG_REFRESHED = True
+
+
+@lru_cache(maxsize=1)
+def load_context_index() -> ContextIndex:
+    """Load every context table's column set, once per process.
+
+    Reads the compiled catalog (scripts/context_catalog.py), refreshing it
+    first unless the parent process already did. Worker processes forked
+    after the parent has loaded it inherit the cached index.
+    """
+    # Imported here so runs without CONTEXT_COLUMNS skip sqlite entirely.
+    import sqlite3
+
+    from context_catalog import open_catalog
+
+    system = tuple(p.lower() for p in CONTEXT_SYSTEM_COLUMNS)
+    try:
+        with open_catalog(refresh=not _CATALOG_REFRESHED) as catalog:
+            omitted = catalog.omitted_patterns()
+            columns: dict[tuple[str, str], set[str]] = {}
+            paths: dict[tuple[str, str], tuple[str, str]] = {}
+            for row in catalog.conn.execute(
+                "SELECT t.source, t.domain, t.name, t.path, c.name AS col "
+                "FROM tables t LEFT JOIN columns c ON c.table_id = t.id"
+            ):
+                key = (row["source"], row["name"].lower())
+                paths[key] = (row["path"], row["domain"])
+                if row["col"] is not None:
+                    columns.setdefault(key, set()).add(row["col"].lower())
+            digest = catalog.digest()
+    except (sqlite3.Error, OSError) as exc:
+        print(f"Warning: context catalog unavailable ({exc}); skipping CONTEXT_COLUMNS",
+              file=sys.stderr)
+        return ContextIndex(tables={}, digest="")
+
+    tables = {}
+    for key, (path, domain) in paths.items():
+        patterns = tuple(p.lower() for p in omitted.get((key[0], domain), ())) + system
+        tables[key] = ContextTable(path, frozenset(columns.get(key, ())), patterns)
+    return ContextIndex(tables=tables, digest=digest)
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+TRACE_PATH = PROJECT_ROOT / "target" / "validate_staging_trace.json"
+
+
+class RuleProfiler:
+    """Records per-file, per-phase timings for --profile.
+
+    Phases are READ, PARSE and one per rule. Spans are kept in memory and
+    rendered either as a summary table or as Chrome trace-event JSON
+    (load in chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        # (phase, path, start_ns relative to origin, duration_ns)
+        self.spans: list[tuple[str, str, int, int]] = []
+
+    @contextmanager
+    def span(self, phase: str, path: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.spans.append((phase, path, start - self.origin_ns, end - start))
+
+    def summary(self, top_files: int = 10) -> str:
+        """Per-phase totals plus the slowest files overall."""
+        by_phase: dict[str, list[tuple[int, str]]] = {}
+        by_file: dict[str, int] = {}
+        for phase, path, _, dur in self.spans:
+            by_phase.setdefault(phase, []).append((dur, path))
+            by_file[path] = by_file.get(path, 0) + dur
+
+        total = sum(by_file.values()) or 1
+        lines = [
+            "Profile by phase:",
+            f"  {'phase':<24} {'calls':>6} {'total ms':>10} {'%':>6} "
+            f"{'mean µs':>9} {'max µs':>9}  slowest file",
+        ]
+        for phase, samples in sorted(
+            by_phase.items(), key=lambda kv: -sum(d for d, _ in kv[1])
+        ):
+            phase_total = sum(d for d, _ in samples)
+            slowest_dur, slowest_path = max(samples)
+            lines.append(
+                f"  {phase:<24} {len(samples):>6} {phase_total / 1e6:>10.2f} "
+                f"{100 * phase_total / total:>5.1f}% "
+                f"{phase_total / len(samples) / 1e3:>9.1f} {slowest_dur / 1e3:>9.1f}  "
+                f"{slowest_path}"
             )
-        )
-        return result
 
-    raw_sql = filepath.read_text(encoding="utf-8")
-    sql_stripped = strip_jinja(raw_sql)
-    source_name = detect_source_from_path(filepath)
+        lines += ["", f"Slowest {min(top_files, len(by_file))} files:"]
+        for path, dur in sorted(by_file.items(), key=lambda kv: -kv[1])[:top_files]:
+            lines.append(f"  {dur / 1e6:>8.2f} ms  {path}")
+        return "\n".join(lines)
 
-    # ── Rule: CONFIG_BLOCK ──────────────────────────────────────────────
-    if not has_config_block(raw_sql):
-        result.violations.append(
+    def chrome_trace(self) -> dict:
+        """Chrome trace-event format: one complete ('X') event per span."""
+        return {
+            "traceEvents": [
+                {
+                    "name": phase,
+                    "cat": "read" if phase == "READ" else ("parse" if phase == "PARSE" else "rule"),
+                    "ph": "X",
+                    "ts": start / 1e3,
+                    "dur": dur / 1e3,
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": {"file": path},
+                }
+                for phase, path, start, dur in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is off; spans cost one function call."""
+
+    def span(self, phase: str, path: str):
+        return nullcontext()
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+# ---------------------------------------------------------------------------
+# Validation rules
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RuleContext:
+    """Per-file inputs shared by every rule.
+
+    ``model`` is parsed on first access and its own derived views (config,
+    CTE spans, CTE bodies) are lazy too, so each artifact is built only if
+    an enabled rule asks for it.
+    """
+
+    filepath: Path
+    raw_sql: str
+    source_name: str | None
+
+    @cached_property
+    def model(self) -> ParsedModel:
+        return parse_model(self.raw_sql)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A named, individually selectable check.
+
+    ``emits`` lists the violation rule ids the check can produce, which is
+    what --severity overrides match against (besides the rule name itself).
+    """
+
+    name: str
+    check: Callable[[RuleContext], list[Violation]]
+    description: str
+    emits: tuple[str, ...]
+
+
+# Registration order is execution order, which keeps violation output stable.
+RULES: dict[str, Rule] = {}
+
+SEVERITY_LEVELS = ("error", "warning", "off")
+
+
+def register_rule(name: str, description: str, emits: tuple[str, ...] = ()):
+    """Decorator adding a check function to RULES."""
+
+    def decorator(fn: Callable[[RuleContext], list[Violation]]):
+        RULES[name] = Rule(name=name, check=fn, description=description, emits=emits or (name,))
+        return fn
+
+    return decorator
+
+
+@register_rule(
+    "CONFIG_BLOCK",
+    "config() block present, materialized='view', canonical tags",
+    emits=(
+        "CONFIG_BLOCK", "MATERIALIZED_VIEW", "TAGS_MISSING",
+        "TAGS_STAGING", "TAGS_THIRD", "TAGS_SOURCE",
+    ),
+)
+def check_config_block(ctx: RuleContext) -> list[Violation]:
+    violations = []
+    source_name = ctx.source_name
+    config_text = ctx.model.config
+    if config_text is None:
+        violations.append(
             Violation(
                 rule="CONFIG_BLOCK",
                 severity="error",
@@ -342,205 +867,381 @@ def validate_file(filepath: Path) -> FileResult:
                 ),
             )
         )
-    else:
-        config_text = extract_config_block(raw_sql)
-        if config_text:
-            # ── Rule: MATERIALIZED_VIEW ─────────────────────────────────
-            if not check_materialized_view(config_text):
-                result.violations.append(
-                    Violation(
-                        rule="MATERIALIZED_VIEW",
-                        severity="error",
-                        message="Staging model must be materialized as 'view'.",
-                        remediation="Set materialized='view' in config().",
-                    )
-                )
+        return violations
+    if not config_text:
+        return violations
 
-            # ── Rule: TAGS ──────────────────────────────────────────────
-            tags = extract_tags(config_text)
-            if not tags:
-                result.violations.append(
-                    Violation(
-                        rule="TAGS_MISSING",
-                        severity="error",
-                        message="No tags defined in config().",
-                        remediation=(
-                            f"Add tags=['{source_name or 'source'}', "
-                            "'staging', 'formentera'] to config()."
-                        ),
-                    )
-                )
-            else:
-                if "staging" not in tags:
-                    result.violations.append(
-                        Violation(
-                            rule="TAGS_STAGING",
-                            severity="error",
-                            message=f"Tags {tags} missing 'staging'.",
-                            remediation="Include 'staging' in the tags list.",
-                        )
-                    )
-                if len(tags) >= 3 and tags[2] != CANONICAL_TAG_THIRD:
-                    result.violations.append(
-                        Violation(
-                            rule="TAGS_THIRD",
-                            severity="warning",
-                            message=(
-                                f"Third tag is '{tags[2]}', expected "
-                                f"'{CANONICAL_TAG_THIRD}'. "
-                                f"Current tags: {tags}"
-                            ),
-                            remediation=(
-                                f"Use ['{source_name or tags[0]}', 'staging', "
-                                f"'{CANONICAL_TAG_THIRD}'] for consistency."
-                            ),
-                        )
-                    )
-                if source_name and len(tags) >= 1 and tags[0] != source_name:
-                    expected = SOURCE_TAG_MAP.get(source_name, source_name)
-                    if tags[0] != expected:
-                        result.violations.append(
-                            Violation(
-                                rule="TAGS_SOURCE",
-                                severity="warning",
-                                message=(
-                                    f"First tag is '{tags[0]}', expected "
-                                    f"'{expected}' based on directory."
-                                ),
-                                remediation=(
-                                    f"Use '{expected}' as the first tag to "
-                                    "match the source directory name."
-                                ),
-                            )
-                        )
-
-    # ── Rule: CTE_PATTERN ───────────────────────────────────────────────
-    ctes = find_cte_names(sql_stripped)
-    cte_names = [name for name, _ in ctes]
-
-    if not ctes:
-        result.violations.append(
+    # ── MATERIALIZED_VIEW ───────────────────────────────────────────────
+    if not check_materialized_view(config_text):
+        violations.append(
             Violation(
-                rule="CTE_PATTERN",
+                rule="MATERIALIZED_VIEW",
                 severity="error",
-                message="No CTEs found. Staging models must use the 5-CTE pattern.",
+                message="Staging model must be materialized as 'view'.",
+                remediation="Set materialized='view' in config().",
+            )
+        )
+
+    # ── TAGS ────────────────────────────────────────────────────────────
+    tags = extract_tags(config_text)
+    if not tags:
+        violations.append(
+            Violation(
+                rule="TAGS_MISSING",
+                severity="error",
+                message="No tags defined in config().",
                 remediation=(
-                    "Structure the model with: source, renamed, filtered, "
-                    "enhanced, final. See docs/conventions/staging.md."
+                    f"Add tags=['{source_name or 'source'}', "
+                    "'staging', 'formentera'] to config()."
                 ),
             )
         )
-    else:
-        for required_cte in REQUIRED_CTES:
-            if required_cte not in cte_names:
-                result.violations.append(
-                    Violation(
-                        rule=f"CTE_MISSING_{required_cte.upper()}",
-                        severity="error",
-                        message=f"Missing required CTE: '{required_cte}'.",
-                        remediation=_cte_remediation(required_cte),
-                    )
-                )
+        return violations
 
-        # Check CTE order (only for CTEs that exist)
-        present_required = [c for c in REQUIRED_CTES if c in cte_names]
-        actual_order = [c for c in cte_names if c in REQUIRED_CTES]
-        if present_required != actual_order:
-            result.violations.append(
+    if "staging" not in tags:
+        violations.append(
+            Violation(
+                rule="TAGS_STAGING",
+                severity="error",
+                message=f"Tags {tags} missing 'staging'.",
+                remediation="Include 'staging' in the tags list.",
+            )
+        )
+    if len(tags) >= 3 and tags[2] != CANONICAL_TAG_THIRD:
+        violations.append(
+            Violation(
+                rule="TAGS_THIRD",
+                severity="warning",
+                message=(
+                    f"Third tag is '{tags[2]}', expected "
+                    f"'{CANONICAL_TAG_THIRD}'. "
+                    f"Current tags: {tags}"
+                ),
+                remediation=(
+                    f"Use ['{source_name or tags[0]}', 'staging', "
+                    f"'{CANONICAL_TAG_THIRD}'] for consistency."
+                ),
+            )
+        )
+    if source_name and len(tags) >= 1 and tags[0] != source_name:
+        expected = SOURCE_TAG_MAP.get(source_name, source_name)
+        if tags[0] != expected:
+            violations.append(
                 Violation(
-                    rule="CTE_ORDER",
-                    severity="error",
+                    rule="TAGS_SOURCE",
+                    severity="warning",
                     message=(
-                        f"CTEs are out of order. Found: {actual_order}, "
-                        f"expected: {present_required}."
+                        f"First tag is '{tags[0]}', expected "
+                        f"'{expected}' based on directory."
                     ),
                     remediation=(
-                        "Reorder CTEs to: source → renamed → filtered → "
-                        "enhanced → final."
+                        f"Use '{expected}' as the first tag to "
+                        "match the source directory name."
                     ),
                 )
             )
+    return violations
+
+
+@register_rule(
+    "CTE_PATTERN",
+    "all five required CTEs present, in order",
+    emits=("CTE_PATTERN", *(f"CTE_MISSING_{c.upper()}" for c in REQUIRED_CTES), "CTE_ORDER"),
+)
+def check_cte_pattern(ctx: RuleContext) -> list[Violation]:
+    cte_names = ctx.model.cte_names
+    if not cte_names:
+        return [
+            Violation(
+                rule="CTE_PATTERN",
+                severity="error",
+                message="No CTEs found. Staging models must use the 5-CTE pattern.",
+                remediation=(
+                    "Structure the model with: source, renamed, filtered, "
+                    "enhanced, final. See docs/conventions/staging.md."
+                ),
+            )
+        ]
 
-    # ── Rule: SURROGATE_KEY ─────────────────────────────────────────────
-    if "enhanced" in cte_names:
-        if not has_surrogate_key_in_enhanced(sql_stripped, raw_sql):
-            result.violations.append(
+    violations = []
+    for required_cte in REQUIRED_CTES:
+        if required_cte not in cte_names:
+            violations.append(
                 Violation(
-                    rule="SURROGATE_KEY",
-                    severity="warning",
-                    message="No surrogate key found in 'enhanced' CTE.",
-                    remediation=(
-                        "Add a surrogate key in enhanced:\n"
-                        "  {{ dbt_utils.generate_surrogate_key(['primary_key']) }}"
-                        " as entity_sk"
-                    ),
+                    rule=f"CTE_MISSING_{required_cte.upper()}",
+                    severity="error",
+                    message=f"Missing required CTE: '{required_cte}'.",
+                    remediation=_cte_remediation(required_cte),
                 )
             )
 
-    # ── Rule: LOADED_AT ─────────────────────────────────────────────────
-    if "enhanced" in cte_names:
-        if not has_loaded_at_in_enhanced(raw_sql):
-            result.violations.append(
-                Violation(
-                    rule="LOADED_AT",
-                    severity="warning",
-                    message="No '_loaded_at' timestamp in 'enhanced' CTE.",
-                    remediation=(
-                        "Add to the enhanced CTE:\n"
-                        "  current_timestamp() as _loaded_at"
-                    ),
-                )
+    # Check CTE order (only for CTEs that exist)
+    present_required = [c for c in REQUIRED_CTES if c in cte_names]
+    actual_order = [c for c in cte_names if c in REQUIRED_CTES]
+    if present_required != actual_order:
+        violations.append(
+            Violation(
+                rule="CTE_ORDER",
+                severity="error",
+                message=(
+                    f"CTEs are out of order. Found: {actual_order}, "
+                    f"expected: {present_required}."
+                ),
+                remediation=(
+                    "Reorder CTEs to: source → renamed → filtered → "
+                    "enhanced → final."
+                ),
             )
+        )
+    return violations
 
-    # ── Rule: FINAL_EXPLICIT_COLUMNS ────────────────────────────────────
-    if "final" in cte_names:
-        if not has_explicit_column_list_in_final(sql_stripped):
-            result.violations.append(
-                Violation(
-                    rule="FINAL_EXPLICIT_COLUMNS",
-                    severity="error",
-                    message=(
-                        "'final' CTE uses SELECT * or has no explicit column list."
-                    ),
-                    remediation=(
-                        "Replace SELECT * in final with an explicit, "
-                        "logically grouped column list. This defines the "
-                        "model's output contract. See docs/conventions/staging.md (final CTE)."
-                    ),
-                )
+
+@register_rule("SURROGATE_KEY", "enhanced CTE generates a surrogate key")
+def check_surrogate_key(ctx: RuleContext) -> list[Violation]:
+    if "enhanced" not in ctx.model.cte_names or has_surrogate_key_in_enhanced(ctx.model):
+        return []
+    return [
+        Violation(
+            rule="SURROGATE_KEY",
+            severity="warning",
+            message="No surrogate key found in 'enhanced' CTE.",
+            remediation=(
+                "Add a surrogate key in enhanced:\n"
+                "  {{ dbt_utils.generate_surrogate_key(['primary_key']) }}"
+                " as entity_sk"
+            ),
+        )
+    ]
+
+
+@register_rule("LOADED_AT", "enhanced CTE adds _loaded_at")
+def check_loaded_at(ctx: RuleContext) -> list[Violation]:
+    if "enhanced" not in ctx.model.cte_names or has_loaded_at_in_enhanced(ctx.model):
+        return []
+    return [
+        Violation(
+            rule="LOADED_AT",
+            severity="warning",
+            message="No '_loaded_at' timestamp in 'enhanced' CTE.",
+            remediation=(
+                "Add to the enhanced CTE:\n"
+                "  current_timestamp() as _loaded_at"
+            ),
+        )
+    ]
+
+
+@register_rule("FINAL_EXPLICIT_COLUMNS", "final CTE selects an explicit column list")
+def check_final_explicit_columns(ctx: RuleContext) -> list[Violation]:
+    if "final" not in ctx.model.cte_names or has_explicit_column_list_in_final(ctx.model):
+        return []
+    return [
+        Violation(
+            rule="FINAL_EXPLICIT_COLUMNS",
+            severity="error",
+            message=(
+                "'final' CTE uses SELECT * or has no explicit column list."
+            ),
+            remediation=(
+                "Replace SELECT * in final with an explicit, "
+                "logically grouped column list. This defines the "
+                "model's output contract. See docs/conventions/staging.md (final CTE)."
+            ),
+        )
+    ]
+
+
+@register_rule("COLUMN_GROUPING", "column grouping comments (-- identifiers, -- dates, ...)")
+def check_column_grouping(ctx: RuleContext) -> list[Violation]:
+    cte_names = ctx.model.cte_names
+    if not ("renamed" in cte_names or "final" in cte_names):
+        return []
+    if has_column_grouping_comments(ctx.model):
+        return []
+    return [
+        Violation(
+            rule="COLUMN_GROUPING",
+            severity="warning",
+            message="Missing column grouping comments (-- identifiers, -- dates, etc.).",
+            remediation=(
+                "Add grouping comments in renamed and final CTEs:\n"
+                "  -- identifiers\n"
+                "  -- dates\n"
+                "  -- descriptive fields\n"
+                "  -- system / audit\n"
+                "  -- dbt metadata"
+            ),
+        )
+    ]
+
+
+@register_rule("FINAL_SELECT", "model ends with 'select * from final'")
+def check_final_select(ctx: RuleContext) -> list[Violation]:
+    if "final" not in ctx.model.cte_names or ctx.model.main_select_line is not None:
+        return []
+    return [
+        Violation(
+            rule="FINAL_SELECT",
+            severity="warning",
+            message="Model should end with 'select * from final'.",
+            remediation="Add 'select * from final' as the last line.",
+        )
+    ]
+
+
+@register_rule(
+    "CONTEXT_COLUMNS",
+    "columns read in 'renamed' exist in the source() table's context file",
+)
+def check_context_columns(ctx: RuleContext) -> list[Violation]:
+    model = ctx.model
+    # With joins in play an unqualified name can't be pinned to one table.
+    if "renamed" not in model.cte_names or len(model.sources) != 1:
+        return []
+    source, table = model.sources[0]
+    known = load_context_index().lookup(source, table)
+    if known is None:
+        return []
+
+    derived = cte_aliases(model, "source")
+    violations = []
+    reported = set()
+    for column, line in referenced_columns(model, "renamed"):
+        key = column.lower()
+        if key in reported or key in derived or known.has_column(column):
+            continue
+        reported.add(key)
+        close = difflib.get_close_matches(key, sorted(known.columns), n=3, cutoff=0.8)
+        hint = f"Did you mean {', '.join(close)}? " if close else ""
+        violations.append(
+            Violation(
+                rule="CONTEXT_COLUMNS",
+                # The context files can lag the warehouse, so this is advisory.
+                severity="warning",
+                message=f"Column '{column}' is not defined for {source}.{table} in {known.path}.",
+                line=line,
+                remediation=(
+                    f"{hint}Check the column name against {known.path}; "
+                    "if the column is real, add it to the context file."
+                ),
             )
+        )
+    return violations
 
-    # ── Rule: COLUMN_GROUPING_COMMENTS ──────────────────────────────────
-    if "renamed" in cte_names or "final" in cte_names:
-        if not has_column_grouping_comments(sql_stripped):
-            result.violations.append(
-                Violation(
-                    rule="COLUMN_GROUPING",
-                    severity="warning",
-                    message="Missing column grouping comments (-- identifiers, -- dates, etc.).",
-                    remediation=(
-                        "Add grouping comments in renamed and final CTEs:\n"
-                        "  -- identifiers\n"
-                        "  -- dates\n"
-                        "  -- descriptive fields\n"
-                        "  -- system / audit\n"
-                        "  -- dbt metadata"
-                    ),
-                )
+
+def select_rules(
+    only: list[str] | None = None,
+    skip: list[str] | None = None,
+) -> list[str]:
+    """Resolve --rules/--skip-rules into rule names, in registry order.
+
+    Raises ValueError naming any unknown rule.
+    """
+    unknown = [n for n in (only or []) + (skip or []) if n not in RULES]
+    if unknown:
+        raise ValueError(
+            f"Unknown rule(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(RULES)}"
+        )
+    return [
+        name for name in RULES
+        if (not only or name in only) and name not in (skip or [])
+    ]
+
+
+def parse_severity_overrides(specs: list[str]) -> dict[str, str]:
+    """Parse RULE=LEVEL pairs; RULE is a rule name or an emitted violation id.
+
+    Raises ValueError on malformed specs, unknown ids, or bad levels.
+    """
+    known = set(RULES) | {e for r in RULES.values() for e in r.emits}
+    overrides = {}
+    for spec in specs:
+        rule, sep, level = spec.partition("=")
+        rule, level = rule.strip().upper(), level.strip().lower()
+        if not sep or not rule:
+            raise ValueError(f"Expected RULE=LEVEL, got '{spec}'.")
+        if rule not in known:
+            raise ValueError(f"Unknown rule '{rule}' in --severity.")
+        if level not in SEVERITY_LEVELS:
+            raise ValueError(
+                f"Bad level '{level}' for {rule}; use one of {', '.join(SEVERITY_LEVELS)}."
             )
+        overrides[rule] = level
+    return overrides
+
+
+def validate_file(
+    filepath: Path,
+    raw_sql: str | None = None,
+    profiler: RuleProfiler | None = None,
+    rules: list[str] | None = None,
+    severity: dict[str, str] | None = None,
+) -> FileResult:
+    """Run the enabled validation rules against a single staging model file.
+
+    Pass ``raw_sql`` to validate contents that are already in memory instead
+    of reading ``filepath`` from disk. ``rules`` restricts which registered
+    rules run (default: all) and ``severity`` maps a rule name or violation
+    id to "error", "warning" or "off". Pass a ``profiler`` to record time
+    spent reading, parsing and in each rule.
+    """
+    result = FileResult(path=str(filepath.relative_to(PROJECT_ROOT)))
+    prof = profiler or NULL_PROFILER
 
-    # ── Rule: FINAL_SELECT ──────────────────────────────────────────────
-    if "final" in cte_names:
-        final_select_line = find_final_select(sql_stripped)
-        if final_select_line is None:
-            result.violations.append(
-                Violation(
-                    rule="FINAL_SELECT",
-                    severity="warning",
-                    message="Model should end with 'select * from final'.",
-                    remediation="Add 'select * from final' as the last line.",
-                )
+    # Check exclusions
+    for pattern in EXCLUDE_PATTERNS:
+        if pattern in str(filepath):
+            result.skipped = True
+            result.skip_reason = f"Excluded by pattern: {pattern}"
+            return result
+
+    if raw_sql is None and not filepath.exists():
+        result.violations.append(
+            Violation(
+                rule="FILE_EXISTS",
+                severity="error",
+                message=f"File not found: {filepath}",
             )
+        )
+        return result
+
+    if raw_sql is None:
+        with prof.span("READ", result.path):
+            try:
+                raw_sql = filepath.read_text(encoding="utf-8")
+            except UnicodeDecodeError as exc:
+                result.violations.append(
+                    Violation(
+                        rule="FILE_ENCODING",
+                        severity="error",
+                        message=f"File is not valid UTF-8: {exc.reason} at byte {exc.start}",
+                        remediation="Re-save the file as UTF-8.",
+                    )
+                )
+                return result
+    ctx = RuleContext(
+        filepath=filepath,
+        raw_sql=raw_sql,
+        source_name=detect_source_from_path(filepath),
+    )
+    # Lexing also separates out Jinja, so this covers the old strip_jinja pass.
+    # Derived structure (CTE spans etc.) is charged to the first rule using it.
+    with prof.span("PARSE", result.path):
+        ctx.model
+
+    for name in RULES if rules is None else rules:
+        rule = RULES[name]
+        with prof.span(name, result.path):
+            violations = rule.check(ctx)
+        for v in violations:
+            if severity:
+                level = severity.get(v.rule) or severity.get(name)
+                if level == "off":
+                    continue
+                if level:
+                    v.severity = level
+            result.violations.append(v)
 
     return result
 
@@ -573,6 +1274,245 @@ def _cte_remediation(cte_name: str) -> str:
     return guidance.get(cte_name, f"Add the '{cte_name}' CTE per docs/conventions/staging.md.")
 
 
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+
+def result_to_dict(result: FileResult) -> dict:
+    """Serialize a FileResult to plain JSON-compatible data."""
+    return {
+        "path": result.path,
+        "skipped": result.skipped,
+        "skip_reason": result.skip_reason,
+        "violations": [
+            {
+                "rule": v.rule,
+                "severity": v.severity,
+                "message": v.message,
+                "line": v.line,
+                "remediation": v.remediation,
+            }
+            for v in result.violations
+        ],
+    }
+
+
+def result_from_dict(data: dict) -> FileResult:
+    """Rebuild a FileResult serialized by result_to_dict()."""
+    return FileResult(
+        path=data["path"],
+        skipped=data["skipped"],
+        skip_reason=data["skip_reason"],
+        violations=[Violation(**v) for v in data["violations"]],
+    )
+
+
+def rules_fingerprint() -> str:
+    """Hash the validator code and configuration that shape every result."""
+    h = hashlib.sha256()
+    h.update(VALIDATOR_VERSION.encode())
+    h.update(Path(__file__).read_bytes())
+    h.update(
+        json.dumps(
+            [REQUIRED_CTES, CANONICAL_TAG_THIRD, SOURCE_TAG_MAP, EXCLUDE_PATTERNS],
+            sort_keys=True,
+        ).encode()
+    )
+    return h.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of FileResults keyed by path + content hash.
+
+    The whole cache is invalidated when the rule fingerprint changes, so a
+    stale entry can never be replayed after the validator is edited.
+    ``variant`` identifies the rule selection and severity overrides in
+    effect; it is mixed into each key so targeted runs don't evict or
+    replay full-run results. When ``rules`` includes CONTEXT_COLUMNS the
+    context catalog's digest joins the variant, so editing a context file
+    misses those entries; other selections never open the catalog.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        variant: str = "",
+        rules: list[str] | None = None,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        if rules is None or "CONTEXT_COLUMNS" in rules:
+            variant += "\0" + load_context_index().digest
+        self.variant = variant
+        self.fingerprint = rules_fingerprint()
+        self.entries: dict[str, dict] = {}
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self._keys: dict[Path, str] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        self.entries = data.get("entries", {})
+        self.clock = data.get("clock", 0)
+
+    def key_for(self, filepath: Path) -> str | None:
+        """Return the cache key for a file, or None if it can't be read."""
+        try:
+            content = filepath.read_bytes()
+        except OSError:
+            return None
+        try:
+            name = str(filepath.relative_to(PROJECT_ROOT))
+        except ValueError:
+            name = str(filepath)
+        h = hashlib.sha256(self.variant.encode())
+        h.update(b"\0")
+        h.update(name.encode())
+        h.update(b"\0")
+        h.update(content)
+        key = h.hexdigest()
+        self._keys[filepath] = key
+        return key
+
+    def get(self, filepath: Path) -> FileResult | None:
+        key = self.key_for(filepath)
+        entry = self.entries.get(key) if key else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["used"] = self.clock + 1
+        self._dirty = True
+        return result_from_dict(entry["result"])
+
+    def put(self, filepath: Path, result: FileResult) -> None:
+        key = self._keys.get(filepath) or self.key_for(filepath)
+        if key is None:
+            return
+        self.entries[key] = {"used": self.clock + 1, "result": result_to_dict(result)}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Evict least-recently-used entries and write the cache atomically."""
+        if not self._dirty:
+            return
+        self.clock += 1
+        if len(self.entries) > self.max_entries:
+            keep = sorted(
+                self.entries.items(), key=lambda kv: kv[1]["used"], reverse=True
+            )[: self.max_entries]
+            self.entries = dict(keep)
+        payload = {
+            "fingerprint": self.fingerprint,
+            "clock": self.clock,
+            "entries": self.entries,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print(f"Warning: could not write cache {self.path}: {exc}", file=sys.stderr)
+        self._dirty = False
+
+
+def iter_validate(
+    files: list[Path],
+    jobs: int = 1,
+    cache: ResultCache | None = None,
+    profiler: RuleProfiler | None = None,
+    rules: list[str] | None = None,
+    severity: dict[str, str] | None = None,
+) -> Iterator[FileResult]:
+    """Yield a FileResult per file as soon as it is available, in input order.
+
+    Order never depends on ``jobs``, so every formatter is deterministic. A
+    ``profiler`` forces serial execution so all spans land in one process.
+    Closing the generator early (e.g. --max-errors) cancels queued work and
+    still saves the cache for what was validated.
+    """
+    cached: list[FileResult | None] = [
+        cache.get(f) if cache is not None else None for f in files
+    ]
+    todo = [f for f, c in zip(files, cached) if c is None]
+
+    pool = None
+    if profiler is not None or jobs <= 1 or len(todo) < PARALLEL_MIN_FILES:
+        fresh = (
+            validate_file(f, profiler=profiler, rules=rules, severity=severity)
+            for f in todo
+        )
+    else:
+        # Imported here: serial runs (and --watch/--serve) never need it.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(jobs, len(todo))
+        if rules is None or "CONTEXT_COLUMNS" in rules:
+            # Load the shared context catalog once here. Forked workers
+            # inherit it; spawned ones (macOS, or no fork) read it without
+            # refreshing, see _mark_catalog_refreshed().
+            load_context_index()
+        # Fork explicitly: Python 3.14 defaults to forkserver on Linux.
+        fork = "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+        # Hand each worker a few files at a time to amortize IPC overhead.
+        chunksize = max(1, len(todo) // (workers * 4))
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork") if fork else None,
+            initializer=_mark_catalog_refreshed,
+        )
+        worker = partial(validate_file, rules=rules, severity=severity)
+        fresh = pool.map(worker, todo, chunksize=chunksize)
+
+    try:
+        for f, hit in zip(files, cached):
+            if hit is not None:
+                yield hit
+                continue
+            result = next(fresh)
+            if cache is not None:
+                cache.put(f, result)
+            yield result
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.save()
+
+
+def validate_files(
+    files: list[Path],
+    jobs: int = 1,
+    cache: ResultCache | None = None,
+    profiler: RuleProfiler | None = None,
+    rules: list[str] | None = None,
+    severity: dict[str, str] | None = None,
+) -> list[FileResult]:
+    """Validate files and collect the results; see iter_validate()."""
+    return list(
+        iter_validate(
+            files,
+            jobs=jobs,
+            cache=cache,
+            profiler=profiler,
+            rules=rules,
+            severity=severity,
+        )
+    )
+
+
 # ---------------------------------------------------------------------------
 # File discovery
 # ---------------------------------------------------------------------------
@@ -690,6 +1630,26 @@ def format_text(results: list[FileResult], verbose: bool = True) -> str:
     return "\n".join(lines)
 
 
+def _file_json(r: FileResult) -> dict:
+    """Per-file object shared by the json and ndjson formats."""
+    return {
+        "path": r.path,
+        "passed": r.passed,
+        "skipped": r.skipped,
+        "skip_reason": r.skip_reason or None,
+        "violations": [
+            {
+                "rule": v.rule,
+                "severity": v.severity,
+                "message": v.message,
+                "line": v.line,
+                "remediation": v.remediation or None,
+            }
+            for v in r.violations
+        ],
+    }
+
+
 def format_json(results: list[FileResult]) -> str:
     """Format results as JSON for programmatic consumption."""
     output = {
@@ -701,30 +1661,54 @@ def format_json(results: list[FileResult]) -> str:
             "errors": sum(r.error_count for r in results),
             "warnings": sum(r.warning_count for r in results),
         },
-        "files": [
-            {
-                "path": r.path,
-                "passed": r.passed,
-                "skipped": r.skipped,
-                "skip_reason": r.skip_reason or None,
-                "violations": [
-                    {
-                        "rule": v.rule,
-                        "severity": v.severity,
-                        "message": v.message,
-                        "line": v.line,
-                        "remediation": v.remediation or None,
-                    }
-                    for v in r.violations
-                ],
-            }
-            for r in results
-            if not r.passed or r.violations
-        ],
+        "files": [_file_json(r) for r in results if not r.passed or r.violations],
     }
     return json.dumps(output, indent=2)
 
 
+def stream_ndjson(results: Iterator[FileResult], max_errors: int | None = None) -> bool:
+    """Print one JSON line per FileResult as it arrives, then a summary line.
+
+    Keeps only running counters, so memory stays flat however many files are
+    checked. Stops consuming ``results`` once ``max_errors`` errors have been
+    seen. Returns True if any checked file failed.
+    """
+    summary = {
+        "total": 0, "passed": 0, "failed": 0, "skipped": 0,
+        "errors": 0, "warnings": 0,
+    }
+    stopped = False
+    for r in results:
+        summary["total"] += 1
+        if r.skipped:
+            summary["skipped"] += 1
+        elif r.passed:
+            summary["passed"] += 1
+        else:
+            summary["failed"] += 1
+        summary["errors"] += r.error_count
+        summary["warnings"] += r.warning_count
+        print(json.dumps({"type": "file", **_file_json(r)}), flush=True)
+        if max_errors is not None and summary["errors"] >= max_errors:
+            stopped = True
+            break
+
+    print(json.dumps({"type": "summary", **summary, "stopped_early": stopped}), flush=True)
+    return summary["failed"] > 0
+
+
+def take_until_errors(results: Iterator[FileResult], max_errors: int | None) -> list[FileResult]:
+    """Collect results, stopping once ``max_errors`` errors have been seen."""
+    collected = []
+    errors = 0
+    for r in results:
+        collected.append(r)
+        errors += r.error_count
+        if max_errors is not None and errors >= max_errors:
+            break
+    return collected
+
+
 def format_summary(results: list[FileResult]) -> str:
     """Compact summary grouped by rule."""
     from collections import Counter
@@ -753,11 +1737,564 @@ def format_summary(results: list[FileResult]) -> str:
     return "\n".join(lines)
 
 
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+# Poll interval for the mtime fallback, and how long to keep draining events
+# after the first one so a burst of saves is revalidated once.
+WATCH_POLL_SECONDS = 0.5
+WATCH_DEBOUNCE_SECONDS = 0.05
+
+
+class PollingWatcher:
+    """Portable watcher that diffs (mtime, size) snapshots of *.sql files."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snap = {}
+        for path in self.root.rglob("*.sql"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snap[path] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def wait(self) -> set[Path]:
+        while True:
+            time.sleep(WATCH_POLL_SECONDS)
+            current = self._scan()
+            changed = {
+                p for p in current.keys() | self.snapshot.keys()
+                if current.get(p) != self.snapshot.get(p)
+            }
+            self.snapshot = current
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher via ctypes (no third-party dependency).
+
+    Watches every directory under ``root`` and adds watches for directories
+    created later. Raises OSError if inotify is unavailable.
+    """
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux-only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, root: Path) -> None:
+        for directory in [root, *(p for p in root.rglob("*") if p.is_dir())]:
+            wd = self._libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), self.MASK
+            )
+            if wd >= 0:
+                self.dirs[wd] = directory
+
+    def _read_events(self) -> set[Path]:
+        import struct
+
+        changed: set[Path] = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+            offset += 16
+            name = data[offset:offset + length].rstrip(b"\0").decode()
+            offset += length
+            parent = self.dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_tree(path)
+                    changed.update(path.rglob("*.sql"))
+                continue
+            if path.suffix == ".sql":
+                changed.add(path)
+        return changed
+
+    def wait(self) -> set[Path]:
+        import select
+
+        select.select([self.fd], [], [])
+        changed = self._read_events()
+        # Drain the rest of a save burst (editors often write + rename).
+        while select.select([self.fd], [], [], WATCH_DEBOUNCE_SECONDS)[0]:
+            changed |= self._read_events()
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(root: Path):
+    """Return an InotifyWatcher when supported, else a PollingWatcher."""
+    try:
+        return InotifyWatcher(root)
+    except (OSError, AttributeError):
+        return PollingWatcher(root)
+
+
+def _violation_key(v: Violation) -> tuple[str, str]:
+    # Line numbers shift on unrelated edits; identify violations by content.
+    return (v.rule, v.message)
+
+
+def format_violation_diff(old: FileResult | None, new: FileResult | None) -> list[str]:
+    """Lines describing violations that appeared ('+') or cleared ('-')."""
+    old_v = {_violation_key(v): v for v in (old.violations if old else [])}
+    new_v = {_violation_key(v): v for v in (new.violations if new else [])}
+    lines = []
+    for key, v in new_v.items():
+        if key not in old_v:
+            icon = "✗" if v.severity == "error" else "⚠"
+            loc = f" (line {v.line})" if v.line else ""
+            lines.append(f"  + {icon} [{v.rule}]{loc} {v.message}")
+    for key, v in old_v.items():
+        if key not in new_v:
+            lines.append(f"  - ✓ [{v.rule}] {v.message}")
+    return lines
+
+
+def watch(
+    jobs: int = 1,
+    cache: ResultCache | None = None,
+    rules: list[str] | None = None,
+    severity: dict[str, str] | None = None,
+) -> int:
+    """Validate the staging tree, then revalidate files as they change."""
+    files = find_staging_models()
+    results = validate_files(files, jobs=jobs, cache=cache, rules=rules, severity=severity)
+    state: dict[Path, tuple[str, FileResult]] = {}
+    for f, r in zip(files, results):
+        try:
+            state[f] = (hashlib.sha256(f.read_bytes()).hexdigest(), r)
+        except OSError:
+            continue
+
+    watcher = make_watcher(STAGING_DIR)
+    print(format_summary(results))
+    print(
+        f"\nWatching {STAGING_DIR.relative_to(PROJECT_ROOT)}/ "
+        f"({type(watcher).__name__}). Ctrl-C to stop.",
+        flush=True,
+    )
+
+    try:
+        while True:
+            changed = watcher.wait()
+            for path in sorted(changed):
+                started = time.perf_counter()
+                previous = state.get(path)
+                rel = path.relative_to(PROJECT_ROOT)
+
+                try:
+                    content = path.read_bytes()
+                except OSError:
+                    # Deleted or moved away: everything it reported clears.
+                    if previous is not None:
+                        del state[path]
+                        diff = format_violation_diff(previous[1], None)
+                        print(f"\n[{time.strftime('%H:%M:%S')}] removed {rel}")
+                        print("\n".join(diff) if diff else "  (no violations)")
+                    continue
+
+                digest = hashlib.sha256(content).hexdigest()
+                if previous is not None and previous[0] == digest:
+                    continue  # touched but not modified
+
+                try:
+                    text = content.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = None  # validate_file reports it as FILE_ENCODING
+                result = validate_file(path, raw_sql=text, rules=rules, severity=severity)
+                state[path] = (digest, result)
+                if cache is not None:
+                    cache.put(path, result)
+
+                diff = format_violation_diff(previous[1] if previous else None, result)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                status = "skipped" if result.skipped else ("PASS" if result.passed else "FAIL")
+                print(f"\n[{time.strftime('%H:%M:%S')}] {status} {rel} ({elapsed_ms:.0f} ms)")
+                if diff:
+                    print("\n".join(diff))
+                else:
+                    print("  (no change in violations)")
+
+            if cache is not None:
+                cache.save()
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+
+
+# ---------------------------------------------------------------------------
+# Server mode (JSON-RPC over stdio)
+# ---------------------------------------------------------------------------
+
+# JSON-RPC 2.0 error codes
+RPC_PARSE_ERROR = -32700
+RPC_INVALID_REQUEST = -32600
+RPC_METHOD_NOT_FOUND = -32601
+RPC_INVALID_PARAMS = -32602
+RPC_INTERNAL_ERROR = -32603
+
+# How often the server looks for edited context files (CONTEXT_COLUMNS)
+CONTEXT_POLL_SECONDS = 1.0
+
+
+class RpcError(Exception):
+    """Raised by a handler to return a JSON-RPC error response."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def uri_to_path(uri: str) -> Path:
+    """Convert a file:// URI (or plain path) to an absolute Path."""
+    from urllib.parse import unquote, urlparse
+
+    if uri.startswith("file://"):
+        return Path(unquote(urlparse(uri).path))
+    path = Path(uri)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def result_to_diagnostics(result: FileResult) -> list[dict]:
+    """Convert a FileResult to LSP Diagnostic objects."""
+    diagnostics = []
+    for v in result.violations:
+        line = (v.line or 1) - 1
+        diagnostics.append(
+            {
+                "range": {
+                    "start": {"line": line, "character": 0},
+                    "end": {"line": line, "character": 0},
+                },
+                "severity": 1 if v.severity == "error" else 2,
+                "code": v.rule,
+                "source": "validate_staging",
+                "message": v.message,
+                "data": {"remediation": v.remediation or None},
+            }
+        )
+    return diagnostics
+
+
+class ValidatorServer:
+    """Persistent validator speaking JSON-RPC 2.0 over stdin/stdout.
+
+    Accepts both LSP framing (``Content-Length`` headers) and newline-delimited
+    JSON, detected from the first message. Open editor buffers shadow the
+    files on disk, and results are memoized by path + content hash (+ the
+    context catalog's digest) so repeated requests for an unchanged buffer
+    cost a dict lookup. Paths are resolved, so a URI through a symlink or
+    ``..`` finds the same buffer.
+
+    LSP methods: initialize, shutdown, exit, textDocument/didOpen,
+    didChange (full sync), didSave, didClose. Diagnostics are pushed via
+    textDocument/publishDiagnostics.
+
+    Custom methods:
+      staging/validate     {path | uri, text?}  -> FileResult dict
+      staging/validateAll  {paths?}             -> {"summary", "files"}
+
+    ``rules`` and ``severity`` apply to every validation, as on the CLI.
+    A request that fails gets an error response; the server keeps running.
+    """
+
+    def __init__(
+        self,
+        stdin=None,
+        stdout=None,
+        rules: list[str] | None = None,
+        severity: dict[str, str] | None = None,
+    ):
+        self.stdin = stdin or sys.stdin.buffer
+        self.stdout = stdout or sys.stdout.buffer
+        self.rules = rules
+        self.severity = severity
+        self.framed: bool | None = None
+        self.buffers: dict[Path, str] = {}
+        self.results: dict[tuple[Path, str, str], FileResult] = {}
+        self.context_stamp: list[tuple[str, int, int]] | None = None
+        self.context_checked = float("-inf")
+        self.shutting_down = False
+
+    # ── Transport ────────────────────────────────────────────────────────
+
+    def read_message(self) -> bytes | None:
+        line = self.stdin.readline()
+        while line in (b"\r\n", b"\n"):
+            line = self.stdin.readline()
+        if not line:
+            return None
+        if self.framed is None:
+            self.framed = line.lower().startswith(b"content-length:")
+        if not self.framed:
+            return line
+
+        length = 0
+        while line not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("ascii").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+            line = self.stdin.readline()
+        return self.stdin.read(length)
+
+    def send(self, message: dict) -> None:
+        body = json.dumps(message).encode("utf-8")
+        if self.framed:
+            self.stdout.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii"))
+            self.stdout.write(body)
+        else:
+            self.stdout.write(body + b"\n")
+        self.stdout.flush()
+
+    def notify(self, method: str, params: dict) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # ── Validation ───────────────────────────────────────────────────────
+
+    def context_digest(self) -> str:
+        """The context catalog's digest ('' without CONTEXT_COLUMNS).
+
+        The index is loaded once per process, so it is reloaded when a
+        context file was added, removed or edited since the last check.
+        """
+        if self.rules is not None and "CONTEXT_COLUMNS" not in self.rules:
+            return ""
+        now = time.monotonic()
+        if now - self.context_checked >= CONTEXT_POLL_SECONDS:
+            from context_catalog import find_table_files
+
+            self.context_checked = now
+            stamp: list[tuple[str, int, int]] | None = []
+            try:
+                for _, p in find_table_files():
+                    st = p.stat()
+                    stamp.append((str(p), st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp = None  # changed under us: reload
+            if stamp is None or stamp != self.context_stamp:
+                if self.context_stamp is not None:
+                    load_context_index.cache_clear()
+                self.context_stamp = stamp
+        return load_context_index().digest
+
+    def validate(self, path: Path, text: str | None = None) -> FileResult:
+        """Validate a path, preferring ``text``, then an open buffer, then disk."""
+        if text is None:
+            text = self.buffers.get(path)
+        if text is None:
+            try:
+                text = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                return validate_file(path, rules=self.rules, severity=self.severity)
+        key = (path, hashlib.sha256(text.encode("utf-8")).hexdigest(), self.context_digest())
+        result = self.results.get(key)
+        if result is None:
+            result = validate_file(path, raw_sql=text, rules=self.rules, severity=self.severity)
+            self.results = {k: r for k, r in self.results.items() if k[0] != path}
+            self.results[key] = result
+        return result
+
+    def publish(self, uri: str) -> None:
+        path = uri_to_path(uri).resolve()
+        if STAGING_DIR not in path.parents:
+            return
+        result = self.validate(path)
+        self.notify(
+            "textDocument/publishDiagnostics",
+            {"uri": uri, "diagnostics": result_to_diagnostics(result)},
+        )
+
+    def _resolve(self, params: dict) -> Path:
+        target = params.get("uri") or params.get("path")
+        if not isinstance(target, str):
+            raise RpcError(RPC_INVALID_PARAMS, "Expected 'path' or 'uri'.")
+        path = uri_to_path(target).resolve()
+        if STAGING_DIR not in path.parents or path.suffix != ".sql" or not path.is_file():
+            raise RpcError(RPC_INVALID_PARAMS, f"Not a staging model file: {target}")
+        return path
+
+    def _resolve_all(self, params: dict) -> list[str] | None:
+        """Check validateAll's ``paths``: staging directories or model files."""
+        paths = params.get("paths")
+        if paths is None:
+            return None
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            raise RpcError(RPC_INVALID_PARAMS, "Expected 'paths' to be a list of strings.")
+        for p in paths:
+            path = uri_to_path(p).resolve()
+            inside = path == STAGING_DIR or STAGING_DIR in path.parents
+            if not inside or not (path.is_dir() or (path.is_file() and path.suffix == ".sql")):
+                raise RpcError(RPC_INVALID_PARAMS, f"Not a staging directory or model file: {p}")
+        return [str(uri_to_path(p).resolve()) for p in paths]
+
+    # ── Handlers ─────────────────────────────────────────────────────────
+
+    def handle(self, method: str, params: dict):
+        if method == "initialize":
+            return {
+                "capabilities": {
+                    "textDocumentSync": {"openClose": True, "change": 1, "save": True}
+                },
+                "serverInfo": {"name": "validate_staging", "version": VALIDATOR_VERSION},
+            }
+        if method == "shutdown":
+            self.shutting_down = True
+            return None
+        if method in ("initialized", "$/cancelRequest", "workspace/didChangeConfiguration"):
+            return None
+
+        if method == "textDocument/didOpen":
+            doc = params["textDocument"]
+            self.buffers[uri_to_path(doc["uri"]).resolve()] = doc["text"]
+            self.publish(doc["uri"])
+            return None
+        if method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            changes = params.get("contentChanges") or []
+            if changes:
+                # Full sync only: the last change carries the whole document.
+                self.buffers[uri_to_path(uri).resolve()] = changes[-1]["text"]
+            self.publish(uri)
+            return None
+        if method == "textDocument/didSave":
+            uri = params["textDocument"]["uri"]
+            if "text" in params:
+                self.buffers[uri_to_path(uri).resolve()] = params["text"]
+            self.publish(uri)
+            return None
+        if method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.buffers.pop(uri_to_path(uri).resolve(), None)
+            self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+            return None
+
+        if method == "staging/validate":
+            path = self._resolve(params)
+            text = params.get("text")
+            if text is not None and not isinstance(text, str):
+                raise RpcError(RPC_INVALID_PARAMS, "Expected 'text' to be a string.")
+            result = self.validate(path, text)
+            data = result_to_dict(result)
+            data["passed"] = result.passed
+            return data
+        if method == "staging/validateAll":
+            files = find_staging_models(self._resolve_all(params))
+            results = [self.validate(f.resolve()) for f in files]
+            return json.loads(format_json(results))
+
+        raise RpcError(RPC_METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+    def serve(self) -> int:
+        """Process messages until 'exit' or EOF. Returns the exit code."""
+        while True:
+            raw = self.read_message()
+            if raw is None:
+                return 0 if self.shutting_down else 1
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                self.send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {"code": RPC_PARSE_ERROR, "message": "Parse error"},
+                    }
+                )
+                continue
+
+            if not isinstance(message, dict) or "method" not in message:
+                self.send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message.get("id") if isinstance(message, dict) else None,
+                        "error": {"code": RPC_INVALID_REQUEST, "message": "Invalid request"},
+                    }
+                )
+                continue
+
+            method = message["method"]
+            if method == "exit":
+                return 0 if self.shutting_down else 1
+
+            msg_id = message.get("id")
+            try:
+                result = self.handle(method, message.get("params") or {})
+            except RpcError as exc:
+                error = {"code": exc.code, "message": exc.message}
+            except (KeyError, TypeError) as exc:
+                error = {"code": RPC_INVALID_PARAMS, "message": f"Invalid params: {exc}"}
+            except Exception as exc:  # one bad request must not take the server down
+                print(f"Error handling {method}: {exc!r}", file=sys.stderr)
+                error = {"code": RPC_INTERNAL_ERROR, "message": f"Internal error: {exc}"}
+            else:
+                if msg_id is not None:
+                    self.send({"jsonrpc": "2.0", "id": msg_id, "result": result})
+                continue
+
+            if msg_id is not None:
+                self.send({"jsonrpc": "2.0", "id": msg_id, "error": error})
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
 
+def _write_profile(profiler: RuleProfiler | None, trace_path: Path) -> None:
+    if profiler is None:
+        return
+    print("\n" + profiler.summary(), file=sys.stderr)
+    try:
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace_path.write_text(json.dumps(profiler.chrome_trace()), encoding="utf-8")
+        print(f"\nChrome trace written to {trace_path}", file=sys.stderr)
+    except OSError as exc:
+        print(f"Warning: could not write trace: {exc}", file=sys.stderr)
+
+
+def _csv_list(value: str) -> list[str]:
+    return [v.strip().upper() for v in value.split(",") if v.strip()]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Validate dbt staging models against docs/conventions/staging.md."
@@ -774,18 +2311,124 @@ def main() -> int:
     )
     parser.add_argument(
         "--format",
-        choices=["text", "json", "summary"],
+        choices=["text", "json", "ndjson", "summary"],
         default="text",
-        help="Output format (default: text)",
+        help="Output format (default: text). ndjson streams one line per file.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first file with an error (same as --max-errors 1)",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        metavar="N",
+        help="Stop once N errors have been found",
     )
     parser.add_argument(
         "--no-remediation",
         action="store_true",
         help="Suppress remediation guidance in text output",
     )
+    parser.add_argument(
+        "--rules",
+        type=_csv_list,
+        help="Comma-separated rules to run (default: all; see --list-rules)",
+    )
+    parser.add_argument(
+        "--skip-rules",
+        type=_csv_list,
+        help="Comma-separated rules to skip",
+    )
+    parser.add_argument(
+        "--severity",
+        action="append",
+        default=[],
+        metavar="RULE=LEVEL",
+        help="Override severity for a rule or violation id (error|warning|off); repeatable",
+    )
+    parser.add_argument(
+        "--list-rules",
+        action="store_true",
+        help="List available rules and exit",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count; 1 = serial)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and don't update the result cache in target/",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a persistent JSON-RPC/LSP server on stdio (see ValidatorServer)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch models/operations/staging/ and revalidate files as they change",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Time file reads, parsing and each rule; print a summary to stderr and "
+            "write a Chrome trace. Implies --jobs 1 --no-cache"
+        ),
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=Path,
+        default=TRACE_PATH,
+        help="Where --profile writes Chrome trace-event JSON "
+        "(default: target/validate_staging_trace.json)",
+    )
 
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        print("--jobs must be at least 1.", file=sys.stderr)
+        return 2
+    if args.max_errors is not None and args.max_errors < 1:
+        print("--max-errors must be at least 1.", file=sys.stderr)
+        return 2
+
+    if args.list_rules:
+        for rule in RULES.values():
+            print(f"{rule.name:<24} {rule.description}")
+            extra = [e for e in rule.emits if e != rule.name]
+            if extra:
+                print(f"{'':<24}   emits: {', '.join(extra)}")
+        return 0
+
+    try:
+        rules = select_rules(args.rules, args.skip_rules)
+        severity = parse_severity_overrides(args.severity)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    if not rules:
+        print("No rules left to run after --rules/--skip-rules.", file=sys.stderr)
+        return 2
+
+    if args.serve:
+        return ValidatorServer(rules=rules, severity=severity).serve()
+
+    # --profile times uncached work, so don't build (or load) a cache for it.
+    cache = None
+    if not (args.no_cache or args.profile):
+        variant = json.dumps([rules, severity], sort_keys=True)
+        cache = ResultCache(variant=variant, rules=rules)
+    if args.watch:
+        return watch(jobs=args.jobs, cache=cache, rules=rules, severity=severity)
+
     # Discover files
     if args.changed:
         files = find_changed_files()
@@ -802,7 +2445,35 @@ def main() -> int:
         return 2
 
     # Validate
-    results = [validate_file(f) for f in files]
+    profiler = RuleProfiler() if args.profile else None
+    stream = iter_validate(
+        files,
+        jobs=args.jobs,
+        cache=cache,
+        profiler=profiler,
+        rules=rules,
+        severity=severity,
+    )
+    max_errors = 1 if args.fail_fast else args.max_errors
+
+    if args.format == "ndjson":
+        try:
+            has_errors = stream_ndjson(stream, max_errors=max_errors)
+        finally:
+            stream.close()
+        _write_profile(profiler, args.profile_trace)
+        return 1 if has_errors else 0
+
+    try:
+        results = take_until_errors(stream, max_errors)
+    finally:
+        stream.close()
+    if len(results) < len(files):
+        print(
+            f"Stopped after {len(results)} of {len(files)} files "
+            f"(--max-errors {max_errors} reached).",
+            file=sys.stderr,
+        )
 
     # Output
     if args.format == "json":
@@ -812,6 +2483,8 @@ def main() -> int:
     else:
         print(format_text(results, verbose=not args.no_remediation))
 
+    _write_profile(profiler, args.profile_trace)
+
     # Exit code
     has_errors = any(not r.passed for r in results if not r.skipped)
     return 1 if has_errors else 0
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+verify_unit_conversions.py — Check the pv_/wv_ unit-conversion macros numerically.
+
+The macros in macros/prodview_helpers/prodview_unit_conversions.sql and
+macros/wellview_helpers/wellview_unit_conversions.sql hard-code Peloton's
+divisor factors. A wrong factor, or the right macro on the wrong column,
+only shows up as implausible numbers after a build (see
+docs/solutions/logic-errors/wellview-cost-per-depth-rate-vs-length-conversion.md).
+This harness catches both without Snowflake:
+
+  comment     the expression agrees with its `{# Peloton factor: ... #}` note
+  round-trip  one US unit, expressed in Peloton's SI storage unit, converts
+              back to exactly one (ROUND_TRIP below, derived from the exact
+              definitions — 1 ft = 0.3048 m, 1 bbl = 42 US gal, ...)
+  call site   every `{{ wv_x('col') }}` in a model reading a wellview_calcs
+              table gives the same value as Peloton's own US-units view for
+              that column (seeds/seed_wellview_unit_conversions.csv, built by
+              unit_conversions.py from Peloton's script)
+
+Each check compares the macro with its reference over the same batch of
+sample values, so a reciprocal or offset reference (°API, °F) is compared
+as a function, not just a divisor. A column the model reports in the
+inverse of Peloton's unit (ROP as FT/HR vs MIN/FT) passes. ProdView call
+sites get only the comment and round-trip checks: Peloton's ProdView script
+is not kept under context/sources/. The ~1,200 WellView call sites
+evaluate in well under a second.
+
+Usage:
+    # Run every check; exit 1 on any mismatch
+    python scripts/verify_unit_conversions.py
+
+    # Also list call sites that could not be checked, and Peloton units with no macro
+    python scripts/verify_unit_conversions.py --verbose
+
+    # Machine-readable report
+    python scripts/verify_unit_conversions.py --format json
+
+Exit codes:
+    0 — every macro and call site agrees with its reference
+    1 — one or more mismatches
+    2 — script error (unparseable macro, missing seed)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from unit_conversions import LINEAR, RECIPROCAL, load_factor_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MACRO_FILES = (
+    PROJECT_ROOT / "macros" / "prodview_helpers" / "prodview_unit_conversions.sql",
+    PROJECT_ROOT / "macros" / "wellview_helpers" / "wellview_unit_conversions.sql",
+)
+MODELS_DIR = PROJECT_ROOT / "models"
+
+# Sources whose tables are views in Peloton's WellView US-units script.
+PELOTON_SOURCES = frozenset({"wellview_calcs"})
+
+# Peloton prints factors to 7+ significant figures (6.894757, 745.6999, 0.1589873),
+# so exact-definition references agree to ~5e-8.
+REL_TOL = 1e-6
+ABS_TOL = 1e-9
+
+# Log-spaced magnitudes of both signs, plus zero: covers depths, rates,
+# permeabilities (1e-13) and the temperature offset crossing zero.
+SAMPLES = array(
+    "d",
+    [0.0] + [sign * 10.0 ** (e / 2) for e in range(-30, 15) for sign in (1.0, -1.0)],
+)
+
+# ── Round-trip references ───────────────────────────────────────────────────
+# macro -> (Peloton's SI storage amount equal to one US unit, US addend).
+# Peloton stores rates, velocities and durations per DAY, whatever the macro
+# name says (wv_cbm_per_sec_to_bbl_per_min, pv_seconds_to_minutes).
+
+_FT = 0.3048
+_IN = 0.0254
+_GAL = 0.003785411784
+_BBL = 42 * _GAL
+_FT3 = _FT**3
+_LB = 0.45359237
+_LBF = 4.4482216152605
+_BTU = 1055.05585262
+_MIN_PER_DAY = 1440
+
+ROUND_TRIP: dict[str, tuple[float, float]] = {
+    # ProdView
+    "pv_meters_to_inches": (_IN, 0.0),
+    "pv_meters_to_feet": (_FT, 0.0),
+    "pv_meters_to_64ths_inch": (_IN / 64, 0.0),
+    "pv_cbm_to_bbl": (_BBL, 0.0),
+    "pv_cbm_to_mcf": (1000 * _FT3, 0.0),
+    "pv_joules_to_mmbtu": (1e6 * _BTU, 0.0),
+    "pv_cbm_to_bbl_per_day": (_BBL, 0.0),
+    "pv_cbm_ratio_to_mcf_per_bbl": (1000 * _FT3 / _BBL, 0.0),
+    "pv_cbm_per_m_to_bbl_per_inch": (_BBL / _IN, 0.0),
+    "pv_cbm_ratio_to_bbl_per_mcf": (_BBL / (1000 * _FT3), 0.0),
+    "pv_kpa_to_psi": (6.894757293168, 0.0),
+    "pv_days_to_hours": (1 / 24, 0.0),
+    "pv_seconds_to_minutes": (1 / _MIN_PER_DAY, 0.0),  # durations are stored in days
+    "pv_decimal_to_pct": (0.01, 0.0),
+    "pv_kg_to_lb": (_LB, 0.0),
+    "pv_kgm3_to_lb_per_gal": (_LB / _GAL, 0.0),
+    "pv_kgm3_to_lb_per_1000ft3": (_LB / (1000 * _FT3), 0.0),
+    "pv_kgm3_to_sg": (1000.0, 0.0),
+    "pv_pas_to_cp": (0.001, 0.0),
+    "pv_m2s_to_in2s": (_IN**2 * 86400, 0.0),  # m²/day
+    "pv_watts_to_hp": (745.69987158227, 0.0),
+    "pv_jm3_to_btu_per_ft3": (_BTU / _FT3, 0.0),
+    "pv_nm_to_1000in_lb": (1000 * _LBF * _IN, 0.0),
+    # WellView
+    "wv_meters_to_feet": (_FT, 0.0),
+    "wv_meters_to_inches": (_IN, 0.0),
+    "wv_per_meter_to_per_foot": (1 / _FT, 0.0),  # one $/ft is 3.28 $/m
+    "wv_meters_to_miles": (1609.344, 0.0),
+    "wv_cbm_to_bbl": (_BBL, 0.0),
+    "wv_cbm_to_mcf": (1000 * _FT3, 0.0),
+    "wv_cbm_per_day_to_bbl_per_day": (_BBL, 0.0),
+    "wv_cbm_per_day_to_mcf_per_day": (1000 * _FT3, 0.0),
+    "wv_cbm_per_sec_to_bbl_per_min": (_BBL * _MIN_PER_DAY, 0.0),  # m³/day
+    "wv_cbm_per_sec_to_gpm": (_GAL * _MIN_PER_DAY, 0.0),  # m³/day
+    "wv_cbm_per_sec_to_ft3_per_hr": (_FT3 * 24, 0.0),  # m³/day
+    "wv_mps_to_ft_per_hr": (_FT * 24, 0.0),  # m/day
+    "wv_mps_to_ft_per_min": (_FT * _MIN_PER_DAY, 0.0),  # m/day
+    "wv_kpa_to_psi": (6.894757293168, 0.0),
+    "wv_newtons_to_lbf": (_LBF, 0.0),
+    "wv_kg_to_lb": (_LB, 0.0),
+    "wv_kgm3_to_lb_per_gal": (_LB / _GAL, 0.0),
+    "wv_watts_to_hp": (745.69987158227, 0.0),
+    "wv_per_m_to_per_100ft": (1 / (100 * _FT), 0.0),
+    "wv_days_to_hours": (1 / 24, 0.0),
+    "wv_days_to_minutes": (1 / _MIN_PER_DAY, 0.0),
+    "wv_kgm_to_lb_per_ft": (_LB / _FT, 0.0),
+    "wv_newtons_to_klbf": (1000 * _LBF, 0.0),
+    "wv_nm_to_ft_lb": (_LBF * _FT, 0.0),
+    "wv_celsius_to_fahrenheit": (5 / 9, 32.0),
+    "wv_pas_to_cp": (0.001, 0.0),
+    "wv_sqm_to_darcy": (9.869233e-13, 0.0),
+    "wv_kgm3_to_lb_per_ft3": (_LB / _FT3, 0.0),
+    "wv_per_m_to_per_30m": (1 / 30, 0.0),
+}
+
+
+# ── Macro extraction ────────────────────────────────────────────────────────
+
+_NUMBER = r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+MACRO_RE = re.compile(
+    r"\{%-?\s*macro\s+(\w+)\(\s*(\w+)\s*\)\s*-?%\}(.*?)\{%-?\s*endmacro\s*-?%\}", re.S
+)
+NOTE_RE = re.compile(r"\{#\s*Peloton (?:factor|conversion):\s*(.*?)\s*\|.*?#\}", re.S)
+NOTE_FACTOR_RE = re.compile(rf"/\s*({_NUMBER})\s*\)?(?:\s*\+\s*({_NUMBER}))?")
+# `{{ column_name }} / 0.3048` or `({{ column_name }} / 0.555555555555556) + 32`
+EXPR_RE = re.compile(
+    rf"^\(?\s*\{{\{{\s*(\w+)\s*\}}\}}\s*/\s*({_NUMBER})\s*\)?(?:\s*\+\s*({_NUMBER}))?$"
+)
+COMMENT_RE = re.compile(r"\{#.*?#\}", re.S)
+
+CALL_RE = re.compile(r"\{\{-?\s*([pw]v_\w+)\(\s*(['\"])(.*?)\2\s*\)\s*-?\}\}")
+SOURCE_RE = re.compile(r"""\bsource\(\s*['"](\w+)['"]\s*,\s*['"](\w+)['"]\s*\)""")
+IDENT_RE = re.compile(r"^\w+$")
+
+
+@dataclass(slots=True, frozen=True)
+class Macro:
+    name: str
+    path: str
+    line: int
+    divisor: float
+    addend: float
+    note: tuple[float, float] | None  # factor/addend from the Peloton comment
+
+
+class MacroParseError(ValueError):
+    pass
+
+
+def parse_macros(path: Path) -> list[Macro]:
+    """Every conversion macro in a file; raises on a body that isn't `x / d [+ a]`."""
+    text = path.read_text(encoding="utf-8")
+    rel = str(path.relative_to(PROJECT_ROOT))
+    macros = []
+    for m in MACRO_RE.finditer(text):
+        name, param, body = m.groups()
+        line = text.count("\n", 0, m.start()) + 1
+        expr = EXPR_RE.match(COMMENT_RE.sub("", body).strip())
+        if not expr or expr.group(1) != param:
+            raise MacroParseError(f"{rel}:{line}: {name} is not `{param} / factor [+ addend]`")
+        note = None
+        nm = NOTE_RE.search(body)
+        if nm:
+            fm = NOTE_FACTOR_RE.search(nm.group(1))
+            if fm:
+                note = (float(fm.group(1)), float(fm.group(2) or 0))
+        macros.append(
+            Macro(name, rel, line, float(expr.group(2)), float(expr.group(3) or 0), note)
+        )
+    return macros
+
+
+# ── Checks ──────────────────────────────────────────────────────────────────
+
+
+@dataclass(slots=True, frozen=True)
+class Check:
+    """Macro vs. reference: ref(x) = (1/x if reciprocal else x) / divisor + addend."""
+
+    kind: str  # comment | round-trip | call-site
+    macro: str
+    subject: str  # where the reference came from
+    conversion: str
+    divisor: float
+    addend: float
+    detail: str = ""
+
+
+@dataclass(slots=True)
+class Mismatch:
+    kind: str
+    macro: str
+    subject: str
+    detail: str
+    max_rel_error: float
+    macro_at_1: float
+    reference_at_1: float
+
+
+def build_checks(
+    macros: dict[str, Macro], models_dir: Path = MODELS_DIR
+) -> tuple[list[Check], list[str], list[str]]:
+    """Return (checks, unchecked call sites, findings that need no arithmetic)."""
+    checks: list[Check] = []
+    problems: list[str] = []
+    for macro in macros.values():
+        where = f"{macro.path}:{macro.line}"
+        if macro.note is None:
+            problems.append(f"{where}: {macro.name} has no `Peloton factor` note")
+        else:
+            checks.append(Check("comment", macro.name, where, LINEAR, *macro.note))
+        if macro.name in ROUND_TRIP:
+            checks.append(Check("round-trip", macro.name, where, LINEAR, *ROUND_TRIP[macro.name]))
+        else:
+            problems.append(f"{where}: {macro.name} has no ROUND_TRIP reference")
+
+    factors = load_factor_table()
+    peloton_tables = {table for table, _ in factors}
+    unchecked: list[str] = []
+    for path in sorted(models_dir.rglob("*.sql")):
+        text = path.read_text(encoding="utf-8")
+        if "v_" not in text:
+            continue
+        rel = str(path.relative_to(PROJECT_ROOT))
+        tables = [
+            t.upper().removeprefix("WVT_")
+            for src, t in SOURCE_RE.findall(text)
+            if src in PELOTON_SOURCES
+        ]
+        for m in CALL_RE.finditer(text):
+            name, column = m.group(1), m.group(3).strip()
+            if name not in macros:
+                problems.append(f"{rel}: call to unknown conversion macro {name}")
+                continue
+            if not name.startswith("wv_"):
+                continue
+            line = text.count("\n", 0, m.start()) + 1
+            site = f"{rel}:{line} {name}('{column}')"
+            if not tables:
+                unchecked.append(f"{site}: model reads no wellview_calcs table")
+                continue
+            if not IDENT_RE.match(column):
+                unchecked.append(f"{site}: argument is an expression")
+                continue
+            conv = next(
+                (factors[(t, column.upper())] for t in tables if (t, column.upper()) in factors),
+                None,
+            )
+            if conv is None:
+                if any(t in peloton_tables for t in tables):
+                    problems.append(
+                        f"{site}: Peloton's view reports {column.upper()} without a unit "
+                        f"conversion ({', '.join(sorted(set(tables)))})"
+                    )
+                else:
+                    unchecked.append(f"{site}: table not in Peloton's script")
+                continue
+            checks.append(
+                Check(
+                    "call-site",
+                    name,
+                    f"{rel}:{line}",
+                    conv.conversion,
+                    conv.factor,
+                    conv.shift,
+                    f"{conv.source_table}.{conv.column_name} -> {conv.us_unit}",
+                )
+            )
+    return checks, unchecked, problems
+
+
+def _reference(check: Check, x: float) -> float:
+    if check.conversion == RECIPROCAL:
+        return math.nan if x == 0 else (1.0 / x) / check.divisor + check.addend
+    return x / check.divisor + check.addend
+
+
+def _inverse_unit(got: array, want: array) -> bool:
+    """True if got * want is constant: the same quantity in the inverse unit
+    (ROP as FT/HR in the model, MIN/FT in Peloton's view)."""
+    products = [g * w for g, w in zip(got, want) if g and not math.isnan(w)]
+    return bool(products) and all(
+        math.isclose(p, products[0], rel_tol=REL_TOL) for p in products
+    )
+
+
+def evaluate(checks: list[Check], macros: dict[str, Macro]) -> list[Mismatch]:
+    """Evaluate every check over SAMPLES; one Mismatch per failing check."""
+    mismatches = []
+    for check in checks:
+        macro = macros[check.macro]
+        d, a = macro.divisor, macro.addend
+        got = array("d", (x / d + a for x in SAMPLES))
+        want = array("d", (_reference(check, x) for x in SAMPLES))
+        if check.conversion == RECIPROCAL and _inverse_unit(got, want):
+            continue
+        worst = 0.0
+        for g, w in zip(got, want):
+            if math.isnan(w) or math.isclose(g, w, rel_tol=REL_TOL, abs_tol=ABS_TOL):
+                continue
+            worst = max(worst, abs(g - w) / max(abs(w), ABS_TOL))
+        if worst:
+            mismatches.append(
+                Mismatch(
+                    check.kind,
+                    check.macro,
+                    check.subject,
+                    check.detail,
+                    worst,
+                    1.0 / d + a,
+                    _reference(check, 1.0),
+                )
+            )
+    return mismatches
+
+
+def uncovered_units(macros: dict[str, Macro]) -> list[str]:
+    """Peloton WellView conversions that no wv_ macro reproduces."""
+    have = {
+        (m.divisor, m.addend) for m in macros.values() if m.name.startswith("wv_")
+    }
+    units: dict[tuple[str, str], tuple[str, float, float]] = {}
+    for conv in load_factor_table().values():
+        if conv.factor == 1 and conv.shift == 0:
+            continue
+        units.setdefault((conv.us_unit, conv.divisor), (conv.conversion, conv.factor, conv.shift))
+    return [
+        f"{unit}: {kind} / {divisor}" + (f" + {addend:g}" if addend else "")
+        for (unit, divisor), (kind, factor, addend) in sorted(units.items())
+        if kind == RECIPROCAL or (factor, addend) not in have
+    ]
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the unit-conversion macros against Peloton's factors."
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List unchecked call sites and Peloton units no macro covers",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        macros = {m.name: m for path in MACRO_FILES for m in parse_macros(path)}
+        checks, unchecked, problems = build_checks(macros)
+    except (OSError, MacroParseError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    mismatches = evaluate(checks, macros)
+    elapsed = time.perf_counter() - start
+
+    counts = {kind: 0 for kind in ("comment", "round-trip", "call-site")}
+    for check in checks:
+        counts[check.kind] += 1
+    failed = bool(mismatches or problems)
+
+    if args.format == "json":
+        report = {
+            "macros": len(macros),
+            "checks": counts,
+            "samples_per_check": len(SAMPLES),
+            "mismatches": [asdict(m) for m in mismatches],
+            "problems": problems,
+            "unchecked": unchecked,
+            "uncovered_units": uncovered_units(macros),
+            "seconds": round(elapsed, 3),
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 1 if failed else 0
+
+    for m in mismatches:
+        print(f"MISMATCH [{m.kind}] {m.macro} vs {m.subject}")
+        if m.detail:
+            print(f"    Peloton: {m.detail}")
+        print(
+            f"    1.0 -> macro {m.macro_at_1:.12g}, reference {m.reference_at_1:.12g} "
+            f"(max rel error {m.max_rel_error:.3g})"
+        )
+    for p in problems:
+        print(f"PROBLEM  {p}")
+    if args.verbose:
+        for u in unchecked:
+            print(f"SKIPPED  {u}")
+        for u in uncovered_units(macros):
+            print(f"NO MACRO {u}")
+
+    print(
+        f"\n{len(macros)} macros, {sum(counts.values())} checks "
+        f"({counts['comment']} comment, {counts['round-trip']} round-trip, "
+        f"{counts['call-site']} call-site) x {len(SAMPLES)} samples: "
+        f"{len(mismatches)} mismatches, {len(problems)} problems, "
+        f"{len(unchecked)} call sites unchecked in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+warehouse_sizing.py — Fit model run time against warehouse size and pick sizes.
+
+set_warehouse_size (macros/set_warehouse_size.sql) routes a model to
+DBT_<TARGET>_WH_<size>, but the size is hand-picked and most models never
+call it, so the heavy marts share whatever the target warehouse is. This
+script fits, per model,
+
+    seconds(size) = serial + parallel / nodes(size)
+
+from history (nodes = credits per hour: XS 1, S 2, M 4, ...) and chooses
+the sizes that use the fewest credits while a full build still finishes
+under a wall-time target. Wall time is simulated on the run's DAG with
+run_timing.py, so a model only moves up a size when that shortens the
+build: it sits on the critical path, or the threads are the bottleneck.
+
+History comes from:
+  - run_results.json + manifest.json from past runs; the size is read from
+    each node's rendered snowflake_warehouse (…_WH_M), or --default-size
+    when it runs on the target warehouse
+  - optionally, a Snowflake QUERY_HISTORY export (CSV with QUERY_TEXT,
+    WAREHOUSE_SIZE, TOTAL_ELAPSED_TIME in ms, START_TIME). Queries are tied
+    to models through the node_id in dbt's query comment and summed per
+    model per day, i.e. one sample per daily run.
+
+A model seen at two or more sizes gets a least-squares fit. A model seen at
+one size is split with --parallel-fraction; the report marks it `prior`.
+Credits are attributed per model as seconds × rate, as if each model had
+the warehouse to itself — good for ranking sizes, not for the bill.
+
+Only table, incremental and snapshot nodes are resized; views, tests and
+seeds keep their observed times.
+
+--write puts the result in the `warehouse_size_overrides` var in
+dbt_project.yml, which set_warehouse_size reads (still gated by
+`enable_dynamic_warehouse`). Every model whose config calls the macro gets
+an entry, since the override replaces its hand-picked size; other models
+get one when their size changes, but only pick it up once
+`snowflake_warehouse=set_warehouse_size(...)` is added — the report lists
+them, and the credits it reports leave them at their current size.
+
+Usage:
+    # Recommend sizes that keep the build at its current simulated wall time
+    python scripts/warehouse_sizing.py runs/*/
+
+    # Add query history, aim for a 20-minute build, update dbt_project.yml
+    python scripts/warehouse_sizing.py runs/*/ --query-history qh.csv --target-minutes 20 --write
+
+    # Machine-readable
+    python scripts/warehouse_sizing.py runs/*/ --format json
+
+Exit codes:
+    0 — success (target met)
+    1 — the wall-time target can't be met with the available sizes
+    2 — script error (missing artifacts, unreadable query history)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import statistics
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from run_timing import ArtifactError, Dag, build_dag, critical_path, load_runs, merge_runs, simulate, thread_count
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DBT_PROJECT = PROJECT_ROOT / "dbt_project.yml"
+
+# Credits per hour, which is also the relative compute per size.
+CREDITS_PER_HOUR = {
+    "XS": 1, "S": 2, "M": 4, "L": 8, "XL": 16, "2XL": 32, "3XL": 64, "4XL": 128,
+}
+# QUERY_HISTORY.WAREHOUSE_SIZE spellings
+HISTORY_SIZES = {
+    "X-SMALL": "XS", "SMALL": "S", "MEDIUM": "M", "LARGE": "L", "X-LARGE": "XL",
+    "2X-LARGE": "2XL", "3X-LARGE": "3XL", "4X-LARGE": "4XL",
+}
+RESIZABLE = {"table", "incremental", "snapshot"}
+
+WAREHOUSE_SIZE_RE = re.compile(r"_WH_([0-9]?X?[SML])$", re.IGNORECASE)
+NODE_ID_RE = re.compile(r'"node_id"\s*:\s*"([^"]+)"')
+AVAILABLE_SIZES_RE = re.compile(r"^\s*available_warehouse_sizes:\s*\[([^\]]*)\]", re.MULTILINE)
+OVERRIDES_RE = re.compile(r"^  warehouse_size_overrides:.*\n(?:    .*\n)*", re.MULTILINE)
+CALLS_MACRO_RE = re.compile(r"\bset_warehouse_size\s*\(")
+
+
+# ── History ─────────────────────────────────────────────────────────────────
+
+
+def size_of(warehouse: str, default: str) -> str:
+    m = WAREHOUSE_SIZE_RE.search(warehouse)
+    return m.group(1).upper() if m else default
+
+
+def read_query_history(path: Path) -> dict[str, list[tuple[str, float]]]:
+    """unique_id -> [(size, seconds)], one sample per model per day."""
+    totals: dict[tuple[str, str, str], float] = defaultdict(float)
+    with path.open(encoding="utf-8-sig", newline="") as fh:
+        reader = csv.DictReader(fh)
+        if reader.fieldnames is None:
+            raise ArtifactError(f"{path}: empty file")
+        reader.fieldnames = [f.strip().upper() for f in reader.fieldnames]
+        missing = {"QUERY_TEXT", "WAREHOUSE_SIZE", "TOTAL_ELAPSED_TIME"} - set(reader.fieldnames)
+        if missing:
+            raise ArtifactError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+        for row in reader:
+            m = NODE_ID_RE.search(row["QUERY_TEXT"] or "")
+            size = HISTORY_SIZES.get((row["WAREHOUSE_SIZE"] or "").upper())
+            if not m or not size:
+                continue
+            day = (row.get("START_TIME") or "")[:10]
+            totals[(m.group(1), size, day)] += float(row["TOTAL_ELAPSED_TIME"] or 0) / 1000
+    samples: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    for (uid, size, _), seconds in totals.items():
+        samples[uid].append((size, seconds))
+    return samples
+
+
+# ── Fit ─────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Fit:
+    serial: float
+    parallel: float  # seconds at 1 node that scale with size
+    sizes_seen: list[str]
+    kind: str  # "fit" or "prior"
+
+    def seconds(self, size: str) -> float:
+        return self.serial + self.parallel / CREDITS_PER_HOUR[size]
+
+    def credits(self, size: str) -> float:
+        return self.seconds(size) * CREDITS_PER_HOUR[size] / 3600
+
+
+def fit_runtime(samples: list[tuple[str, float]], parallel_fraction: float) -> Fit:
+    """Least squares of seconds on 1/nodes, clamped to non-negative terms."""
+    seen = sorted({s for s, _ in samples}, key=CREDITS_PER_HOUR.__getitem__)
+    xs = [1 / CREDITS_PER_HOUR[s] for s, _ in samples]
+    ys = [t for _, t in samples]
+    if len(seen) < 2:
+        t, nodes = statistics.median(ys), CREDITS_PER_HOUR[seen[0]]
+        return Fit((1 - parallel_fraction) * t, parallel_fraction * t * nodes, seen, "prior")
+
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    intercept = my - slope * mx
+    if slope < 0:  # got slower on bigger warehouses: noise, size doesn't help
+        return Fit(my, 0.0, seen, "fit")
+    if intercept < 0:  # scales better than linearly: refit through the origin
+        slope = sum(x * y for x, y in zip(xs, ys)) / sum(x * x for x in xs)
+        intercept = 0.0
+    return Fit(intercept, slope, seen, "fit")
+
+
+# ── Optimisation ────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ModelPlan:
+    unique_id: str
+    name: str
+    path: str
+    materialized: str
+    fit: Fit
+    current: str
+    observed: float  # median seconds at the current size
+    recommended: str = ""
+    calls_macro: bool = False
+    predicted: dict[str, float] = field(default_factory=dict)  # size -> seconds
+
+
+def sized_dag(dag: Dag, plans: dict[str, ModelPlan], choice: dict[str, str]) -> Dag:
+    """``dag`` with each planned model weighted by its fitted time at ``choice``."""
+    weights = dict(dag.weights)
+    for uid, size in choice.items():
+        weights[uid] = plans[uid].fit.seconds(size)
+    return Dag(weights, dag.parents, dag.children)
+
+
+def optimise(
+    dag: Dag,
+    plans: dict[str, ModelPlan],
+    sizes: list[str],
+    threads: int,
+    target: float,
+) -> tuple[dict[str, str], float]:
+    """Cheapest sizes with simulated wall <= target (greedy).
+
+    Every resizable model starts on the cheapest size; while the build is
+    too slow, the model with the most seconds saved per extra credit moves
+    up one size. Candidates are the critical-path models, or every model
+    when the threads, not the path, are the bottleneck.
+    """
+    choice = {uid: min(sizes, key=p.fit.credits) for uid, p in plans.items()}
+    while True:
+        sized = sized_dag(dag, plans, choice)
+        cp = critical_path(sized)
+        wall = simulate(sized, threads, cp.tail)
+        if wall <= target:
+            return choice, wall
+        candidates = set(cp.path) if wall <= cp.length * 1.05 else set(plans)
+        best, best_ratio = None, 0.0
+        for uid in sorted(candidates & plans.keys()):
+            i = sizes.index(choice[uid])
+            if i + 1 == len(sizes):
+                continue
+            fit, cur, nxt = plans[uid].fit, choice[uid], sizes[i + 1]
+            gain = fit.seconds(cur) - fit.seconds(nxt)
+            cost = max(fit.credits(nxt) - fit.credits(cur), 1e-9)
+            if gain > 0 and gain / cost > best_ratio:
+                best, best_ratio = uid, gain / cost
+        if best is None:
+            return choice, wall  # target out of reach
+        choice[best] = sizes[sizes.index(choice[best]) + 1]
+
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+
+def available_sizes(project: Path = DBT_PROJECT) -> list[str]:
+    m = AVAILABLE_SIZES_RE.search(project.read_text(encoding="utf-8"))
+    if not m:
+        raise ArtifactError(f"{project}: no available_warehouse_sizes var")
+    sizes = [s.strip().strip("'\"").upper() for s in m.group(1).split(",") if s.strip()]
+    return sorted(sizes, key=CREDITS_PER_HOUR.__getitem__)
+
+
+def render_overrides(overrides: dict[str, str]) -> str:
+    if not overrides:
+        return "  warehouse_size_overrides: {}\n"
+    lines = ["  warehouse_size_overrides:\n"]
+    lines += [f"    {name}: {size}\n" for name, size in sorted(overrides.items())]
+    return "".join(lines)
+
+
+def write_overrides(overrides: dict[str, str], project: Path = DBT_PROJECT) -> bool:
+    """Replace the generated var block in dbt_project.yml; True if it changed."""
+    text = project.read_text(encoding="utf-8")
+    if not OVERRIDES_RE.search(text):
+        raise ArtifactError(f"{project}: no warehouse_size_overrides var to update")
+    updated = OVERRIDES_RE.sub(lambda _: render_overrides(overrides), text, count=1)
+    if updated == text:
+        return False
+    project.write_text(updated, encoding="utf-8")
+    return True
+
+
+def calls_macro(path: str) -> bool:
+    try:
+        return bool(CALLS_MACRO_RE.search((PROJECT_ROOT / path).read_text(encoding="utf-8")))
+    except OSError:
+        return False
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Recommend per-model warehouse sizes from dbt run history."
+    )
+    parser.add_argument(
+        "artifacts",
+        nargs="+",
+        type=Path,
+        help="Artifact directories (run_results.json + manifest.json) or run_results.json files",
+    )
+    parser.add_argument("--manifest", type=Path, help="manifest.json to use for every run")
+    parser.add_argument("--query-history", type=Path, help="Snowflake QUERY_HISTORY export (CSV)")
+    parser.add_argument(
+        "--default-size",
+        default="XS",
+        type=str.upper,
+        choices=list(CREDITS_PER_HOUR),
+        help="Size of the target warehouse, for nodes without snowflake_warehouse (default: XS)",
+    )
+    parser.add_argument(
+        "--target-minutes",
+        type=float,
+        help="Wall-time target for the build (default: the current simulated wall time)",
+    )
+    parser.add_argument(
+        "--parallel-fraction",
+        type=float,
+        default=0.5,
+        help="Share of run time that scales with size, for models seen at one size (default: 0.5)",
+    )
+    parser.add_argument("--threads", type=thread_count, help="dbt threads (default: from the runs, else 4)")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="Update warehouse_size_overrides in dbt_project.yml",
+    )
+    args = parser.parse_args()
+
+    try:
+        sizes = available_sizes()
+        loaded = list(load_runs(args.artifacts, args.manifest))
+        history = read_query_history(args.query_history) if args.query_history else {}
+    except (ArtifactError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    samples: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    current: dict[str, str] = {}
+    for _, results, manifest in loaded:
+        for r in results:
+            node = manifest.get(r.unique_id)
+            if r.status in ("skipped", "error") or node is None:
+                continue
+            size = size_of(node.warehouse, args.default_size)
+            samples[r.unique_id].append((size, r.execution_time))
+            current[r.unique_id] = size  # latest run wins
+    for uid, history_samples in history.items():
+        samples[uid].extend(history_samples)
+
+    profile = merge_runs(loaded)
+    dag = build_dag(profile)
+    threads = args.threads or profile.threads or 4
+
+    plans: dict[str, ModelPlan] = {}
+    for uid, t in profile.nodes.items():
+        if t.materialized not in RESIZABLE or not samples.get(uid):
+            continue
+        fit = fit_runtime(samples[uid], args.parallel_fraction)
+        plans[uid] = ModelPlan(
+            unique_id=uid,
+            name=t.name,
+            path=t.path,
+            materialized=t.materialized,
+            fit=fit,
+            current=current.get(uid, args.default_size),
+            observed=t.seconds,
+            predicted={s: round(fit.seconds(s), 2) for s in sizes},
+        )
+
+    # Baseline on the fitted times too, so both walls come from one model.
+    baseline = sized_dag(dag, plans, {uid: p.current for uid, p in plans.items()})
+    baseline_wall = simulate(baseline, threads, critical_path(baseline).tail)
+    target = args.target_minutes * 60 if args.target_minutes else baseline_wall
+    choice, wall = optimise(dag, plans, sizes, threads, target)
+
+    # A model that calls the macro gets an entry whatever its size: the
+    # override replaces the hand-picked argument, which may not be the
+    # default. Any other model only needs one (and the macro) to move.
+    overrides = {}
+    for uid, plan in plans.items():
+        plan.recommended = choice[uid]
+        plan.calls_macro = calls_macro(plan.path)
+        if plan.calls_macro or plan.recommended != plan.current:
+            overrides[plan.name] = plan.recommended
+
+    # Credits for what --write changes: an override only takes effect where
+    # the config calls the macro; the rest stay at their current size.
+    applied = {p.unique_id: p.recommended if p.calls_macro else p.current for p in plans.values()}
+    credits_now = sum(p.fit.credits(p.current) for p in plans.values())
+    credits_new = sum(p.fit.credits(applied[p.unique_id]) for p in plans.values())
+    needs_config = sorted(p.name for p in plans.values() if p.recommended != p.current and not p.calls_macro)
+    met = wall <= target
+
+    if args.write:
+        try:
+            changed = write_overrides(overrides)
+        except (ArtifactError, OSError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+        rel = DBT_PROJECT.relative_to(PROJECT_ROOT)
+        print(f"{'Updated' if changed else 'Unchanged'} warehouse_size_overrides in {rel}", file=sys.stderr)
+
+    if args.format == "json":
+        print(
+            json.dumps(
+                {
+                    "sizes": sizes,
+                    "threads": threads,
+                    "target_seconds": round(target, 1),
+                    "wall_seconds": {"current": round(baseline_wall, 1), "recommended": round(wall, 1)},
+                    "target_met": met,
+                    "credits": {"current": round(credits_now, 3), "recommended": round(credits_new, 3)},
+                    "overrides": dict(sorted(overrides.items())),
+                    "needs_config": needs_config,
+                    "models": [asdict(p) for p in sorted(plans.values(), key=lambda p: -p.observed)],
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(f"{'model':<48} {'mat':<12} {'now':>4} {'obs':>8} {'fit':<6} {'seen':<8} {'rec':>4} {'pred':>8}")
+        for p in sorted(plans.values(), key=lambda p: -p.observed):
+            mark = "*" if p.recommended != p.current else " "
+            print(
+                f"{p.name[:48]:<48} {p.materialized:<12} {p.current:>4} {p.observed:>7.1f}s "
+                f"{p.fit.kind:<6} {','.join(p.fit.sizes_seen):<8} {p.recommended:>3}{mark} "
+                f"{p.predicted[p.recommended]:>7.1f}s"
+            )
+        print("\nwarehouse_size_overrides (models calling set_warehouse_size, and resized ones):")
+        print(render_overrides(overrides), end="")
+        if needs_config:
+            print("\nadd snowflake_warehouse=set_warehouse_size(...) to the config of:")
+            for name in needs_config:
+                print(f"  {name}")
+
+    print(
+        f"\n{len(plans)} resizable models, {threads} threads: wall {baseline_wall / 60:.1f} -> "
+        f"{wall / 60:.1f} min (target {target / 60:.1f}{'' if met else ', NOT met'}), "
+        f"credits {credits_now:.2f} -> {credits_new:.2f} per build"
+        f"{f' ({len(needs_config)} resized models wait on the macro)' if needs_config else ''}",
+        file=sys.stderr,
+    )
+    return 0 if met else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())